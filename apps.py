@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class PagesConfig(AppConfig):
+    name = "pages"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .dropdowns import dropdown_registry
+
+        dropdown_registry.build()
@@ -0,0 +1,211 @@
+""" Bundled Stylesheets and Critical CSS. """
+
+import os
+import posixpath
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+from .css import Stylesheet, compile_stylesheet, minify_css
+from .fonts import MANIFEST_PATH, font_face_css
+
+FONTS = "fonts"
+DEBUG_CACHE_SIZE = 32
+
+# Every bundle is self-contained so a page needs exactly one stylesheet request.
+SHELL_CSS = (
+    FONTS,
+    "css/nav.css",
+    "css/style.css",
+    "css/layout.css",
+    "css/footer.css",
+    "css/color-themes/blue.css",
+)
+CSS_BUNDLES = {
+    "app": SHELL_CSS,
+    "list": SHELL_CSS + ("css/list.css", "css/table.css"),
+    "dashboard": SHELL_CSS + ("css/list.css", "css/dashboard.css", "css/table.css"),
+    "show": SHELL_CSS + ("css/show.css",),
+    "manage": SHELL_CSS + ("css/table.css",),
+    "forms": SHELL_CSS + ("css/forms.css",),
+    "splash": SHELL_CSS + ("css/splash.css",),
+}
+
+# Selectors that style the app shell rendered above the fold by base/layout.html.
+CRITICAL_SELECTORS = re.compile(
+    r"(^|[\s>+~(,])(\*|html|body|h1|:root)(?![-\w])"
+    r"|\.(theme-dark|app-shell|app-rail|app-main|app-header|app-content|skip-link"
+    r"|nav-|rail-|brand-|header-|mobile-rail-toggle|page-title|breadcrumb"
+    r"|theme-toggle|icon-button|visually-hidden)"
+)
+# Class prefixes of the content each bundle's pages render right under the header.
+# Only these page rules are inlined; the rest of the page sheets arrive with the
+# deferred bundle.
+ABOVE_THE_FOLD = {
+    "app": ("content-card",),
+    "list": ("content-card", "list-"),
+    "dashboard": ("content-card", "dashboard-shell", "dashboard-toolbar", "dashboard-date",
+                  "dashboard-tools", "dashboard-search", "dashboard-save-status"),
+    "show": ("content-card",),
+    "manage": ("content-card",),
+    "forms": ("content-card", "app-form", "form-card", "form-error-summary"),
+    "splash": ("splash-shell", "splash-nav", "splash-brand", "splash-hero", "splash-cta"),
+}
+GROUPING_RULES = ("@media", "@supports", "@layer")
+URL_PATTERN = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+
+
+def rewrite_urls(text, source):
+    """
+    Rewrites relative ``url()`` references in ``source`` to absolute static URLs.
+
+    Bundles are served from a different path than their source files, so
+    ``url("../images/x.png")`` would otherwise resolve against the bundle URL.
+    """
+
+    base = posixpath.dirname(source)
+
+    def replace(match):
+        url = match.group(2)
+        if url.startswith(("/", "data:", "http:", "https:", "#")):
+            return match.group(0)
+        return f"url('{static(posixpath.normpath(posixpath.join(base, url)))}')"
+
+    return URL_PATTERN.sub(replace, text)
+
+
+def read_source(source):
+    if source == FONTS:
+        return font_face_css()
+    path = finders.find(source)
+    if not path:
+        raise LookupError(f"CSS bundle source {source} was not found.")
+    with open(path, encoding="utf-8") as handle:
+        return rewrite_urls(handle.read(), source)
+
+
+def bundle_source(name):
+    """Returns the concatenated, URL-rewritten CSS for a bundle."""
+
+    return "\n".join(read_source(source) for source in CSS_BUNDLES[name])
+
+
+def source_mtimes(name):
+    """Returns the modification times of a bundle's source files."""
+
+    mtimes = []
+    for source in CSS_BUNDLES[name]:
+        path = finders.find(MANIFEST_PATH if source == FONTS else source)
+        mtimes.append(os.stat(path).st_mtime_ns if path else None)
+    return tuple(mtimes)
+
+
+def split_rules(text):
+    """
+    Splits minified CSS into top-level ``(prelude, body)`` pairs.
+
+    Statements without a block, such as ``@charset``, are returned with a body of
+    None.
+    """
+
+    rules = []
+    depth = 0
+    start = 0
+    prelude = None
+    for position, char in enumerate(text):
+        if char == "{":
+            if depth == 0:
+                prelude = text[start:position].strip()
+                start = position + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, text[start:position]))
+                start = position + 1
+        elif char == ";" and depth == 0:
+            rules.append((text[start:position].strip(), None))
+            start = position + 1
+    return rules
+
+
+def extract_critical(text, selectors=CRITICAL_SELECTORS):
+    """
+    Returns the rules of minified CSS whose selectors match ``selectors``.
+
+    Grouping at-rules are kept when any nested rule is critical; other at-rules
+    (``@font-face``, ``@keyframes``) stay in the deferred bundle.
+    """
+
+    kept = []
+    for prelude, body in split_rules(text):
+        if body is None:
+            continue
+        if prelude.startswith(GROUPING_RULES):
+            inner = extract_critical(body, selectors)
+            if inner:
+                kept.append(f"{prelude}{{{inner}}}")
+        elif not prelude.startswith("@") and selectors.search(prelude):
+            kept.append(f"{prelude}{{{body}}}")
+    return "".join(kept)
+
+
+def critical_selectors(name):
+    """Returns the pattern for a bundle's shell and above-the-fold page rules."""
+
+    classes = "|".join(re.escape(prefix) for prefix in ABOVE_THE_FOLD.get(name, ()))
+    if not classes:
+        return CRITICAL_SELECTORS
+    return re.compile(f"{CRITICAL_SELECTORS.pattern}|\\.({classes})")
+
+
+def build_critical_css(name):
+    """Returns a bundle's above-the-fold CSS: the shell and first-screen rules."""
+
+    return extract_critical(minify_css(bundle_source(name)), critical_selectors(name))
+
+
+@lru_cache(maxsize=None)
+def _bundle_stylesheet(name):
+    return compile_stylesheet(bundle_source(name))
+
+
+@lru_cache(maxsize=None)
+def _critical_css(name):
+    return build_critical_css(name)
+
+
+# DEBUG builds are keyed by the source mtimes, so they are rebuilt only after an
+# edit, and are not shared through ``compile_stylesheet`` so edits do not pile up.
+@lru_cache(maxsize=DEBUG_CACHE_SIZE)
+def _debug_bundle_stylesheet(name, mtimes):
+    return Stylesheet(bundle_source(name))
+
+
+@lru_cache(maxsize=DEBUG_CACHE_SIZE)
+def _debug_critical_css(name, mtimes):
+    return build_critical_css(name)
+
+
+def bundle_stylesheet(name):
+    """
+    Returns the compiled ``Stylesheet`` for a bundle.
+
+    Bundles are built once per process; under ``DEBUG`` they are rebuilt when a
+    source file changes so edits show up immediately.
+    """
+
+    if settings.DEBUG:
+        return _debug_bundle_stylesheet(name, source_mtimes(name))
+    return _bundle_stylesheet(name)
+
+
+def critical_css(name="app"):
+    """Returns the minified above-the-fold CSS for a bundle."""
+
+    if settings.DEBUG:
+        return _debug_critical_css(name, source_mtimes(name))
+    return _critical_css(name)
@@ -0,0 +1,241 @@
+""" Badge Thumbnails and Sprite Sheets. """
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.text import slugify
+
+BADGE_DIR = "images/user_files/badges"
+DERIVATIVE_DIR = f"{BADGE_DIR}/derivatives"
+INDEX_PATH = f"{DERIVATIVE_DIR}/index.json"
+THUMBNAIL_SIZES = (32, 64, 128)
+SPRITE_SIZES = (32, 64)
+THUMBNAIL_FORMAT = "webp"
+THUMBNAIL_OPTIONS = {"quality": 80, "method": 6}
+# When a badge exists in several formats the first match wins.
+SOURCE_PREFERENCE = (".png", ".gif", ".jpg", ".jpeg")
+
+
+@lru_cache(maxsize=1)
+def load_index():
+    """
+    Returns the derivative index written by ``manage.py build_badges``.
+
+    Returns:
+        dict: ``{"badges": {key: {"source", "thumbnails": {size: path}}},
+        "sprites": {size: {"sheet", "css", "columns", "members"}}}``, or empty
+        mappings before the build has run. ``members`` is loaded as a frozenset.
+    """
+
+    path = finders.find(INDEX_PATH)
+    if not path:
+        return {"badges": {}, "sprites": {}}
+    with open(path, encoding="utf-8") as handle:
+        index = json.load(handle)
+    for sprite in index["sprites"].values():
+        sprite["members"] = frozenset(sprite["members"])
+    return index
+
+
+def badge_key(name):
+    """Returns the index key for a badge file name, stem or static path."""
+
+    return slugify(Path(str(name)).stem)
+
+
+def badge_source(name):
+    """
+    Returns the static path of a badge file name, stem or static path.
+
+    Static paths are kept as they are; a stem gets the first extension in
+    ``SOURCE_PREFERENCE`` that exists, as ``manage.py build_badges`` would pick.
+    """
+
+    name = str(name)
+    if "/" in name:
+        return name
+    if not Path(name).suffix:
+        candidates = [f"{BADGE_DIR}/{name}{suffix}" for suffix in SOURCE_PREFERENCE]
+        return next((path for path in candidates if finders.find(path)), candidates[0])
+    return f"{BADGE_DIR}/{name}"
+
+
+def sprite_class(size, key):
+    return f"badge-{size}-{key}"
+
+
+def render_badge(name, size=32, alt="", index=None):
+    """
+    Renders a badge at ``size`` CSS pixels from the best available derivative.
+
+    Sprite-sheet members render as a ``<span>`` positioned by the sheet's CSS
+    (include it once with ``{% badge_sprite_stylesheet size %}``); other badges
+    render as a lazy ``<img>`` using 1x/2x thumbnails, or the original file before
+    the build has run.
+    """
+
+    index = index if index is not None else load_index()
+    key = badge_key(name)
+    size = int(size)
+    sprite = index["sprites"].get(str(size))
+    if sprite and key in sprite["members"]:
+        return format_html(
+            '<span class="badge-sprite badge-sprite-{} {}" role="img" aria-label="{}"></span>',
+            size,
+            sprite_class(size, key),
+            alt,
+        )
+
+    badge = index["badges"].get(key)
+    thumbnails = (badge or {}).get("thumbnails", {})
+    if str(size) in thumbnails:
+        src = static(thumbnails[str(size)])
+        retina = thumbnails.get(str(size * 2))
+        srcset = f"{src} 1x, {static(retina)} 2x" if retina else f"{src} 1x"
+        return format_html(
+            '<img src="{}" srcset="{}" width="{}" height="{}" alt="{}" loading="lazy" '
+            'decoding="async">',
+            src,
+            srcset,
+            size,
+            size,
+            alt,
+        )
+
+    source = badge["source"] if badge else badge_source(name)
+    return format_html(
+        '<img src="{}" width="{}" height="{}" alt="{}" loading="lazy" decoding="async" '
+        'style="object-fit: contain">',
+        static(source),
+        size,
+        size,
+        alt,
+    )
+
+
+def render_sprite_stylesheet(size, index=None):
+    """Renders the ``<link>`` for one sprite sheet's CSS, or ``""`` before the build."""
+
+    sprite = (index if index is not None else load_index())["sprites"].get(str(int(size)))
+    if not sprite:
+        return ""
+    return format_html(
+        '<link rel="stylesheet" type="text/css" href="{}">', static(sprite["css"])
+    )
+
+
+def iter_badges(static_root):
+    """Yields ``(key, static path, file path)`` for each badge, one file per key."""
+
+    chosen = {}
+    for file_path in sorted(Path(static_root, BADGE_DIR).iterdir()):
+        suffix = file_path.suffix.lower()
+        if not file_path.is_file() or suffix not in SOURCE_PREFERENCE:
+            continue
+        key = badge_key(file_path.name)
+        current = chosen.get(key)
+        if current is None or SOURCE_PREFERENCE.index(suffix) < SOURCE_PREFERENCE.index(
+            current.suffix.lower()
+        ):
+            chosen[key] = file_path
+    for key, file_path in sorted(chosen.items()):
+        yield key, f"{BADGE_DIR}/{file_path.name}", file_path
+
+
+def fit(image, size):
+    """Returns ``image`` scaled to fit a transparent ``size`` x ``size`` square."""
+
+    from PIL import Image
+
+    image = image.convert("RGBA")
+    image.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+    return canvas
+
+
+def sprite_css(size, sheet_url, columns, rows, members):
+    """Renders the CSS for a 2x sprite sheet displayed at ``size`` CSS pixels."""
+
+    rules = [
+        f".badge-sprite-{size}{{display:inline-block;width:{size}px;height:{size}px;"
+        f"background-image:url('{sheet_url}');background-repeat:no-repeat;"
+        f"background-size:{columns * size}px {rows * size}px}}"
+    ]
+    for position, key in enumerate(members):
+        x = (position % columns) * size
+        y = (position // columns) * size
+        rules.append(f".{sprite_class(size, key)}{{background-position:{-x}px {-y}px}}")
+    return "\n".join(rules) + "\n"
+
+
+def build_badges(static_root, sizes=THUMBNAIL_SIZES, sprite_sizes=SPRITE_SIZES,
+                 members=None, log=None):
+    """
+    Writes badge thumbnails, sprite sheets and their index.
+
+    Thumbnails are square, transparent-padded WebP files. Each sprite sheet packs
+    ``members`` (every badge by default) at twice its display size so it stays
+    sharp on high-density screens. Requires Pillow.
+    """
+
+    from PIL import Image
+
+    output_dir = Path(static_root, DERIVATIVE_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    badges = {}
+    frames = {}
+    for key, static_path, file_path in iter_badges(static_root):
+        with Image.open(file_path) as image:
+            image.seek(0)
+            frames[key] = image.convert("RGBA")
+        thumbnails = {}
+        for size in sizes:
+            name = f"{key}-{size}.{THUMBNAIL_FORMAT}"
+            fit(frames[key], size).save(
+                output_dir / name, THUMBNAIL_FORMAT.upper(), **THUMBNAIL_OPTIONS
+            )
+            thumbnails[str(size)] = f"{DERIVATIVE_DIR}/{name}"
+        badges[key] = {"source": static_path, "thumbnails": thumbnails}
+        if log:
+            log(f"Thumbnailed {static_path}")
+
+    sprites = {}
+    keys = [key for key in (members or sorted(frames)) if key in frames]
+    if keys:
+        columns = math.ceil(math.sqrt(len(keys)))
+        rows = math.ceil(len(keys) / columns)
+        for size in sprite_sizes:
+            cell = size * 2
+            sheet = Image.new("RGBA", (columns * cell, rows * cell), (0, 0, 0, 0))
+            for position, key in enumerate(keys):
+                sheet.paste(
+                    fit(frames[key], cell),
+                    ((position % columns) * cell, (position // columns) * cell),
+                )
+            sheet_name = f"sprite-{size}.{THUMBNAIL_FORMAT}"
+            sheet.save(output_dir / sheet_name, THUMBNAIL_FORMAT.upper(), **THUMBNAIL_OPTIONS)
+            css_name = f"sprite-{size}.css"
+            (output_dir / css_name).write_text(
+                sprite_css(size, sheet_name, columns, rows, keys), encoding="utf-8"
+            )
+            sprites[str(size)] = {
+                "sheet": f"{DERIVATIVE_DIR}/{sheet_name}",
+                "css": f"{DERIVATIVE_DIR}/{css_name}",
+                "columns": columns,
+                "members": keys,
+            }
+            if log:
+                log(f"Packed {len(keys)} badges into {DERIVATIVE_DIR}/{sheet_name}")
+
+    index = {"badges": badges, "sprites": sprites}
+    Path(static_root, INDEX_PATH).write_text(
+        json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    load_index.cache_clear()
+    return index
@@ -0,0 +1,122 @@
+""" In-Process Caches. """
+
+from collections import OrderedDict
+from threading import RLock
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe least-recently-used mapping.
+
+    Used for values that are cheap to hold in memory and are derived purely from
+    their key, such as per-role page content.
+
+    Args:
+        maxsize (int): The maximum number of entries kept before the least recently
+            used entry is evicted.
+
+    Example:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.get_or_set("a", lambda: 1)
+        1
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for ``key`` and marks it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Returned when the key is not cached.
+
+        Returns:
+            The cached value, or ``default``.
+        """
+
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Stores ``value`` under ``key``, evicting the oldest entry when full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+
+        Returns:
+            The stored value.
+        """
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def get_or_set(self, key, factory):
+        """
+        Returns the cached value for ``key``, computing it with ``factory`` on a miss.
+
+        Args:
+            key: The cache key.
+            factory (callable): Called without arguments to build a missing value.
+
+        Returns:
+            The cached or newly built value.
+        """
+
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.set(key, factory())
+        return value
+
+    def discard(self, key):
+        """Removes ``key`` if present."""
+
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate):
+        """
+        Removes every entry for which ``predicate(key, value)`` is true.
+
+        Returns:
+            int: The number of entries removed.
+        """
+
+        with self._lock:
+            stale = [key for key, value in self._data.items() if predicate(key, value)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        """Removes every entry and resets the hit/miss counters."""
+
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
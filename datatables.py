@@ -0,0 +1,195 @@
+""" Server-Side DataTables Sources. """
+
+import json
+from collections import namedtuple
+
+from django.db.models import Q
+from django.utils.html import conditional_escape
+
+from .routing import url_registry
+from .search import search_tokens
+
+MAX_PAGE_LENGTH = 100
+DEFAULT_PAGE_LENGTH = 10
+MAX_ORDER_COLUMNS = 3
+
+Column = namedtuple("Column", "header field searchable orderable")
+
+
+def column(header, field=None, searchable=True, orderable=True):
+    """
+    Declares a table column.
+
+    Args:
+        header (str): The ``<th>`` text.
+        field (str): The ORM path the cell, search and ordering use, or None for a
+            column that ``render_row`` fills in (such as action links).
+        searchable (bool): Whether the global search matches this field.
+        orderable (bool): Whether the column can be sorted.
+    """
+
+    has_field = field is not None
+    return Column(header, field, searchable and has_field, orderable and has_field)
+
+
+class DataTableSource:
+    """
+    A queryset-backed table served a page at a time to DataTables' ``serverSide`` mode.
+
+    Subclasses declare ``columns`` and implement ``get_queryset``, which must scope
+    the rows to what ``request.user`` may see. Cells come from ``values_list`` over
+    the column fields, passed through ``render_row``. Column fields should follow
+    to-one relations so each row appears once.
+
+    Example:
+        >>> @datatable_registry.register("attendees")
+        ... class AttendeeTable(DataTableSource):
+        ...     columns = (column("Name", "name"), column("Unit", "faction__name"))
+        ...
+        ...     def get_queryset(self, request):
+        ...         return Attendee.objects.filter(facility=request.user.facility)
+    """
+
+    columns = ()
+
+    def get_queryset(self, request):
+        raise NotImplementedError
+
+    def render_row(self, row):
+        """
+        Returns the cells for one row.
+
+        Args:
+            row (tuple): The ``values_list`` of the column fields, in column order.
+
+        Returns:
+            list: Cell values; anything not marked safe is escaped.
+        """
+
+        return ["" if value is None else value for value in row]
+
+    @property
+    def fields(self):
+        return [col.field for col in self.columns if col.field is not None]
+
+    def search(self, queryset, query):
+        """Keeps rows where every query token matches some searchable column."""
+
+        fields = [col.field for col in self.columns if col.searchable]
+        if not fields:
+            return queryset
+        for token in search_tokens(query):
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f"{field}__icontains": token})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def column_defs(self):
+        targets = [index for index, col in enumerate(self.columns) if not col.orderable]
+        return json.dumps([{"orderable": False, "targets": targets}] if targets else [])
+
+
+class DataTableRegistry:
+    """Maps URL names to ``DataTableSource`` classes."""
+
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, name):
+        """Class decorator registering a source under ``name``."""
+
+        def decorator(source_class):
+            self._sources[name] = source_class
+            return source_class
+
+        return decorator
+
+    def get(self, name):
+        """Returns an instance of the source registered as ``name``, or None."""
+
+        source_class = self._sources.get(name)
+        return source_class() if source_class is not None else None
+
+
+def table_context(name):
+    """
+    Returns the ``table`` context for ``partials/datatable.html`` in server-side mode.
+
+    Example:
+        context["table"] = table_context("attendees")
+    """
+
+    source = datatable_registry.get(name)
+    if source is None:
+        raise LookupError(f"No DataTable source is registered as {name}.")
+    return {
+        "headers": [col.header for col in source.columns],
+        "source_url": url_registry.reverse("datatable-rows", {"name": name}),
+        "column_defs": source.column_defs(),
+    }
+
+
+def parse_int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_order(params, columns):
+    """Returns ``order_by`` arguments from DataTables' ``order[i][column|dir]`` params."""
+
+    ordering = []
+    for index in range(MAX_ORDER_COLUMNS):
+        position = parse_int(params.get(f"order[{index}][column]"), None)
+        if position is None:
+            break
+        if not 0 <= position < len(columns) or not columns[position].orderable:
+            continue
+        prefix = "-" if params.get(f"order[{index}][dir]") == "desc" else ""
+        ordering.append(f"{prefix}{columns[position].field}")
+    return ordering
+
+
+def process(source, request):
+    """
+    Answers one DataTables server-side request.
+
+    Applies the global search, the requested ordering (with ``pk`` as a tie-breaker
+    so pages are stable) and the ``start``/``length`` window on the queryset, so
+    only the visible page is fetched and serialized.
+
+    Returns:
+        dict: The ``draw``, ``recordsTotal``, ``recordsFiltered`` and ``data`` keys
+        of the DataTables protocol.
+    """
+
+    params = request.GET
+    start = max(parse_int(params.get("start"), 0), 0)
+    length = parse_int(params.get("length"), DEFAULT_PAGE_LENGTH)
+    if not 0 < length <= MAX_PAGE_LENGTH:
+        length = MAX_PAGE_LENGTH
+
+    queryset = source.get_queryset(request)
+    records_total = queryset.count()
+    query = params.get("search[value]", "").strip()
+    if query:
+        queryset = source.search(queryset, query)
+        records_filtered = queryset.count()
+    else:
+        records_filtered = records_total
+
+    queryset = queryset.order_by(*parse_order(params, source.columns), "pk")
+    rows = queryset.values_list(*source.fields)[start:start + length]
+    return {
+        "draw": parse_int(params.get("draw"), 0),
+        "recordsTotal": records_total,
+        "recordsFiltered": records_filtered,
+        "data": [
+            [conditional_escape(cell) for cell in source.render_row(row)] for row in rows
+        ],
+    }
+
+
+datatable_registry = DataTableRegistry()
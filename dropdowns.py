@@ -0,0 +1,366 @@
+""" Dynamic Dropdown Sources. """
+
+import hashlib
+from threading import Lock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+
+from .generations import bump_generation, get_generation, get_generations
+
+CACHE_PREFIX = "pages:dropdown"
+CACHE_TIMEOUT = 60 * 15
+LABEL_ALIAS = "dropdown_label"
+
+
+class DropdownSource:
+    """
+    A validated (model, relation field) pair that dropdown options may be filtered by.
+
+    Attributes:
+        model (Model): The model whose rows become options.
+        field_name (str): The relation field the parent id is matched against.
+        filter_lookup (str): The ORM lookup used to filter by the parent id.
+        value_field (Field): The field parent ids are compared with.
+        label_field (str): The field or annotation rendered as the option text.
+        label_expression (Expression): The annotation behind ``label_field``, or None
+            when the label is a plain field.
+        label_models (tuple): Related models the label expression reads through,
+            whose changes must also invalidate cached options.
+        ordering (tuple): The ``order_by`` arguments; always ends with ``pk``.
+    """
+
+    __slots__ = (
+        "model",
+        "field_name",
+        "filter_lookup",
+        "value_field",
+        "label_field",
+        "label_expression",
+        "label_models",
+        "ordering",
+    )
+
+    def __init__(self, model, field, label, label_models=()):
+        self.model = model
+        self.field_name = field.name
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            self.filter_lookup = field.attname
+            self.value_field = field.target_field
+        else:
+            self.filter_lookup = f"{field.name}__pk"
+            self.value_field = field.related_model._meta.pk
+        if isinstance(label, str):
+            self.label_field = label
+            self.label_expression = None
+        else:
+            self.label_field = LABEL_ALIAS
+            self.label_expression = label
+        self.label_models = tuple(label_models)
+        self.ordering = (self.label_field, "pk")
+
+    def queryset(self):
+        """Returns every option row, annotated with the label expression if there is one."""
+
+        queryset = self.model._default_manager.all()
+        if self.label_expression is not None:
+            queryset = queryset.annotate(**{LABEL_ALIAS: self.label_expression})
+        return queryset
+
+    def clean_value(self, value):
+        """
+        Converts a parent id from the request to the type the lookup compares with.
+
+        Raises:
+            ValidationError: If ``value`` is not a valid id, e.g. ``"abc"`` for an
+                integer key.
+        """
+
+        value = self.value_field.to_python(value)
+        if value is None:
+            raise ValidationError("A parent id is required.")
+        return value
+
+    def __repr__(self):
+        return f"<DropdownSource {self.model._meta.label_lower}.{self.field_name}>"
+
+
+class DropdownRegistry:
+    """
+    Allowlist of models and relation fields served by ``dynamic_dropdown_options``.
+
+    Entries are declared with ``register()`` and validated by ``build()`` when the
+    app registry is ready; a bad entry raises ``ImproperlyConfigured`` at startup.
+    Registrations made after ``build()`` are validated immediately.
+
+    Option text comes from the database, never from ``__str__``: a model whose
+    ``__str__`` follows relations declares a label expression that reproduces it,
+    so listing options stays one ``values_list`` query.
+
+    Example:
+        >>> dropdown_registry.register("faction", "faction", label="name")
+        >>> dropdown_registry.get("facility", "quarters", "facility")
+        <DropdownSource facility.quarters.facility>
+    """
+
+    def __init__(self):
+        self._declared = []
+        self._sources = {}
+        self._models = set()
+        self._dependencies = set()
+        self.ready = False
+
+    def register(self, app_label, model_name, label="name", fields=None):
+        """
+        Declares a dropdown source.
+
+        Args:
+            app_label (str): The model's app label.
+            model_name (str): The model name.
+            label (str or Expression): The field used as the option text, or an
+                expression (such as ``Concat``) that reproduces the model's ``__str__``.
+            fields (Iterable[str]): Relation fields options may be filtered by, or
+                None for every relation field on the model.
+        """
+
+        entry = (app_label.lower(), model_name.lower(), label, fields)
+        self._declared.append(entry)
+        if self.ready:
+            self._add(*entry)
+
+    def build(self):
+        """Validates every declared entry and precomputes its lookups."""
+
+        self._sources.clear()
+        self._models.clear()
+        self._dependencies.clear()
+        for entry in self._declared:
+            self._add(*entry)
+        self.ready = True
+
+    def _add(self, app_label, model_name, label, fields):
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError as error:
+            raise ImproperlyConfigured(
+                f"Dropdown source {app_label}.{model_name} is not an installed model."
+            ) from error
+
+        label_models = ()
+        if isinstance(label, str):
+            try:
+                label_field = model._meta.get_field(label)
+            except FieldDoesNotExist as error:
+                raise ImproperlyConfigured(
+                    f"Dropdown source {app_label}.{model_name} has no label field '{label}'."
+                ) from error
+            if label_field.is_relation:
+                raise ImproperlyConfigured(
+                    f"Dropdown label '{label}' on {app_label}.{model_name} must be a plain field."
+                )
+        elif not hasattr(label, "resolve_expression"):
+            raise ImproperlyConfigured(
+                f"Dropdown label on {app_label}.{model_name} must be a field name or an expression."
+            )
+        else:
+            label_models = self._label_models(model, label)
+
+        if fields is None:
+            relations = [
+                field
+                for field in model._meta.get_fields()
+                if field.is_relation and not (field.auto_created and not field.concrete)
+            ]
+        else:
+            relations = []
+            for name in fields:
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist as error:
+                    raise ImproperlyConfigured(
+                        f"Dropdown source {app_label}.{model_name} has no field '{name}'."
+                    ) from error
+                if not field.is_relation:
+                    raise ImproperlyConfigured(
+                        f"Dropdown field {app_label}.{model_name}.{name} is not a relation."
+                    )
+                relations.append(field)
+
+        self._models.add((app_label, model_name))
+        self._dependencies.update(
+            (related._meta.app_label, related._meta.model_name) for related in label_models
+        )
+        for field in relations:
+            self._sources[(app_label, model_name, field.name)] = DropdownSource(
+                model, field, label, label_models
+            )
+
+    def _label_models(self, model, expression):
+        """Returns the related models a label expression joins through."""
+
+        related = []
+        for node in expression.flatten():
+            if not isinstance(node, F):
+                continue
+            opts = model._meta
+            for name in node.name.split("__"):
+                try:
+                    field = opts.get_field(name)
+                except FieldDoesNotExist as error:
+                    raise ImproperlyConfigured(
+                        f"Dropdown label on {model._meta.label_lower} refers to "
+                        f"unknown field '{node.name}'."
+                    ) from error
+                if not field.is_relation:
+                    break
+                opts = field.related_model._meta
+                if field.related_model not in related:
+                    related.append(field.related_model)
+        return tuple(related)
+
+    def is_source_model(self, model):
+        """Returns True if ``model`` backs or labels any registered source."""
+
+        opts = model._meta
+        key = (opts.app_label, opts.model_name)
+        return key in self._models or key in self._dependencies
+
+    def allows_model(self, app_label, model_name):
+        """Returns True if any source is registered for the model."""
+
+        return (app_label.lower(), model_name.lower()) in self._models
+
+    def get(self, app_label, model_name, field_name):
+        """
+        Returns the source for a (model, relation field) triple.
+
+        Returns:
+            DropdownSource or None: None if the triple is not allowed.
+        """
+
+        return self._sources.get((app_label.lower(), model_name.lower(), field_name))
+
+
+class DropdownCache:
+    """
+    Versioned response cache for dropdown option lists.
+
+    Every model has a generation counter stored in the shared cache and bumped by
+    ``pages.signals`` on save/delete. Responses are cached under, and tagged with an
+    ETag derived from, the generations of the source model and of every model its
+    label reads through, plus the request parameters, so a matching
+    ``If-None-Match`` can be answered without touching the database. Writes that
+    bypass model signals (``QuerySet.update``) must call ``invalidate()`` themselves.
+
+    Attributes:
+        hits (int): Responses served from the cache in this process.
+        not_modified (int): Requests answered with 304 in this process.
+        misses (int): Responses built from the database in this process.
+        invalidations (int): Generation bumps made by this process.
+    """
+
+    def __init__(self, timeout=CACHE_TIMEOUT):
+        self.timeout = timeout
+        self._lock = Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.not_modified = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _generation_key(self, model):
+        return f"{CACHE_PREFIX}:gen:{model._meta.label_lower}"
+
+    def generation(self, model):
+        """Returns the current generation for ``model``, initialising it if needed."""
+
+        return get_generation(self._generation_key(model))
+
+    def invalidate(self, model):
+        """Bumps the generation for ``model`` so every cached list for it goes stale."""
+
+        bump_generation(self._generation_key(model))
+        self._count("invalidations")
+
+    def etag(self, source, *params):
+        """
+        Returns the strong ETag for a source and request parameters.
+
+        Args:
+            source (DropdownSource): The validated source.
+            *params: The filter value and paging/search parameters.
+
+        Returns:
+            str: A quoted ETag value.
+        """
+
+        models = (source.model, *source.label_models)
+        generations = get_generations([self._generation_key(model) for model in models])
+        raw = "\x1f".join(
+            str(part)
+            for part in (
+                source.model._meta.label_lower,
+                *generations,
+                source.field_name,
+                *params,
+            )
+        )
+        return f'"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+    def get(self, etag):
+        """Returns the cached response body for ``etag``, or None."""
+
+        body = cache.get(f"{CACHE_PREFIX}:body:{etag}")
+        self._count("hits" if body is not None else "misses")
+        return body
+
+    def set(self, etag, body):
+        cache.set(f"{CACHE_PREFIX}:body:{etag}", body, self.timeout)
+
+    def record_not_modified(self):
+        self._count("not_modified")
+
+    def stats(self):
+        """
+        Returns the counters for monitoring.
+
+        Returns:
+            dict: Hit/miss/304/invalidation counts and the combined hit rate.
+        """
+
+        with self._lock:
+            served = self.hits + self.not_modified
+            total = served + self.misses
+            return {
+                "hits": self.hits,
+                "not_modified": self.not_modified,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": served / total if total else 0.0,
+            }
+
+
+dropdown_cache = DropdownCache()
+dropdown_registry = DropdownRegistry()
+dropdown_registry.register("organization", "organization")
+dropdown_registry.register("facility", "facility")
+dropdown_registry.register(
+    "facility", "quarters", label=Concat("name", Value(" - "), "facility__name")
+)
+dropdown_registry.register("faction", "faction")
+dropdown_registry.register("course", "course")
+dropdown_registry.register(
+    "enrollment",
+    "facilityenrollment",
+    label=Concat("facility__name", Value(" - "), "name"),
+)
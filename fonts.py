@@ -0,0 +1,169 @@
+""" Bundled Web Fonts. """
+
+import json
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+FONT_DIR = "css"
+OUTPUT_DIR = "css/fonts"
+MANIFEST_PATH = "css/fonts/fonts.json"
+
+FontFace = namedtuple("FontFace", "family source weight style")
+
+# One face per file; a weight range replaces the per-weight copies that pointed
+# at the same file.
+FONT_FACES = (
+    FontFace("Alexa", "AlexaStd.otf", "400", "normal"),
+    FontFace("Proxima-nova-lt", "ProximaNova-Light.otf", "300 400", "normal"),
+    FontFace("Proxima-nova-b", "ProximaNovaCond-Semibold.otf", "400", "normal"),
+    FontFace("Proxima-nova", "ProximaNova-Regular.otf", "300 600", "normal"),
+)
+
+# Subset ranges, in the order browsers should consider them.
+UNICODE_RANGES = (
+    (
+        "latin",
+        "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, "
+        "U+2000-206F, U+2074, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, "
+        "U+FEFF, U+FFFD",
+    ),
+    (
+        "latin-ext",
+        "U+0100-024F, U+0259, U+1E00-1EFF, U+2020, U+20A0-20AB, U+20AD-20CF, "
+        "U+2113, U+2C60-2C7F, U+A720-A7FF",
+    ),
+)
+
+# The face rendered above the fold on the landing page.
+CRITICAL_FACE = ("Proxima-nova-b", "latin")
+
+
+@lru_cache(maxsize=1)
+def load_manifest():
+    """
+    Returns the subset manifest written by ``manage.py build_fonts``.
+
+    Returns:
+        dict: ``source file -> {subset: static path}``, or an empty dict before the
+        build has run.
+    """
+
+    path = finders.find(MANIFEST_PATH)
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def font_face_rule(face, src, unicode_range=None):
+    lines = [
+        f"font-family:'{face.family}'",
+        f"src:{src}",
+        f"font-weight:{face.weight}",
+        f"font-style:{face.style}",
+        "font-display:swap",
+    ]
+    if unicode_range:
+        lines.append(f"unicode-range:{unicode_range}")
+    return "@font-face{" + ";".join(lines) + "}"
+
+
+def font_face_css(faces=FONT_FACES):
+    """
+    Renders one ``@font-face`` rule per face and subset.
+
+    Subset WOFF2 files are used once ``manage.py build_fonts`` has run; until then
+    each face falls back to its original OpenType file without a ``unicode-range``.
+    """
+
+    manifest = load_manifest()
+    rules = []
+    for face in faces:
+        subsets = manifest.get(face.source)
+        if not subsets:
+            src = f"url('{static(f'{FONT_DIR}/{face.source}')}') format('opentype')"
+            rules.append(font_face_rule(face, src))
+            continue
+        for subset, unicode_range in UNICODE_RANGES:
+            if subset in subsets:
+                src = f"url('{static(subsets[subset])}') format('woff2')"
+                rules.append(font_face_rule(face, src, unicode_range))
+    return "\n".join(rules)
+
+
+def render_font_preload(family, subset="latin"):
+    """Renders a ``<link rel="preload">`` for one WOFF2 subset, or ``""`` before the build."""
+
+    for face in FONT_FACES:
+        if face.family == family:
+            path = load_manifest().get(face.source, {}).get(subset)
+            if path:
+                return format_html(
+                    '<link rel="preload" as="font" type="font/woff2" href="{}" crossorigin>',
+                    static(path),
+                )
+    return ""
+
+
+def unicodes(unicode_range):
+    """Expands a CSS ``unicode-range`` value into code points."""
+
+    points = []
+    for part in unicode_range.split(","):
+        part = part.strip().removeprefix("U+")
+        start, _, end = part.partition("-")
+        points.extend(range(int(start, 16), int(end or start, 16) + 1))
+    return points
+
+
+def build_fonts(static_root, faces=FONT_FACES, log=None):
+    """
+    Writes a WOFF2 subset of every face for every unicode range and the manifest.
+
+    Subsets that would contain no glyphs are skipped. Requires fontTools with the
+    ``brotli`` package for WOFF2 output.
+    """
+
+    from fontTools.subset import Options, Subsetter
+    from fontTools.ttLib import TTFont
+
+    output_dir = Path(static_root, OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for face in {face.source: face for face in faces}.values():
+        source = Path(static_root, FONT_DIR, face.source)
+        entry = {}
+        for subset, unicode_range in UNICODE_RANGES:
+            font = TTFont(source)
+            wanted = set(unicodes(unicode_range)) & set(font.getBestCmap())
+            if not wanted:
+                continue
+            options = Options()
+            options.flavor = "woff2"
+            options.layout_features = ["kern", "liga", "calt", "ccmp", "locl", "mark", "mkmk"]
+            options.notdef_outline = True
+            options.desubroutinize = True
+            subsetter = Subsetter(options)
+            subsetter.populate(unicodes=wanted)
+            subsetter.subset(font)
+            name = f"{source.stem}-{subset}.woff2"
+            font.flavor = "woff2"
+            font.save(output_dir / name)
+            entry[subset] = f"{OUTPUT_DIR}/{name}"
+            if log:
+                log(
+                    f"Wrote {OUTPUT_DIR}/{name} ({len(wanted)} glyphs, "
+                    f"{(output_dir / name).stat().st_size / 1024:.1f} KB)"
+                )
+        manifest[face.source] = entry
+
+    Path(static_root, MANIFEST_PATH).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    load_manifest.cache_clear()
+    return manifest
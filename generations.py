@@ -0,0 +1,67 @@
+""" Shared-Cache Generation Counters. """
+
+import secrets
+
+from django.core.cache import cache
+
+
+def new_generation():
+    """
+    Returns a seed for a missing generation counter.
+
+    Counters start at a random 62-bit value rather than 1, so a counter that was
+    evicted or expired does not restart at a value it already had, and cached
+    bodies and ETags stamped with an old generation do not become valid again. The
+    headroom keeps ``incr`` within the 64-bit range of every cache backend.
+    """
+
+    return secrets.randbits(62)
+
+
+def get_generations(keys):
+    """
+    Returns the generation for each key, seeding missing counters.
+
+    Returns:
+        list: The generations in ``keys`` order.
+    """
+
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            seed = new_generation()
+            cache.add(key, seed, None)
+            found[key] = cache.get(key, seed)
+    return [found[key] for key in keys]
+
+
+def get_generation(key):
+    """Returns the generation stored under ``key``, seeding it if needed."""
+
+    return get_generations([key])[0]
+
+
+def peek_generation(key):
+    """
+    Returns the generation stored under ``key``, or None without seeding it.
+
+    Lets callers that take keys from untrusted input skip pks that never had a
+    counter instead of filling the shared cache with non-expiring entries.
+    """
+
+    return cache.get(key)
+
+
+def bump_generation(key):
+    """
+    Advances the generation stored under ``key`` and returns the new value.
+
+    A missing counter is reseeded instead of restarting from a fixed value.
+    """
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        seed = new_generation()
+        cache.add(key, seed, None)
+        return cache.get(key, seed)
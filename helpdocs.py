@@ -0,0 +1,235 @@
+""" Help Content And Search Index. """
+
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import combinations
+from types import MappingProxyType
+
+from .search import search_tokens
+
+SCOPES = ("facility", "faction")
+STOP_WORDS = frozenset(
+    {"a", "an", "and", "can", "do", "for", "how", "i", "in", "is", "my", "of",
+     "the", "to", "what", "where", "which", "who", "with"}
+)
+TITLE_WEIGHT = 3
+TEXT_WEIGHT = 1
+
+HelpSection = namedtuple("HelpSection", "key title items scope")
+SearchDocument = namedtuple("SearchDocument", "kind title text url section scope")
+
+HELP_SECTIONS = (
+    HelpSection(
+        "navigation",
+        "Navigation",
+        (
+            "Use Dashboard for role-specific work and Resources for cross-role links.",
+            "Pinned navigation items are stored per user and can be changed from the sidebar.",
+            "Detail pages use tabs for profile, enrollment, and related operational views.",
+        ),
+        None,
+    ),
+    HelpSection(
+        "enrollment",
+        "Enrollment",
+        (
+            "Attendee enrollment pages are scoped by attendee slug.",
+            "Faculty enrollment pages are scoped by facility and faculty slug.",
+            "Leader access follows the faction chain so root-faction leaders can review sub-faction attendees.",
+        ),
+        None,
+    ),
+    HelpSection(
+        "facility",
+        "Facility Workflows",
+        (
+            "Your facility context is {facility}.",
+            "Department admins can manage faculty for their facility.",
+            "Staff without management permissions see the branded access-denied page.",
+        ),
+        "facility",
+    ),
+    HelpSection(
+        "faction",
+        "Faction Workflows",
+        (
+            "Your faction context is {faction}.",
+            "Faction dashboards summarize roster and enrollment activity.",
+            "Attendee and leader detail pages expose enrollment tabs when the viewer is in the same faction chain.",
+        ),
+        "faction",
+    ),
+)
+
+
+def scope_key(facility=None, faction=None):
+    """Returns the compiled-help key for a user's facility/faction context."""
+
+    return frozenset(
+        name for name, value in zip(SCOPES, (facility, faction)) if value is not None
+    )
+
+
+def interpolate(text, scope, values):
+    return text.format_map(values) if scope else text
+
+
+def index_tokens(text):
+    """Returns the lower-cased, stop-word-free tokens of ``text``."""
+
+    return [
+        token
+        for token in (token.lower() for token in search_tokens(text))
+        if token not in STOP_WORDS
+    ]
+
+
+class InvertedIndex:
+    """
+    Immutable token → document postings with prefix matching.
+
+    Every query token must match (as a prefix) a token of the document's title or
+    text. Title matches weigh more than text matches; results are ordered by score
+    and then by document order.
+
+    Args:
+        documents (Iterable[SearchDocument]): The documents to index.
+
+    Example:
+        >>> index = InvertedIndex([SearchDocument("help", "Enrollment", "...", None, None, None)])
+        >>> [doc.title for doc, _ in index.search("enrol")]
+        ['Enrollment']
+    """
+
+    def __init__(self, documents):
+        self.documents = tuple(documents)
+        postings = {}
+        for position, document in enumerate(self.documents):
+            for weight, text in ((TEXT_WEIGHT, document.text), (TITLE_WEIGHT, document.title)):
+                for token in index_tokens(text):
+                    entry = postings.setdefault(token, {})
+                    entry[position] = max(entry.get(position, 0), weight)
+        self.postings = MappingProxyType(
+            {token: MappingProxyType(entry) for token, entry in postings.items()}
+        )
+        self.vocabulary = tuple(sorted(postings))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _matches(self, prefix):
+        scores = {}
+        start = bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            for position, weight in self.postings[token].items():
+                if weight > scores.get(position, 0):
+                    scores[position] = weight
+        return scores
+
+    def search(self, query, limit=10):
+        """
+        Returns up to ``limit`` ``(document, score)`` pairs for ``query``.
+
+        Returns:
+            list: An empty list when the query has no searchable tokens.
+        """
+
+        tokens = index_tokens(query)
+        if not tokens:
+            return []
+        totals = None
+        for token in dict.fromkeys(tokens):
+            scores = self._matches(token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {
+                    position: total + scores[position]
+                    for position, total in totals.items()
+                    if position in scores
+                }
+            if not totals:
+                return []
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.documents[position], score) for position, score in ranked[:limit]]
+
+
+def compile_help(sections=HELP_SECTIONS):
+    """
+    Returns the visible sections and their search index for every scope combination.
+
+    Returns:
+        MappingProxyType: ``scope_key -> (sections, InvertedIndex)``.
+    """
+
+    compiled = {}
+    for size in range(len(SCOPES) + 1):
+        for scopes in combinations(SCOPES, size):
+            key = frozenset(scopes)
+            visible = tuple(
+                section for section in sections if section.scope is None or section.scope in key
+            )
+            documents = [
+                SearchDocument("help", section.title, item, None, section.key, section.scope)
+                for section in visible
+                for item in section.items
+            ]
+            compiled[key] = (visible, InvertedIndex(documents))
+    return MappingProxyType(compiled)
+
+
+COMPILED_HELP = compile_help()
+
+
+def help_sections(facility=None, faction=None, section=None):
+    """
+    Returns the help sections for a facility/faction context.
+
+    Only the ``{facility}``/``{faction}`` placeholders are filled per call; the
+    section list itself is compiled once at import.
+
+    Args:
+        facility: The user's facility, or None.
+        faction: The user's faction, or None.
+        section (str): Restrict the result to the section with this key.
+
+    Returns:
+        list: Section dicts with ``key``, ``title`` and ``items``.
+    """
+
+    values = {"facility": facility, "faction": faction}
+    visible, _ = COMPILED_HELP[scope_key(facility, faction)]
+    return [
+        {
+            "key": entry.key,
+            "title": entry.title,
+            "items": [interpolate(item, entry.scope, values) for item in entry.items],
+        }
+        for entry in visible
+        if section is None or entry.key == section
+    ]
+
+
+def help_index(facility=None, faction=None):
+    """Returns the prebuilt help search index for a facility/faction context."""
+
+    return COMPILED_HELP[scope_key(facility, faction)][1]
+
+
+def resource_index(sections):
+    """Builds the search index for a list of resource sections."""
+
+    return InvertedIndex(
+        SearchDocument(
+            "resource",
+            item["label"],
+            item["description"],
+            item["url"],
+            section["title"],
+            None,
+        )
+        for section in sections
+        for item in section["items"]
+    )
@@ -0,0 +1,118 @@
+""" Request-Scoped Identity Map. """
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+_current = ContextVar("pages_identity_map", default=None)
+
+
+class IdentityMap:
+    """
+    Instances loaded by ``AbstractBaseManager.get_or_none`` during one request.
+
+    Repeated primary-key or unique-field lookups return the same instance instead of
+    querying again. The map lives for one request (``IdentityMapMiddleware``) or one
+    ``identity_map()`` block and must not outlive it. Entries for a row are evicted
+    when it is saved or deleted, and ``AbstractBaseQuerySet.update()`` and
+    ``bulk_update()`` evict the rows they write, which send no signals. Writes
+    through raw SQL or other querysets are not seen.
+
+    Attributes:
+        hits (int): Lookups answered from the map.
+        misses (int): Cacheable lookups that went to the database.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._objects = {}
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, key):
+        obj = self._objects.get(key)
+        if obj is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return obj
+
+    def add(self, key, instance):
+        self._objects[key] = instance
+        row = (instance._meta.label_lower, instance.pk)
+        self._keys.setdefault(row, set()).add(key)
+
+    def evict(self, model, pk):
+        for key in self._keys.pop((model._meta.label_lower, pk), ()):
+            self._objects.pop(key, None)
+
+    def evict_model(self, model):
+        """Drops every entry for ``model``, e.g. after a bulk ``update()``."""
+
+        label = model._meta.label_lower
+        for row in [row for row in self._keys if row[0] == label]:
+            for key in self._keys.pop(row):
+                self._objects.pop(key, None)
+
+
+def current_identity_map():
+    """Returns the active identity map, or None outside ``identity_map()``."""
+
+    return _current.get()
+
+
+@contextmanager
+def identity_map():
+    """
+    Activates a fresh identity map for the enclosed block.
+
+    Example:
+        >>> with identity_map() as identity:
+        ...     Organization.objects.get_or_none(pk=1)
+    """
+
+    identity = IdentityMap()
+    token = _current.set(identity)
+    try:
+        yield identity
+    finally:
+        _current.reset(token)
+
+
+def identity_key(manager, kwargs):
+    """
+    Returns the identity-map key for a lookup, or None if it is not a unique lookup.
+
+    Only single ``pk``/``<unique field>`` (optionally ``__exact``) lookups qualify.
+    """
+
+    if len(kwargs) != 1:
+        return None
+    (name, value), = kwargs.items()
+    if name.endswith("__exact"):
+        name = name[: -len("__exact")]
+    if "__" in name:
+        return None
+
+    opts = manager.model._meta
+    try:
+        field = opts.pk if name == "pk" else opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not getattr(field, "concrete", False) or not (field.primary_key or field.unique):
+        return None
+
+    if field.is_relation:
+        value = getattr(value, "pk", value)
+        target = field.target_field
+    else:
+        target = field
+    try:
+        value = target.to_python(value)
+    except (TypeError, ValidationError):
+        return None
+    return (opts.label_lower, manager.db, type(manager).__qualname__, field.attname, value)
@@ -0,0 +1,192 @@
+""" Responsive Image Variants. """
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+MANIFEST_PATH = "images/responsive.json"
+VARIANT_DIR = "responsive"
+SOURCE_DIRS = ("images/splash", "images/landing")
+IMAGE_WIDTHS = (64, 128, 320, 640, 1024, 1600)
+# Best first: the browser takes the first <source> whose type it supports.
+IMAGE_FORMATS = ("avif", "webp")
+SAVE_OPTIONS = {"avif": {"quality": 50, "speed": 6}, "webp": {"quality": 72, "method": 6}}
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+
+@lru_cache(maxsize=1)
+def load_manifest():
+    """
+    Returns the variant manifest written by ``manage.py build_images``.
+
+    Returns:
+        dict: ``static path -> {"width", "height", "variants": {format: [[w, path]]}}``,
+        or an empty dict before the build has run.
+    """
+
+    path = finders.find(MANIFEST_PATH)
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def srcset(variants):
+    return ", ".join(f"{static(path)} {width}w" for width, path in variants)
+
+
+def render_picture(path, entry, alt="", sizes="100vw", loading="lazy", width=None,
+                   height=None, css_class="", priority=False):
+    """
+    Renders a ``<picture>`` with one ``<source>`` per variant format.
+
+    Args:
+        path (str): The original image's static path, used as the ``<img>`` fallback.
+        entry (dict): The manifest entry for ``path``, or None.
+        alt (str): The alternative text.
+        sizes (str): The ``sizes`` attribute describing the rendered width.
+        loading (str): ``"lazy"`` for below-the-fold images, ``"eager"`` otherwise.
+        width (int): Overrides the intrinsic width from the manifest.
+        height (int): Overrides the intrinsic height from the manifest.
+        css_class (str): Classes for the ``<img>``.
+        priority (bool): Marks the image ``fetchpriority="high"`` and loads it eagerly.
+
+    Returns:
+        SafeString: The markup.
+    """
+
+    entry = entry or {}
+    width = width or entry.get("width")
+    height = height or entry.get("height")
+    if priority:
+        loading = "eager"
+
+    attributes = [("src", static(path)), ("alt", alt)]
+    if width and height:
+        attributes += [("width", width), ("height", height)]
+    if css_class:
+        attributes.append(("class", css_class))
+    attributes += [("loading", loading), ("decoding", "auto" if priority else "async")]
+    if priority:
+        attributes.append(("fetchpriority", "high"))
+    img = format_html("<img{}>", format_html_join("", ' {}="{}"', attributes))
+
+    variants = entry.get("variants") or {}
+    sources = [
+        (f"image/{fmt}", srcset(variants[fmt]), sizes)
+        for fmt in IMAGE_FORMATS
+        if variants.get(fmt)
+    ]
+    if not sources:
+        return img
+    return format_html(
+        "<picture>{}{}</picture>",
+        format_html_join("", '<source type="{}" srcset="{}" sizes="{}">', sources),
+        img,
+    )
+
+
+def render_preload(path, entry, sizes="100vw"):
+    """
+    Renders a ``<link rel="preload">`` for the best variant format of ``path``.
+
+    The link carries ``type`` so browsers that cannot decode the format skip the
+    preload instead of downloading an image they will not use. Nothing is rendered
+    until ``build_images`` has written variants: preloading the original would
+    fetch the full-size source at high priority.
+    """
+
+    variants = (entry or {}).get("variants") or {}
+    for fmt in IMAGE_FORMATS:
+        if variants.get(fmt):
+            return format_html(
+                '<link rel="preload" as="image" type="image/{}" imagesrcset="{}" '
+                'imagesizes="{}" fetchpriority="high">',
+                fmt,
+                srcset(variants[fmt]),
+                sizes,
+            )
+    return ""
+
+
+def variant_widths(original_width, widths=IMAGE_WIDTHS):
+    """Returns the target widths for an image, never upscaling past its own width."""
+
+    chosen = [width for width in widths if width < original_width]
+    chosen.append(min(original_width, widths[-1]))
+    return sorted(set(chosen))
+
+
+def iter_sources(static_root, source_dirs=SOURCE_DIRS):
+    """Yields ``(static path, file path)`` for every source image under ``source_dirs``."""
+
+    for source_dir in source_dirs:
+        directory = Path(static_root, source_dir)
+        for file_path in sorted(directory.iterdir()):
+            if file_path.is_file() and file_path.suffix.lower() in SOURCE_SUFFIXES:
+                yield f"{source_dir}/{file_path.name}", file_path
+
+
+def build_variants(static_root, source_dirs=SOURCE_DIRS, formats=IMAGE_FORMATS,
+                   force=False, log=None):
+    """
+    Writes resized variants of every source image and returns the manifest.
+
+    Entries for images outside ``source_dirs`` are kept in the manifest.
+    Variants go to ``<source dir>/responsive/<stem>-<width>w.<format>`` and are
+    only regenerated when missing, older than the source, or ``force`` is set.
+    Requires Pillow; formats Pillow cannot encode are skipped.
+    """
+
+    from PIL import Image
+
+    try:
+        import pillow_avif  # noqa: F401  Registers the AVIF codec on older Pillow.
+    except ImportError:
+        pass
+
+    Image.init()
+    supported = [fmt for fmt in formats if fmt.upper() in Image.SAVE]
+    for fmt in formats:
+        if fmt not in supported and log:
+            log(f"Skipping {fmt}: Pillow cannot encode it here.")
+
+    manifest_file = Path(static_root, MANIFEST_PATH)
+    manifest = {}
+    if manifest_file.exists():
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    for static_path, file_path in iter_sources(static_root, source_dirs):
+        with Image.open(file_path) as image:
+            image.load()
+            original_width, original_height = image.size
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            entry = {"width": original_width, "height": original_height, "variants": {}}
+            output_dir = file_path.parent / VARIANT_DIR
+            variant_dir = f"{static_path.rsplit('/', 1)[0]}/{VARIANT_DIR}"
+            output_dir.mkdir(exist_ok=True)
+            source_mtime = file_path.stat().st_mtime
+            for fmt in supported:
+                variants = []
+                for width in variant_widths(original_width):
+                    name = f"{file_path.stem}-{width}w.{fmt}"
+                    target = output_dir / name
+                    if force or not target.exists() or target.stat().st_mtime < source_mtime:
+                        height = round(original_height * width / original_width)
+                        resized = image.resize((width, height), Image.LANCZOS)
+                        resized.save(target, fmt.upper(), **SAVE_OPTIONS[fmt])
+                        if log:
+                            log(f"Wrote {target.relative_to(static_root)}")
+                    variants.append([width, f"{variant_dir}/{name}"])
+                entry["variants"][fmt] = variants
+            manifest[static_path] = entry
+
+    manifest_file.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    load_manifest.cache_clear()
+    return manifest
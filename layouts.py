@@ -0,0 +1,286 @@
+""" Dashboard Layout Persistence. """
+
+import json
+
+from django.db import IntegrityError, connections, router, transaction
+
+from core.models.dashboard import DashboardLayout
+
+DEFAULT_PORTAL_KEY = "default"
+MAX_LAYOUT_ITEMS = 100
+# One retry covers the get-or-insert race: after a lost insert the row exists.
+WRITE_ATTEMPTS = 2
+
+_HIDE_SQL = (
+    "UPDATE {table} SET {hidden} = CASE "
+    "WHEN COALESCE({hidden}, '[]'::jsonb) @> %s::jsonb THEN {hidden} "
+    "ELSE COALESCE({hidden}, '[]'::jsonb) || %s::jsonb END "
+    "WHERE {user} = %s AND {portal} = %s RETURNING {hidden}"
+)
+_SHOW_SQL = (
+    "UPDATE {table} SET {hidden} = COALESCE({hidden}, '[]'::jsonb) - %s "
+    "WHERE {user} = %s AND {portal} = %s RETURNING {hidden}"
+)
+
+
+def layout_lookup(user, portal_key):
+    """
+    Returns the filter kwargs identifying a user's layout row for a portal.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key, or None for the default portal.
+
+    Returns:
+        dict: Lookup kwargs for ``DashboardLayout``.
+    """
+
+    return {"user": user, "portal_key": portal_key or DEFAULT_PORTAL_KEY}
+
+
+def _decode(value):
+    if isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    return list(value or [])
+
+
+def _decode_order(value):
+    try:
+        return json.loads(value) if value else None
+    except ValueError:
+        return None
+
+
+def _sql(template):
+    opts = DashboardLayout._meta
+    return template.format(
+        table=opts.db_table,
+        hidden=opts.get_field("hidden_widgets").column,
+        user=opts.get_field("user").column,
+        portal=opts.get_field("portal_key").column,
+    )
+
+
+def _create(lookup, **values):
+    """
+    Creates the layout row, returning None if a concurrent request beat us to it.
+
+    Raises:
+        IntegrityError: If the insert failed for any other reason (the row still
+            does not exist), such as a NOT NULL violation or a deleted user.
+    """
+
+    try:
+        with transaction.atomic(using=router.db_for_write(DashboardLayout)):
+            return DashboardLayout.objects.create(**lookup, **values)
+    except IntegrityError:
+        if DashboardLayout.objects.filter(**lookup).exists():
+            return None
+        raise
+
+
+def _lost_race():
+    return IntegrityError("The dashboard layout row changed on every write attempt.")
+
+
+def _update_column(lookup, field, value):
+    """Writes a single column with one UPDATE, creating the row on first use."""
+
+    for _ in range(WRITE_ATTEMPTS):
+        if DashboardLayout.objects.filter(**lookup).update(**{field: value}):
+            return
+        if _create(lookup, **{field: value}) is not None:
+            return
+    raise _lost_race()
+
+
+def _mutate_hidden(lookup, mutate):
+    """Applies ``mutate`` to the hidden widget list under a row lock."""
+
+    for _ in range(WRITE_ATTEMPTS):
+        with transaction.atomic(using=router.db_for_write(DashboardLayout)):
+            current = (
+                DashboardLayout.objects.select_for_update()
+                .filter(**lookup)
+                .values_list("pk", "hidden_widgets")
+                .first()
+            )
+            if current is not None:
+                pk, hidden = current
+                hidden = _decode(hidden)
+                updated = mutate(list(hidden))
+                if updated != hidden:
+                    DashboardLayout.objects.filter(pk=pk).update(
+                        hidden_widgets=updated
+                    )
+                return updated
+        updated = mutate([])
+        if _create(lookup, hidden_widgets=updated) is not None:
+            return updated
+    raise _lost_race()
+
+
+def _returning(lookup, template, params):
+    """
+    Runs a single ``UPDATE ... RETURNING`` on PostgreSQL.
+
+    Returns:
+        list or None: The new hidden widget list, or None if no row matched or the
+        backend has no JSONB operators.
+    """
+
+    connection = connections[router.db_for_write(DashboardLayout)]
+    if connection.vendor != "postgresql":
+        return None
+    user = lookup["user"]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _sql(template),
+            [*params, getattr(user, "pk", user), lookup["portal_key"]],
+        )
+        row = cursor.fetchone()
+    return None if row is None else _decode(row[0])
+
+
+def hide_widget(user, portal_key, widget_key):
+    """
+    Adds a widget to the hidden list in a single statement where supported.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key.
+        widget_key (str): The widget to hide.
+
+    Returns:
+        list: The hidden widget keys after the change.
+    """
+
+    lookup = layout_lookup(user, portal_key)
+    encoded = json.dumps([widget_key])
+    hidden = _returning(lookup, _HIDE_SQL, [encoded, encoded])
+    if hidden is not None:
+        return hidden
+
+    def add(items):
+        if widget_key not in items:
+            items.append(widget_key)
+        return items
+
+    return _mutate_hidden(lookup, add)
+
+
+def show_widget(user, portal_key, widget_key):
+    """
+    Removes a widget from the hidden list in a single statement where supported.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key.
+        widget_key (str): The widget to restore.
+
+    Returns:
+        list: The hidden widget keys after the change.
+    """
+
+    lookup = layout_lookup(user, portal_key)
+    hidden = _returning(lookup, _SHOW_SQL, [widget_key])
+    if hidden is not None:
+        return hidden
+    return _mutate_hidden(
+        lookup, lambda items: [item for item in items if item != widget_key]
+    )
+
+
+def reset_hidden(user, portal_key):
+    """
+    Clears the hidden widget list with a single UPDATE.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key.
+
+    Returns:
+        list: The (empty) hidden widget keys.
+    """
+
+    _update_column(layout_lookup(user, portal_key), "hidden_widgets", [])
+    return []
+
+
+def save_order(user, portal_key, layout):
+    """
+    Stores the widget order with a single UPDATE.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key.
+        layout (list[str]): Widget keys in display order.
+
+    Returns:
+        list: The stored widget order.
+    """
+
+    layout = list(layout[:MAX_LAYOUT_ITEMS])
+    _update_column(layout_lookup(user, portal_key), "layout", json.dumps(layout))
+    return layout
+
+
+def apply_operations(user, portal_key, operations):
+    """
+    Applies an ordered batch of layout operations in one transaction.
+
+    The row is locked and read once, every operation is applied in memory and only
+    the columns that changed are written back. A lost insert race is retried once;
+    any other insert failure is raised.
+
+    Args:
+        user: The owner of the layout.
+        portal_key (str): The portal key.
+        operations (list[tuple]): ``(action, value)`` pairs where action is one of
+            ``hide_widget``/``show_widget`` (value is a widget key), ``reset_hidden``
+            (value is ignored) or ``save_layout`` (value is a list of widget keys).
+
+    Returns:
+        dict: The resulting ``hidden_widgets`` list and ``layout`` order (None if the
+        order was never saved).
+    """
+
+    lookup = layout_lookup(user, portal_key)
+    for _ in range(WRITE_ATTEMPTS):
+        with transaction.atomic(using=router.db_for_write(DashboardLayout)):
+            current = (
+                DashboardLayout.objects.select_for_update()
+                .filter(**lookup)
+                .values_list("pk", "hidden_widgets", "layout")
+                .first()
+            )
+            pk, hidden, order = current or (None, [], None)
+            hidden = _decode(hidden)
+            order = _decode_order(order)
+            updated_hidden, updated_order = list(hidden), order
+
+            for action, value in operations:
+                if action == "hide_widget":
+                    if value not in updated_hidden:
+                        updated_hidden.append(value)
+                elif action == "show_widget":
+                    updated_hidden = [item for item in updated_hidden if item != value]
+                elif action == "reset_hidden":
+                    updated_hidden = []
+                elif action == "save_layout":
+                    updated_order = list(value[:MAX_LAYOUT_ITEMS])
+
+            changes = {}
+            if updated_hidden != hidden:
+                changes["hidden_widgets"] = updated_hidden
+            if updated_order != order:
+                changes["layout"] = json.dumps(updated_order)
+
+            result = {"hidden_widgets": updated_hidden, "layout": updated_order}
+            if pk is not None:
+                if changes:
+                    DashboardLayout.objects.filter(pk=pk).update(**changes)
+                return result
+            if _create(lookup, **changes) is not None:
+                return result
+    raise _lost_race()
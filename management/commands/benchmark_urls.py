@@ -0,0 +1,56 @@
+""" Micro-benchmark for the reverse URL registry. """
+
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.urls import NoReverseMatch, reverse
+
+from pages.routing import url_registry
+
+SAMPLES = (
+    ("help", None),
+    ("resources", None),
+    ("dashboard", None),
+    ("reports:list_user_reports", None),
+    ("facilities:faculty:index", {"facility_slug": "camp-lakeside"}),
+    (
+        "facilities:faculty:enrollments:index",
+        {"facility_slug": "camp-lakeside", "faculty_slug": "jane-doe"},
+    ),
+    ("factions:show", {"faction_slug": "troop-101"}),
+)
+
+
+def legacy_reverse(name, kwargs=None):
+    try:
+        return reverse(name, kwargs=kwargs or {})
+    except NoReverseMatch:
+        return "#"
+
+
+class Command(BaseCommand):
+    help = "Compares per-call reverse() against pages.routing.url_registry."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        url_registry.table()
+
+        for label, resolve in (
+            ("reverse()", legacy_reverse),
+            ("url_registry", url_registry.reverse),
+        ):
+            total = 0.0
+            for name, kwargs in SAMPLES:
+                elapsed = timeit.timeit(lambda: resolve(name, kwargs), number=number)
+                total += elapsed
+                self.stdout.write(
+                    f"{label:<14} {name:<40} {elapsed / number * 1e6:8.2f} us/call"
+                )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label:<14} {'total':<40} {total / number * 1e6:8.2f} us/pass"
+                )
+            )
@@ -0,0 +1,36 @@
+""" Build badge thumbnails and sprite sheets. """
+
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.badges import badge_key, build_badges
+
+
+class Command(BaseCommand):
+    help = "Writes badge thumbnails, sprite sheets and images/user_files/badges/derivatives/index.json."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sprite",
+            action="append",
+            dest="members",
+            help="Badge to pack into the sprite sheets (repeatable). Defaults to every badge.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import PIL  # noqa: F401
+        except ImportError as error:
+            raise CommandError("build_badges requires Pillow.") from error
+
+        static_root = Path(apps.get_app_config("pages").path, "static")
+        members = [badge_key(name) for name in options["members"] or ()]
+        index = build_badges(static_root, members=members or None, log=self.stdout.write)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(index['badges'])} badges thumbnailed, "
+                f"{len(index['sprites'])} sprite sheets written."
+            )
+        )
@@ -0,0 +1,38 @@
+""" Subset the bundled fonts and convert them to WOFF2. """
+
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.fonts import FONT_DIR, FONT_FACES, build_fonts
+
+
+class Command(BaseCommand):
+    help = "Writes WOFF2 unicode-range subsets of the bundled fonts and css/fonts/fonts.json."
+
+    def handle(self, *args, **options):
+        try:
+            import brotli  # noqa: F401
+            import fontTools  # noqa: F401
+        except ImportError as error:
+            raise CommandError("build_fonts requires fontTools and brotli.") from error
+
+        static_root = Path(apps.get_app_config("pages").path, "static")
+        manifest = build_fonts(static_root, log=self.stdout.write)
+
+        original = sum(
+            Path(static_root, FONT_DIR, source).stat().st_size
+            for source in {face.source for face in FONT_FACES}
+        )
+        subsets = sum(
+            Path(static_root, path).stat().st_size
+            for entry in manifest.values()
+            for path in entry.values()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{original / 1024:.0f} KB of OpenType reduced to "
+                f"{subsets / 1024:.0f} KB of WOFF2 subsets."
+            )
+        )
@@ -0,0 +1,64 @@
+""" Build responsive WebP/AVIF variants for landing page images. """
+
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.images import IMAGE_FORMATS, SOURCE_DIRS, build_variants
+
+
+class Command(BaseCommand):
+    help = "Writes resized WebP/AVIF variants and images/responsive.json for pages static images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            dest="sources",
+            help="Static directory to process, relative to pages/static (repeatable).",
+        )
+        parser.add_argument(
+            "--format",
+            action="append",
+            dest="formats",
+            choices=IMAGE_FORMATS,
+            help="Variant format to build (repeatable). Defaults to all.",
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Rebuild variants that are up to date."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import PIL  # noqa: F401
+        except ImportError as error:
+            raise CommandError("build_images requires Pillow.") from error
+
+        static_root = Path(apps.get_app_config("pages").path, "static")
+        manifest = build_variants(
+            static_root,
+            source_dirs=tuple(options["sources"] or SOURCE_DIRS),
+            formats=tuple(options["formats"] or IMAGE_FORMATS),
+            force=options["force"],
+            log=self.stdout.write,
+        )
+
+        original = variant = 0
+        for static_path, entry in manifest.items():
+            original += Path(static_root, static_path).stat().st_size
+            smallest = [
+                min(variants, key=lambda item: item[0])
+                for variants in entry["variants"].values()
+                if variants
+            ]
+            variant += min(
+                (Path(static_root, path).stat().st_size for _, path in smallest),
+                default=0,
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(manifest)} images: {original / 1024:.0f} KB of originals, "
+                f"{variant / 1024:.0f} KB at the smallest width."
+            )
+        )
@@ -1,6 +1,7 @@
 """ Base Managers. """
 
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
+from .identity import current_identity_map, identity_key
 from .querysets import AbstractBaseQuerySet
 
 
@@ -14,6 +15,7 @@ class AbstractBaseManager(models.Manager):
         get_queryset() -> BaseQuerySet: Returns the base queryset for the manager.
         get_or_none(**kwargs) -> Model or None: Returns an instance of the model matching the given kwargs, or None if not found.
         get_or_create(**kwargs) -> Tuple[Model, bool]: Returns an instance of the model matching the given kwargs, and a boolean indicating if it was created.
+        bulk_get_or_create(keys) -> List[Tuple[Model, bool]]: Resolves many get_or_create lookups with a constant number of queries.
         search(query: str) -> QuerySet: Searches the queryset for a given query.
 
     Args:
@@ -52,31 +54,137 @@ class AbstractBaseManager(models.Manager):
             self: The instance of the manager.
             **kwargs: Keyword arguments used to filter the model.
 
+        When ``pages.middleware.IdentityMapMiddleware`` (or ``identity_map()``) is
+        active, single primary-key or unique-field lookups are served from the
+        request's identity map after the first query.
+
         Returns:
             Model or None: The instance of the model matching the given kwargs, or None if not found.
         """
 
+        identity = current_identity_map()
+        key = identity_key(self, kwargs) if identity is not None else None
+        if key is not None:
+            cached = identity.get(key)
+            if cached is not None:
+                return cached
+
         try:
-            return self.get(**kwargs)
+            instance = self.get(**kwargs)
         except self.model.DoesNotExist:
             return None
+        if key is not None:
+            identity.add(key, instance)
+        return instance
 
-    def get_or_create(self, **kwargs):
+    def get_or_create(self, defaults=None, **kwargs):
         """
         Returns an instance of the model matching the given kwargs, and a boolean indicating if it was created.
 
+        Delegates to Django's ``QuerySet.get_or_create``, which inserts in a
+        savepoint and returns the concurrent request's row if it won the race.
+
         Args:
             self: The instance of the manager.
+            defaults (dict): Extra field values used only when creating.
             **kwargs: Keyword arguments used to filter the model.
 
         Returns:
             Tuple[Model, bool]: A tuple containing the instance of the model matching the given kwargs, and a boolean indicating if it was created.
         """
 
-        try:
-            return self.get(**kwargs), False
-        except self.model.DoesNotExist:
-            return self.create(**kwargs), True
+        return super().get_or_create(defaults=defaults, **kwargs)
+
+    def bulk_get_or_create(self, keys, defaults=None):
+        """
+        Resolves many get_or_create lookups with one lookup query and one bulk insert.
+
+        Every key must use the same plain field names (no ``__`` lookups). Existing
+        rows are fetched with a single ``IN`` (or OR'ed) query and the missing ones are
+        inserted with one ``bulk_create`` in a savepoint, after slug models have had
+        their slugs assigned. If a concurrent request inserted any of them first, the
+        missing keys fall back to ``get_or_create`` one at a time, so ``created`` is
+        True only for rows this call inserted.
+
+        Args:
+            self: The instance of the manager.
+            keys (Iterable[dict]): Lookup kwargs, e.g. ``[{"user": user, "portal_key": "staff"}]``.
+            defaults (dict): Extra field values used only when creating.
+
+        Returns:
+            List[Tuple[Model, bool]]: ``(instance, created)`` pairs in the order of ``keys``.
+        """
+
+        keys = list(keys)
+        if not keys:
+            return []
+        names = tuple(keys[0])
+        if any("__" in name for name in names) or any(tuple(key) != names for key in keys):
+            raise ValueError("bulk_get_or_create keys must share the same plain field names.")
+
+        fields = [self.model._meta.get_field(name) for name in names]
+        attnames = [field.attname for field in fields]
+
+        def identity(key):
+            return tuple(
+                getattr(key[field.name], "pk", key[field.name])
+                if field.is_relation
+                else key[field.name]
+                for field in fields
+            )
+
+        def lookup(identities):
+            if len(attnames) == 1:
+                return self.filter(**{f"{attnames[0]}__in": [ident[0] for ident in identities]})
+            query = models.Q()
+            for ident in identities:
+                query |= models.Q(**dict(zip(attnames, ident)))
+            return self.filter(query)
+
+        def index(rows):
+            return {tuple(getattr(obj, attname) for attname in attnames): obj for obj in rows}
+
+        # Lookup values win over ``defaults`` that name the same field.
+        lookup_names = set(names) | set(attnames)
+        defaults = {
+            name: value for name, value in (defaults or {}).items() if name not in lookup_names
+        }
+
+        wanted = list(dict.fromkeys(identity(key) for key in keys))
+        found = index(lookup(wanted))
+        missing = [ident for ident in wanted if ident not in found]
+
+        created = set()
+        if missing:
+            using = self._db or router.db_for_write(self.model)
+            instances = [
+                self.model(**defaults, **dict(zip(attnames, ident)))
+                for ident in missing
+            ]
+            # ``bulk_create`` skips ``save()``, so slug models need their slugs up front.
+            assign_slugs = getattr(self.model, "assign_unique_slugs", None)
+            if assign_slugs is not None:
+                assign_slugs(instances, using=using)
+            try:
+                with transaction.atomic(using=using):
+                    self.bulk_create(instances)
+            except IntegrityError:
+                # A concurrent request inserted one of the rows (or took a slug);
+                # resolve the missing keys one at a time so ``created`` stays exact.
+                for ident in missing:
+                    found[ident], was_created = self.get_or_create(
+                        defaults=defaults, **dict(zip(attnames, ident))
+                    )
+                    if was_created:
+                        created.add(ident)
+            else:
+                created.update(missing)
+                if all(instance.pk is not None for instance in instances):
+                    found.update(zip(missing, instances))
+                else:
+                    found.update(index(lookup(missing)))
+
+        return [(found[ident], ident in created) for ident in map(identity, keys)]
 
     def search(self, query):
         """
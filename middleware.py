@@ -0,0 +1,72 @@
+""" Pages Middleware. """
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.models.signals import post_init
+
+from .identity import identity_map
+
+
+class IdentityMapMiddleware:
+    """
+    Scopes an identity map to each request so repeated ``get_or_none`` lookups are free.
+
+    With ``DEBUG`` on, the response carries an ``X-Identity-Map`` header with the
+    request's hit/miss counts.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_map() as identity:
+            response = self.get_response(request)
+        if settings.DEBUG:
+            response["X-Identity-Map"] = f"hits={identity.hits}; misses={identity.misses}"
+        return response
+
+
+_materialized = ContextVar("pages_materialized_rows", default=None)
+
+
+def count_materialized_row(sender, **kwargs):
+    counts = _materialized.get()
+    if counts is not None:
+        label = sender._meta.label_lower
+        counts[label] = counts.get(label, 0) + 1
+
+
+class MaterializedRowsMiddleware:
+    """
+    Reports how many model instances each request built, to catch pages that load
+    whole tables.
+
+    Only active with ``DEBUG`` on: the response carries an ``X-Rows-Materialized``
+    header with the total and the three busiest models, e.g.
+    ``total=57; pages.message=50; auth.user=5; core.navigationpreference=2``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.active = settings.DEBUG
+        if self.active:
+            post_init.connect(
+                count_materialized_row, dispatch_uid="pages_materialized_rows"
+            )
+
+    def __call__(self, request):
+        if not self.active:
+            return self.get_response(request)
+        counts = {}
+        token = _materialized.set(counts)
+        try:
+            response = self.get_response(request)
+        finally:
+            _materialized.reset(token)
+        busiest = sorted(counts.items(), key=lambda item: -item[1])[:3]
+        response["X-Rows-Materialized"] = "; ".join(
+            [f"total={sum(counts.values())}"]
+            + [f"{label}={count}" for label, count in busiest]
+        )
+        return response
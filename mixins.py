@@ -2,11 +2,141 @@
 
 from datetime import datetime
 
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 
+# Room kept free at the end of a truncated slug for a "-N" suffix.
+SLUG_SUFFIX_ROOM = 8
+SLUG_SAVE_ATTEMPTS = 5
+SLUG_PREFIX_BATCH = 100
+
+
+def next_slug(base, taken, max_length=255):
+    """
+    Returns the first of ``base``, ``base-1``, ``base-2``... that is not in ``taken``.
+
+    Args:
+        base (str): The slugified value.
+        taken (set): Slugs already in use.
+        max_length (int): The slug field's max length; the base is truncated so the
+            suffix always fits.
+
+    Returns:
+        str: A free slug.
+    """
+
+    base = base[:max_length]
+    if base not in taken:
+        return base
+    counter = 1
+    while True:
+        suffix = f"-{counter}"
+        candidate = f"{base[: max_length - len(suffix)]}{suffix}"
+        if candidate not in taken:
+            return candidate
+        counter += 1
+
+
+def slug_base(model, base):
+    """
+    Returns ``base``, or the slugified model name when ``base`` is empty.
+
+    Names made only of punctuation slugify to ``""``, which every slug starts
+    with; the fallback keeps ``taken_slugs`` from loading the whole table.
+    """
+
+    return base or slugify(model._meta.model_name)
+
+
+def taken_slugs(model, bases, exclude_pk=None, using=None):
+    """
+    Fetches every existing slug that could collide with the given bases.
+
+    Issues one ``startswith`` query per ``SLUG_PREFIX_BATCH`` distinct bases.
+
+    Returns:
+        set: The slugs in use.
+    """
+
+    max_length = model._meta.get_field("slug").max_length
+    prefixes = sorted({slug_base(model, base)[: max_length - SLUG_SUFFIX_ROOM] for base in bases})
+    manager = model._default_manager.db_manager(using)
+    taken = set()
+    for start in range(0, len(prefixes), SLUG_PREFIX_BATCH):
+        query = models.Q()
+        for prefix in prefixes[start : start + SLUG_PREFIX_BATCH]:
+            query |= models.Q(slug__startswith=prefix)
+        queryset = manager.filter(query)
+        if exclude_pk is not None:
+            queryset = queryset.exclude(pk=exclude_pk)
+        taken.update(queryset.values_list("slug", flat=True))
+    return taken
+
+
+def save_with_unique_slug(instance, save, args, kwargs):
+    """
+    Saves ``instance`` with a generated slug, retrying if a concurrent save takes it.
+
+    Args:
+        instance (Model): The instance being saved.
+        save (callable): The parent ``save`` method.
+        args (tuple): Positional arguments for ``save``.
+        kwargs (dict): Keyword arguments for ``save``.
+    """
+
+    model = type(instance)
+    using = kwargs.get("using") or router.db_for_write(model, instance=instance)
+    max_length = model._meta.get_field("slug").max_length
+    base = slug_base(model, instance.generate_slug())
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        taken = taken_slugs(model, [base], exclude_pk=instance.pk, using=using)
+        instance.slug = next_slug(base, taken, max_length)
+        try:
+            with transaction.atomic(using=using):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            collided = (
+                model._default_manager.db_manager(using)
+                .filter(slug=instance.slug)
+                .exclude(pk=instance.pk)
+                .exists()
+            )
+            if not collided or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                instance.slug = ""
+                raise
+
+
+def assign_unique_slugs(model, instances, using=None):
+    """
+    Assigns unique slugs to unsaved instances before ``bulk_create``.
+
+    Instances that already have a slug keep it and reserve it for the rest.
+
+    Args:
+        model (Model): The model class.
+        instances (Iterable[Model]): The instances to fill in.
+        using (str): The database alias.
+
+    Returns:
+        list: The instances, in order.
+    """
+
+    instances = list(instances)
+    max_length = model._meta.get_field("slug").max_length
+    pending = [
+        (instance, slug_base(model, instance.generate_slug()))
+        for instance in instances
+        if not instance.slug
+    ]
+    taken = taken_slugs(model, [base for _, base in pending], using=using)
+    taken.update(instance.slug for instance in instances if instance.slug)
+    for instance, base in pending:
+        instance.slug = next_slug(base, taken, max_length)
+        taken.add(instance.slug)
+    return instances
+
 
 class SlugMixin(models.Model):
     """Generate and populate a slug field based on the __str__ method."""
@@ -29,16 +159,15 @@ class SlugMixin(models.Model):
                 return slugify(self.name)
         return slugify(self.__str__)
 
+    @classmethod
+    def assign_unique_slugs(cls, instances, using=None):
+        """Fills in unique slugs on unsaved instances ahead of ``bulk_create``."""
+        return assign_unique_slugs(cls, instances, using=using)
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = self.generate_slug()
-            # Ensure the slug is unique
-            original_slug = self.slug
-            counter = 1
-            while self.__class__.objects.filter(slug=self.slug).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        return save_with_unique_slug(self, super().save, args, kwargs)
 
 
 class NameSlugMixin(models.Model):
@@ -56,16 +185,15 @@ class NameSlugMixin(models.Model):
             return slugify(f"{self.title}")
         return slugify(self.name)
 
+    @classmethod
+    def assign_unique_slugs(cls, instances, using=None):
+        """Fills in unique slugs on unsaved instances ahead of ``bulk_create``."""
+        return assign_unique_slugs(cls, instances, using=using)
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = self.generate_slug()
-            # Ensure the slug is unique
-            original_slug = self.slug
-            counter = 1
-            while self.__class__.objects.filter(slug=self.slug).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        return save_with_unique_slug(self, super().save, args, kwargs)
 
 
 class TimeStampedModelMixin(models.Model):
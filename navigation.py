@@ -0,0 +1,119 @@
+""" Navigation Rail Fragment Cache. """
+
+import re
+from threading import Lock
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .generations import bump_generation, get_generations
+
+CACHE_PREFIX = "pages:nav"
+CACHE_TIMEOUT = 60 * 60
+LINKS_TEMPLATE = "partials/nav_links.html"
+# Cached links are rendered as ``class="nav-link ..." href="..."`` so the active
+# item can be marked with one substitution instead of a re-render.
+LINK_PATTERN = r'(class="nav-link[^"]*)(" href="{}")'
+
+
+class NavigationCache:
+    """
+    Per-user cache for the rendered navigation links in ``partials/nav.html``.
+
+    Fragments are keyed by the user plus two generation counters kept in the shared
+    cache: a global menu generation, bumped when menu definitions, groups or
+    permissions change, and a per-user generation, bumped when the user's
+    ``NavigationPreference``, groups or permissions change. ``pages.signals`` bumps
+    both; code that changes the menu without a model write (for example a deploy
+    that edits ``core.context_processors``) must call ``invalidate_menu()``.
+
+    Attributes:
+        hits (int): Fragments served from the cache in this process.
+        misses (int): Fragments rendered in this process.
+    """
+
+    def __init__(self, timeout=CACHE_TIMEOUT):
+        self.timeout = timeout
+        self._lock = Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _generation_keys(self, user_id):
+        return f"{CACHE_PREFIX}:gen:menu", f"{CACHE_PREFIX}:gen:user:{user_id}"
+
+    def generations(self, user_id):
+        """Returns the ``(menu, user)`` generations, initialising missing ones."""
+
+        return tuple(get_generations(self._generation_keys(user_id)))
+
+    def invalidate_menu(self):
+        """Makes every cached fragment stale."""
+
+        bump_generation(self._generation_keys(None)[0])
+
+    def invalidate_user(self, user_id):
+        """Makes the cached fragments for one user stale."""
+
+        if user_id is not None:
+            bump_generation(self._generation_keys(user_id)[1])
+
+    def key(self, user_id):
+        menu, user = self.generations(user_id)
+        return f"{CACHE_PREFIX}:links:{user_id}:{menu}:{user}"
+
+    def get_or_render(self, user_id, render):
+        """
+        Returns the cached fragment for ``user_id``, rendering and storing it on a miss.
+
+        Args:
+            user_id (int): The user's primary key.
+            render (Callable[[], str]): Renders the fragment.
+
+        Returns:
+            str: The fragment markup.
+        """
+
+        key = self.key(user_id)
+        fragment = cache.get(key)
+        if fragment is not None:
+            self._count("hits")
+            return fragment
+        self._count("misses")
+        fragment = str(render())
+        cache.set(key, fragment, self.timeout)
+        return fragment
+
+
+def mark_active(fragment, path):
+    """
+    Marks the links in a cached fragment that point at ``path`` as the current page.
+
+    Adds ``is-active`` to the link's class and ``aria-current="page"``; the rail's
+    script opens the group that contains it.
+    """
+
+    pattern = re.compile(LINK_PATTERN.format(re.escape(escape(path))))
+    return mark_safe(pattern.sub(r'\1 is-active\2 aria-current="page"', fragment))
+
+
+def render_navigation_links(request, user, menu_items):
+    """Renders the rail's menu links for ``user`` from the fragment cache."""
+
+    fragment = navigation_cache.get_or_render(
+        user.pk,
+        lambda: render_to_string(LINKS_TEMPLATE, {"menu_items": menu_items}),
+    )
+    return mark_active(fragment, request.path if request is not None else "")
+
+
+navigation_cache = NavigationCache()
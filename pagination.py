@@ -0,0 +1,301 @@
+""" Pagination Engines. """
+
+import base64
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = 10000
+WINDOW_ON_EACH_SIDE = 2
+WINDOW_ON_ENDS = 1
+
+
+def planner_estimate(queryset):
+    """
+    Returns the query planner's row estimate for ``queryset``, or None.
+
+    Only PostgreSQL exposes one cheaply (``EXPLAIN``); other backends return None.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def underlying_queryset(object_list):
+    """
+    Returns the queryset behind ``object_list``, or None.
+
+    django-tables2 paginates its ``BoundRows``, which wrap a ``TableQuerysetData``
+    that wraps the queryset; both expose the wrapped object as ``data``.
+    """
+
+    for _ in range(3):
+        if hasattr(object_list, "query"):
+            return object_list
+        object_list = getattr(object_list, "data", None)
+    return None
+
+
+class EstimatedPage(Page):
+    """A page whose ``has_next`` comes from an extra fetched row, not the count."""
+
+    def __init__(self, object_list, number, paginator, more):
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        return self.more
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that counts exactly only up to ``exact_limit`` rows.
+
+    The count runs over ``LIMIT exact_limit + 1`` so it stops early on large tables;
+    past the limit the planner's estimate is used where available, and
+    ``count_is_estimate`` is set so templates can say "about N". An estimated
+    count does not bound the page number: each page fetches ``per_page + 1`` rows
+    and reports ``has_next`` from the extra one, so pages past the estimate still
+    open and the last one is found by running out of rows.
+
+    Example:
+        RequestConfig(request, paginate={"paginator_class": EstimatedCountPaginator}).configure(table)
+    """
+
+    exact_limit = EXACT_COUNT_LIMIT
+
+    def __init__(self, *args, exact_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if exact_limit is not None:
+            self.exact_limit = exact_limit
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = underlying_queryset(self.object_list)
+        if queryset is None:
+            return len(self.object_list)
+        capped = queryset[: self.exact_limit + 1].count()
+        if capped <= self.exact_limit:
+            return capped
+        self.count_is_estimate = True
+        return max(planner_estimate(queryset) or 0, capped)
+
+    def validate_number(self, number):
+        if not self.count or not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedPage(rows[: self.per_page], number, self, more=len(rows) > self.per_page)
+
+
+def page_window(page, on_each_side=WINDOW_ON_EACH_SIDE, on_ends=WINDOW_ON_ENDS):
+    """
+    Returns the page numbers to link: the first and last ``on_ends`` pages and
+    ``on_each_side`` pages around the current one, with None marking each gap.
+
+    When the paginator's count is an estimate the last pages may not exist, so
+    nothing past the window is linked, and the next page is linked only when the
+    current page says it has one; a trailing None marks that more follow.
+    """
+
+    paginator = page.paginator
+    if getattr(paginator, "count_is_estimate", False):
+        number = page.number
+        last = number
+        if page.has_next():
+            last = max(number + 1, min(number + on_each_side, paginator.num_pages))
+        start = max(1, number - on_each_side)
+        numbers = list(range(1, min(on_ends, start - 1) + 1))
+        if start > len(numbers) + 1:
+            numbers.append(None)
+        numbers.extend(range(start, last + 1))
+        if last < paginator.num_pages:
+            numbers.append(None)
+        return numbers
+    return [
+        None if number == paginator.ELLIPSIS else number
+        for number in paginator.get_elided_page_range(
+            page.number, on_each_side=on_each_side, on_ends=on_ends
+        )
+    ]
+
+
+def encode_keyset_cursor(direction, values):
+    payload = json.dumps([direction, values], cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_keyset_cursor(cursor, size):
+    """Returns the ``(direction, values)`` pair encoded in a keyset cursor."""
+
+    direction, values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    if direction not in ("next", "previous") or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return direction, values
+
+
+def keyset_filter(ordering, values, forward):
+    """
+    Returns a Q matching rows strictly after (or before) ``values`` in ``ordering``.
+
+    ``(a, b) > (x, y)`` becomes ``a > x OR (a = x AND b > y)``, with the comparison
+    flipped for descending fields and when walking backwards.
+    """
+
+    condition = Q()
+    equal = Q()
+    for order, value in zip(ordering, values):
+        field = order.lstrip("-")
+        ascending = not order.startswith("-")
+        lookup = "gt" if ascending == forward else "lt"
+        condition |= equal & Q(**{f"{field}__{lookup}": value})
+        equal &= Q(**{field: value})
+    return condition
+
+
+def nullable_fields(model, ordering):
+    """Returns the ``ordering`` paths that can be NULL, following relations."""
+
+    nullable = []
+    for order in ordering:
+        path = order.lstrip("-")
+        opts = model._meta
+        for name in path.split("__"):
+            field = opts.pk if name == "pk" else opts.get_field(name)
+            if getattr(field, "null", False):
+                nullable.append(path)
+                break
+            if field.is_relation:
+                opts = field.related_model._meta
+    return nullable
+
+
+def reverse_ordering(ordering):
+    return [order[1:] if order.startswith("-") else f"-{order}" for order in ordering]
+
+
+def row_values(row, ordering):
+    values = []
+    for order in ordering:
+        value = row
+        for attribute in order.lstrip("-").split("__"):
+            value = getattr(value, attribute)
+        values.append(value)
+    return values
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset.
+
+    Pages are addressed by opaque cursors instead of numbers, so no page ever runs
+    ``COUNT(*)`` or an ``OFFSET`` scan and deep pages cost the same as the first.
+
+    Attributes:
+        object_list (list): The rows on this page.
+        has_next (bool): Whether rows follow this page.
+        has_previous (bool): Whether rows precede this page.
+        next_cursor (str): The cursor for the following page, or None.
+        previous_cursor (str): The cursor for the preceding page, or None.
+    """
+
+    def __init__(self, object_list, ordering, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = (
+            encode_keyset_cursor("next", row_values(object_list[-1], ordering))
+            if has_next and object_list
+            else None
+        )
+        self.previous_cursor = (
+            encode_keyset_cursor("previous", row_values(object_list[0], ordering))
+            if has_previous and object_list
+            else None
+        )
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def keyset_page(queryset, cursor=None, per_page=25, ordering=("pk",)):
+    """
+    Returns the ``KeysetPage`` that ``cursor`` points at.
+
+    Args:
+        queryset (QuerySet): The rows to page through.
+        cursor (str): A ``next_cursor``/``previous_cursor`` value, or None for the
+            first page.
+        per_page (int): Rows per page.
+        ordering (Iterable[str]): ``order_by`` fields; the last must be unique
+            (typically ``pk``) so every row has one position. None may be
+            nullable: NULL never compares greater or less than a cursor value,
+            so those rows would be skipped.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+        ImproperlyConfigured: If an ordering field is nullable.
+    """
+
+    ordering = list(ordering)
+    nullable = nullable_fields(queryset.model, ordering)
+    if nullable:
+        raise ImproperlyConfigured(
+            f"Keyset ordering fields must not be nullable: {', '.join(nullable)}."
+        )
+    direction = "next"
+    if cursor:
+        try:
+            direction, values = decode_keyset_cursor(cursor, len(ordering))
+        except (TypeError, UnicodeError) as error:
+            raise ValueError("Invalid cursor") from error
+        forward = direction == "next"
+        queryset = queryset.filter(keyset_filter(ordering, values, forward))
+    if direction == "previous":
+        rows = list(queryset.order_by(*reverse_ordering(ordering))[: per_page + 1])
+        more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return KeysetPage(rows, ordering, has_next=True, has_previous=more)
+
+    rows = list(queryset.order_by(*ordering)[: per_page + 1])
+    more = len(rows) > per_page
+    return KeysetPage(rows[:per_page], ordering, has_next=more, has_previous=bool(cursor))
@@ -0,0 +1,142 @@
+""" Per-User Preference Bundles. """
+
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from core.models.dashboard import DashboardLayout
+from core.models.navigation import NavigationPreference
+
+from .generations import bump_generation, get_generation
+from .layouts import DEFAULT_PORTAL_KEY, _decode, _decode_order
+
+CACHE_PREFIX = "pages:prefs"
+CACHE_TIMEOUT = 60 * 60 * 24
+PREFERENCES_ATTR = "_pages_preferences"
+EMPTY_LAYOUT = {"layout": None, "hidden_widgets": []}
+
+
+class PreferenceBundle(namedtuple("PreferenceBundle", "version favorite_keys layouts")):
+    """
+    A user's navigation favorites and dashboard layouts for every portal.
+
+    Attributes:
+        version (int): The preference version the bundle was loaded at.
+        favorite_keys (list[str]): Pinned navigation keys.
+        layouts (dict): ``portal key -> {"layout": list or None, "hidden_widgets": list}``.
+    """
+
+    __slots__ = ()
+
+    def layout(self, portal_key=None):
+        """Returns the layout state for a portal, or the empty state if none is saved."""
+
+        return self.layouts.get(portal_key or DEFAULT_PORTAL_KEY, EMPTY_LAYOUT)
+
+
+def _keys(user_id):
+    return f"{CACHE_PREFIX}:version:{user_id}", f"{CACHE_PREFIX}:bundle:{user_id}"
+
+
+def fetch_preferences(user_id, version=0):
+    """
+    Loads a user's favorites and every dashboard layout in one query.
+
+    Both tables are LEFT JOINed from the user row, so users without preference rows
+    get an empty bundle and nothing is created.
+
+    Returns:
+        PreferenceBundle or None: None if the user does not exist.
+    """
+
+    layout_path = DashboardLayout._meta.get_field("user").related_query_name()
+    nav_path = NavigationPreference._meta.get_field("user").related_query_name()
+    rows = get_user_model()._default_manager.filter(pk=user_id).values_list(
+        f"{nav_path}__favorite_keys",
+        f"{layout_path}__portal_key",
+        f"{layout_path}__layout",
+        f"{layout_path}__hidden_widgets",
+    )
+
+    favorite_keys = None
+    layouts = {}
+    for favorites, portal_key, order, hidden in rows:
+        favorite_keys = _decode(favorites)
+        if portal_key is not None:
+            layouts[portal_key] = {
+                "layout": _decode_order(order),
+                "hidden_widgets": _decode(hidden),
+            }
+    if favorite_keys is None:
+        return None
+    return PreferenceBundle(version, favorite_keys, layouts)
+
+
+def preference_version(user_id):
+    """Returns the user's current preference version, initialising it if needed."""
+
+    return get_generation(_keys(user_id)[0])
+
+
+def invalidate_preferences(user_id):
+    """Bumps the user's preference version so the cached bundle is reloaded."""
+
+    return bump_generation(_keys(user_id)[0])
+
+
+def load_preferences(user):
+    """
+    Returns the user's ``PreferenceBundle``; never writes to the database.
+
+    The bundle is memoized on the user object for the rest of the request and
+    cached in the shared cache, stamped with the version it was loaded at. A bundle
+    whose stamp does not match the current version is reloaded.
+    """
+
+    bundle = getattr(user, PREFERENCES_ATTR, None)
+    if bundle is not None:
+        return bundle
+
+    version_key, bundle_key = _keys(user.pk)
+    found = cache.get_many((version_key, bundle_key))
+    version = found.get(version_key) or preference_version(user.pk)
+    bundle = found.get(bundle_key)
+    if bundle is None or bundle.version != version:
+        bundle = fetch_preferences(user.pk, version) or PreferenceBundle(version, [], {})
+        cache.set(bundle_key, bundle, CACHE_TIMEOUT)
+    setattr(user, PREFERENCES_ATTR, bundle)
+    return bundle
+
+
+def update_preferences(user, portal_key=None, favorite_keys=None, **layout):
+    """
+    Writes a preference change through to the cached bundle.
+
+    Called by the views that change preferences with the state their write
+    produced: ``favorite_keys``, or ``hidden_widgets``/``layout`` for
+    ``portal_key``. The bundle already loaded for the request is patched and
+    re-cached under the bumped version, so the next read is a cache hit and
+    ``fetch_preferences`` is not run again.
+
+    The patch is only trusted when the bump moved the version one step past the
+    patched bundle. If another write, or the ``post_save`` signal of a newly
+    created row, bumped it in between, the bundle is fetched again instead.
+    """
+
+    bundle_key = _keys(user.pk)[1]
+    base = getattr(user, PREFERENCES_ATTR, None) or cache.get(bundle_key)
+    version = invalidate_preferences(user.pk)
+    if base is None or version != base.version + 1:
+        bundle = fetch_preferences(user.pk, version) or PreferenceBundle(version, [], {})
+    else:
+        layouts = base.layouts
+        if layout:
+            key = portal_key or DEFAULT_PORTAL_KEY
+            layouts = {**layouts, key: {**base.layout(portal_key), **layout}}
+        if favorite_keys is None:
+            favorite_keys = base.favorite_keys
+        bundle = PreferenceBundle(version, list(favorite_keys), layouts)
+    cache.set(bundle_key, bundle, CACHE_TIMEOUT)
+    setattr(user, PREFERENCES_ATTR, bundle)
+    return bundle
@@ -1,12 +1,46 @@
 """ Base QuerySets. """
 from django.db import models
 
+from .identity import current_identity_map
+from .search import get_search_backend
+
 
 class AbstractBaseQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Updates the matching rows and evicts the model from the identity map.
+
+        ``update()`` sends no ``post_save``, so the rows it wrote are unknown; every
+        cached instance of the model is dropped instead.
+        """
+        rows = super().update(**kwargs)
+        identity = current_identity_map()
+        if identity is not None:
+            identity.evict_model(self.model)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """Updates ``objs`` and evicts their rows from the identity map."""
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        identity = current_identity_map()
+        if identity is not None:
+            for obj in objs:
+                identity.evict(self.model, obj.pk)
+        return rows
+
+    bulk_update.alters_data = True
+
     def search(self, query):
         """
-        Performs a search across faction-related fields.
+        Performs a ranked full-text search across name and description.
+
+        Every word in ``query`` must match, either whole or as a prefix. Results are
+        annotated with ``search_rank`` and ordered best first; the engine is chosen
+        per database by ``pages.search.get_search_backend``. Add the
+        ``pages.search.CreateSearchIndex`` operation to the model's migrations so the
+        search is indexed; the database keeps that index in sync on every write.
         """
-        return self.filter(
-            models.Q(name__icontains=query) | models.Q(description__icontains=query)
-        )
+        return get_search_backend(self.db).search(self, query)
@@ -0,0 +1,152 @@
+""" Reverse URL Registry. """
+
+import re
+from threading import RLock
+
+from django.urls import (
+    NoReverseMatch,
+    get_resolver,
+    get_script_prefix,
+    get_urlconf,
+    reverse,
+)
+
+FALLBACK_URL = "#"
+SLOT_PATTERN = re.compile(r"cfslot(\d+)x")
+SAFE_VALUE = re.compile(r"^[-a-zA-Z0-9_]+$")
+
+# Marks names that exist but cannot be templated (e.g. int converters).
+DYNAMIC = object()
+
+
+def iter_url_names(resolver, prefix=""):
+    """
+    Yields every fully-qualified URL name reachable from a resolver.
+
+    Args:
+        resolver (URLResolver): The resolver to walk.
+        prefix (str): The namespace prefix accumulated so far.
+
+    Yields:
+        str: Names such as ``"help"`` or ``"facilities:faculty:index"``.
+    """
+
+    for key in resolver.reverse_dict.keys():
+        if isinstance(key, str):
+            yield f"{prefix}{key}"
+    for namespace, (_, child) in resolver.namespace_dict.items():
+        yield from iter_url_names(child, f"{prefix}{namespace}:")
+
+
+class URLTable:
+    """The resolved URLs for one urlconf and script prefix."""
+
+    def __init__(self, urlconf):
+        self.urlconf = urlconf
+        self.names = frozenset(iter_url_names(get_resolver(urlconf)))
+        self.entries = {}
+        for name in self.names:
+            self.entries[(name, ())] = self.compile(name, ())
+
+    def compile(self, name, keys):
+        """
+        Resolves ``name`` once for the given kwarg names.
+
+        Returns:
+            str for argument-free names, a ``(parts, order)`` template for kwarg-bearing
+            names, ``DYNAMIC`` when the pattern cannot be templated, or None when the
+            name does not resolve at all.
+        """
+
+        if name not in self.names:
+            return None
+        slots = {key: f"cfslot{index}x" for index, key in enumerate(keys)}
+        try:
+            url = reverse(name, kwargs=slots, urlconf=self.urlconf)
+        except NoReverseMatch:
+            return DYNAMIC if keys else None
+        if not keys:
+            return url
+        pieces = SLOT_PATTERN.split(url)
+        parts = tuple(pieces[::2])
+        order = tuple(keys[int(index)] for index in pieces[1::2])
+        return parts, order
+
+    def lookup(self, name, keys):
+        try:
+            return self.entries[(name, keys)]
+        except KeyError:
+            return self.entries.setdefault((name, keys), self.compile(name, keys))
+
+
+class URLRegistry:
+    """
+    Resolves URL names from a precomputed table instead of calling ``reverse()``.
+
+    Argument-free names are resolved once per urlconf/script prefix, names that do
+    not resolve are cached as ``"#"``, and kwarg-bearing names are filled into a
+    template compiled on first use. Values that are not plain slugs fall back to
+    ``reverse()`` so quoting and converter validation still apply.
+
+    Example:
+        >>> url_registry.reverse("help")
+        '/help'
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._lock = RLock()
+
+    def clear(self):
+        """Drops every resolved table, e.g. after the urlconf changes."""
+
+        with self._lock:
+            self._tables.clear()
+
+    def table(self):
+        """Returns the table for the active urlconf and script prefix, building it once."""
+
+        key = (get_urlconf(), get_script_prefix())
+        table = self._tables.get(key)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(key)
+                if table is None:
+                    table = self._tables[key] = URLTable(key[0])
+        return table
+
+    def reverse(self, name, kwargs=None):
+        """
+        Returns the URL for ``name``, or ``"#"`` when it does not resolve.
+
+        Args:
+            name (str): The URL name, optionally namespaced.
+            kwargs (dict): URL keyword arguments.
+
+        Returns:
+            str: The resolved URL.
+        """
+
+        kwargs = kwargs or {}
+        keys = tuple(sorted(kwargs))
+        entry = self.table().lookup(name, keys)
+        if entry is None:
+            return FALLBACK_URL
+        if isinstance(entry, str):
+            return entry
+        if entry is not DYNAMIC:
+            parts, order = entry
+            values = [str(kwargs[key]) for key in order]
+            if all(SAFE_VALUE.match(value) for value in values):
+                url = [parts[0]]
+                for value, part in zip(values, parts[1:]):
+                    url.append(value)
+                    url.append(part)
+                return "".join(url)
+        try:
+            return reverse(name, kwargs=kwargs)
+        except NoReverseMatch:
+            return FALLBACK_URL
+
+
+url_registry = URLRegistry()
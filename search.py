@@ -0,0 +1,327 @@
+""" Full-Text Search Backends. """
+
+import hashlib
+import re
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections, models
+from django.db.migrations.operations.base import Operation
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS = ("name", "description")
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+INTEGER_PKS = {
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "PositiveIntegerField",
+}
+
+
+def search_tokens(query):
+    """Splits a user query into word tokens, dropping search-syntax characters."""
+
+    return TOKEN_PATTERN.findall(query or "")
+
+
+class SearchBackend:
+    """
+    Base search engine behind ``AbstractBaseQuerySet.search``.
+
+    Backends filter a queryset down to matches of every token (each token also
+    matches as a prefix), annotate ``search_rank`` and order by it, best first.
+    Indexes are created by the ``CreateSearchIndex`` migration operation and kept
+    in sync by the database itself, so ``bulk_create()``, ``update()`` and raw SQL
+    writes are indexed like ``save()``.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def install(self, model, schema_editor):
+        """Creates the index for ``model``. Backends without one ignore it."""
+
+    def uninstall(self, model, schema_editor):
+        """Drops the index for ``model``. Backends without one ignore it."""
+
+
+class LikeSearchBackend(SearchBackend):
+    """Unindexed ``icontains`` fallback for databases without full-text support."""
+
+    def search(self, queryset, query):
+        tokens = search_tokens(query)
+        if not tokens:
+            return queryset
+        condition = models.Q()
+        rank = models.Value(0)
+        for token in tokens:
+            condition &= models.Q(name__icontains=token) | models.Q(
+                description__icontains=token
+            )
+            rank = rank + models.Case(
+                models.When(name__istartswith=token, then=models.Value(2)),
+                models.When(name__icontains=token, then=models.Value(1)),
+                default=models.Value(0),
+            )
+        return (
+            queryset.filter(condition)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "pk")
+        )
+
+
+def search_vector(config=None):
+    """Returns the weighted tsvector expression used by ``PostgresSearchBackend``."""
+
+    from django.contrib.postgres.search import SearchVector
+
+    config = config or getattr(settings, "PAGES_SEARCH_CONFIG", "simple")
+    return SearchVector("name", weight="A", config=config) + SearchVector(
+        "description", weight="B", config=config
+    )
+
+
+def search_index_name(model):
+    """Returns a stable index name of at most 30 characters for ``model``."""
+
+    table = model._meta.db_table
+    digest = hashlib.md5(table.encode("utf-8"), usedforsecurity=False).hexdigest()[:6]
+    return f"{table[:14]}_{digest}_search"
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    PostgreSQL ``tsvector`` search with ``ts_rank`` ordering.
+
+    The vector is an expression over ``name``/``description`` and ``install()``
+    builds a GIN index on the same expression, so searches use the index and
+    PostgreSQL keeps it current on every write.
+    """
+
+    def gin_index(self, model):
+        from django.contrib.postgres.indexes import GinIndex
+
+        return GinIndex(search_vector(), name=search_index_name(model))
+
+    def install(self, model, schema_editor):
+        schema_editor.add_index(model, self.gin_index(model))
+
+    def uninstall(self, model, schema_editor):
+        schema_editor.remove_index(model, self.gin_index(model))
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        tokens = search_tokens(query)
+        if not tokens:
+            return queryset
+        config = getattr(settings, "PAGES_SEARCH_CONFIG", "simple")
+        ts_query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=config,
+        )
+        vector = search_vector(config)
+        return (
+            queryset.annotate(search_document=vector)
+            .filter(search_document=ts_query)
+            .annotate(search_rank=SearchRank(vector, ts_query))
+            .order_by("-search_rank", "pk")
+        )
+
+
+class SQLiteFTSSearchBackend(SearchBackend):
+    """
+    SQLite FTS5 search using a ``<db_table>_fts`` virtual table per model.
+
+    ``install()`` creates the table as an external-content index over the model's
+    table, back-fills it and adds triggers that mirror every insert, update and
+    delete. Models without an integer primary key, or whose migrations have not
+    installed the index, fall back to ``LikeSearchBackend``.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.fallback = LikeSearchBackend()
+        self._installed = {}
+        self._lock = Lock()
+
+    @property
+    def connection(self):
+        return connections[self.alias]
+
+    def supports(self, model):
+        return model._meta.pk.get_internal_type() in INTEGER_PKS
+
+    def _names(self, model, connection=None):
+        quote = (connection or self.connection).ops.quote_name
+        opts = model._meta
+        return {
+            "fts_name": f"{opts.db_table}_fts",
+            "fts": quote(f"{opts.db_table}_fts"),
+            "table": quote(opts.db_table),
+            "pk": quote(opts.pk.column),
+            "columns": [quote(opts.get_field(name).column) for name in SEARCH_FIELDS],
+            "triggers": [quote(f"{opts.db_table}_fts_{event}") for event in ("ai", "ad", "au")],
+        }
+
+    def install(self, model, schema_editor):
+        if not self.supports(model):
+            return
+        names = self._names(model, schema_editor.connection)
+        fields = ", ".join(SEARCH_FIELDS)
+        new = ", ".join(f"new.{column}" for column in names["columns"])
+        old = ", ".join(f"old.{column}" for column in names["columns"])
+        add = f"INSERT INTO {names['fts']}(rowid, {fields}) VALUES (new.{names['pk']}, {new});"
+        delete = (
+            f"INSERT INTO {names['fts']}({names['fts']}, rowid, {fields}) "
+            f"VALUES ('delete', old.{names['pk']}, {old});"
+        )
+        ai, ad, au = names["triggers"]
+        for sql in (
+            f"CREATE VIRTUAL TABLE {names['fts']} USING fts5({fields}, "
+            f"content = {names['table']}, content_rowid = {names['pk']}, "
+            "tokenize = 'unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER {ai} AFTER INSERT ON {names['table']} BEGIN {add} END",
+            f"CREATE TRIGGER {ad} AFTER DELETE ON {names['table']} BEGIN {delete} END",
+            f"CREATE TRIGGER {au} AFTER UPDATE ON {names['table']} BEGIN {delete} {add} END",
+            f"INSERT INTO {names['fts']}({names['fts']}) VALUES ('rebuild')",
+        ):
+            schema_editor.execute(sql, params=None)
+        self.forget(model)
+
+    def uninstall(self, model, schema_editor):
+        if not self.supports(model):
+            return
+        names = self._names(model, schema_editor.connection)
+        for trigger in names["triggers"]:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}", params=None)
+        schema_editor.execute(f"DROP TABLE IF EXISTS {names['fts']}", params=None)
+        self.forget(model)
+
+    def is_installed(self, model):
+        """Returns True if the FTS table exists; checked once per model and process."""
+
+        table = f"{model._meta.db_table}_fts"
+        installed = self._installed.get(table)
+        if installed is None:
+            with self._lock, self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [table],
+                )
+                installed = cursor.fetchone() is not None
+            self._installed[table] = installed
+        return installed
+
+    def forget(self, model):
+        """Drops the cached ``is_installed`` answer for ``model``."""
+
+        self._installed.pop(f"{model._meta.db_table}_fts", None)
+
+    def search(self, queryset, query):
+        model = queryset.model
+        tokens = search_tokens(query)
+        if not tokens:
+            return queryset
+        if not self.supports(model) or not self.is_installed(model):
+            return self.fallback.search(queryset, query)
+
+        names = self._names(model)
+        match = " ".join(f'"{token}"*' for token in tokens)
+        matches = RawSQL(
+            f"SELECT rowid FROM {names['fts']} WHERE {names['fts']} MATCH %s", [match]
+        )
+        rank = RawSQL(
+            f"SELECT -bm25({names['fts']}, 2.0, 1.0) FROM {names['fts']} "
+            f"WHERE {names['fts']} MATCH %s AND rowid = {names['table']}.{names['pk']}",
+            [match],
+            output_field=models.FloatField(),
+        )
+        return (
+            queryset.filter(pk__in=matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "pk")
+        )
+
+
+class CreateSearchIndex(Operation):
+    """
+    Migration operation that installs the search index for a model.
+
+    Add it to the migration of any app whose model is searched through
+    ``AbstractBaseQuerySet.search``; the database's search backend decides what
+    to build (a GIN index on PostgreSQL, an FTS5 table and triggers on SQLite).
+
+    Example:
+        operations = [CreateSearchIndex("organization")]
+    """
+
+    reversible = True
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.model_name], {}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _run(self, method, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            backend = get_search_backend(schema_editor.connection.alias)
+            getattr(backend, method)(model, schema_editor)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._run("install", app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._run("uninstall", app_label, schema_editor, from_state)
+
+    def describe(self):
+        return f"Create search index on {self.model_name}"
+
+    @property
+    def migration_name_fragment(self):
+        return f"{self.model_name.lower()}_search_index"
+
+
+_backends = {}
+
+
+def get_search_backend(using="default"):
+    """
+    Returns the search backend for a database alias.
+
+    ``settings.PAGES_SEARCH_BACKEND`` may name a ``SearchBackend`` subclass by
+    dotted path; otherwise PostgreSQL uses ``tsvector``, SQLite uses FTS5 and other
+    databases fall back to ``icontains``.
+    """
+
+    backend = _backends.get(using)
+    if backend is None:
+        path = getattr(settings, "PAGES_SEARCH_BACKEND", None)
+        vendor = connections[using].vendor
+        if path:
+            backend = import_string(path)()
+        elif vendor == "postgresql":
+            backend = PostgresSearchBackend()
+        elif vendor == "sqlite":
+            backend = SQLiteFTSSearchBackend(using)
+        else:
+            backend = LikeSearchBackend()
+        _backends[using] = backend
+    return backend
+
+
+def is_searchable(model):
+    """Returns True if ``model`` has the fields ``AbstractBaseQuerySet.search`` indexes."""
+
+    names = {field.name for field in model._meta.get_fields()}
+    return all(name in names for name in SEARCH_FIELDS)
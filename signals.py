@@ -0,0 +1,167 @@
+""" Pages Signal Receivers. """
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models.dashboard import DashboardLayout
+from core.models.navigation import NavigationPreference
+
+from .dropdowns import dropdown_cache, dropdown_registry
+from .identity import current_identity_map
+from .navigation import navigation_cache
+from .preferences import invalidate_preferences
+from .routing import url_registry
+from .themes import invalidate_theme, missing_organizations, theme_cache
+from .views import (
+    invalidate_resource_scopes,
+    invalidate_user_resources,
+    resource_index_cache,
+    resource_sections_cache,
+)
+
+SCOPE_MODELS = ("facility.facility", "faction.faction")
+THEME_SETTINGS = {"PAGES_ORGANIZATION_THEMES"}
+MENU_MODELS = {"auth.group", "auth.permission"}
+
+
+def is_scoped_profile(sender):
+    """Returns True for profile models that tie a user to a facility or faction."""
+
+    names = {field.name for field in sender._meta.get_fields()}
+    return "user" in names and bool(names & {"facility", "faction"})
+
+
+def invalidate_user_resource_context(sender, instance, **kwargs):
+    """Makes a user's cached resource scope stale when the user row changes."""
+
+    invalidate_user_resources(instance.pk)
+
+
+def invalidate_profile_resource_context(sender, instance, **kwargs):
+    """Makes a user's cached resource scope stale when their profile changes."""
+
+    invalidate_user_resources(getattr(instance, "user_id", None))
+
+
+def invalidate_scope_resource_context(sender, **kwargs):
+    """Makes every cached resource scope stale when a facility or faction changes."""
+
+    invalidate_resource_scopes()
+
+
+def connect_resource_context_receivers():
+    """Connects the resource scope receivers to the models they depend on only."""
+
+    profiles = [model for model in apps.get_models() if is_scoped_profile(model)]
+    for signal in (post_save, post_delete):
+        signal.connect(invalidate_user_resource_context, sender=get_user_model())
+        for label in SCOPE_MODELS:
+            signal.connect(invalidate_scope_resource_context, sender=label)
+        for model in profiles:
+            signal.connect(invalidate_profile_resource_context, sender=model)
+
+
+connect_resource_context_receivers()
+
+
+@receiver(setting_changed)
+def reset_theme_cache(setting, **kwargs):
+    """Recompiles theme sheets when the theme settings change, e.g. in tests."""
+
+    if setting in THEME_SETTINGS:
+        theme_cache.clear()
+        missing_organizations.clear()
+
+
+@receiver(setting_changed)
+def reset_url_registry(setting, **kwargs):
+    """Rebuilds resolved URLs when the urlconf is swapped, e.g. in tests."""
+
+    if setting == "ROOT_URLCONF":
+        url_registry.clear()
+        resource_sections_cache.clear()
+        resource_index_cache.clear()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_dropdown_options(sender, **kwargs):
+    """Bumps the dropdown cache generation when a source model changes."""
+
+    if dropdown_registry.is_source_model(sender):
+        dropdown_cache.invalidate(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_dropdown_memberships(sender, instance, action, **kwargs):
+    """Bumps the dropdown cache generation when a source's many-to-many links change."""
+
+    if not action.startswith("post_"):
+        return
+    for model in (type(instance), kwargs.get("model")):
+        if model is not None and dropdown_registry.is_source_model(model):
+            dropdown_cache.invalidate(model)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def evict_identity_map(sender, instance, **kwargs):
+    """Drops a written row from the active request's identity map."""
+
+    identity = current_identity_map()
+    if identity is not None:
+        identity.evict(sender, instance.pk)
+
+
+@receiver(post_save, sender="organization.Organization")
+@receiver(post_delete, sender="organization.Organization")
+def invalidate_organization_theme(sender, instance, **kwargs):
+    """Recompiles an organization's theme sheet after the organization changes."""
+
+    invalidate_theme(instance.pk)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_navigation(sender, instance, **kwargs):
+    """Makes cached navigation rails stale after a user, favorite or role change."""
+
+    if sender is get_user_model():
+        navigation_cache.invalidate_user(instance.pk)
+    elif sender is NavigationPreference:
+        navigation_cache.invalidate_user(instance.user_id)
+    elif sender._meta.label_lower in MENU_MODELS:
+        navigation_cache.invalidate_menu()
+
+
+@receiver(m2m_changed)
+def invalidate_navigation_memberships(sender, instance, action, model, pk_set, **kwargs):
+    """Makes cached navigation rails stale when group or permission links change."""
+
+    if not action.startswith("post_"):
+        return
+    user_model = get_user_model()
+    if isinstance(instance, user_model):
+        if model._meta.label_lower in MENU_MODELS:
+            navigation_cache.invalidate_user(instance.pk)
+    elif model is user_model and type(instance)._meta.label_lower in MENU_MODELS:
+        if pk_set is None:
+            navigation_cache.invalidate_menu()
+        for pk in pk_set or ():
+            navigation_cache.invalidate_user(pk)
+    elif type(instance)._meta.label_lower in MENU_MODELS:
+        navigation_cache.invalidate_menu()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_preference_bundle(sender, instance, **kwargs):
+    """Makes a user's cached preference bundle stale after a saved or deleted row."""
+
+    if sender is get_user_model():
+        invalidate_preferences(instance.pk)
+    elif sender is DashboardLayout or sender is NavigationPreference:
+        invalidate_preferences(instance.user_id)
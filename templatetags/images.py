@@ -0,0 +1,69 @@
+""" Template Tags for Responsive Images. """
+
+from django import template
+
+from ..badges import render_badge, render_sprite_stylesheet
+from ..images import load_manifest, render_picture, render_preload
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(path, alt="", sizes="100vw", loading="lazy", width=None,
+                     height=None, css_class="", priority=False):
+    """
+    Renders a static image as a ``<picture>`` with AVIF/WebP ``srcset`` sources.
+
+    Falls back to a plain ``<img>`` until ``manage.py build_images`` has written
+    the variants. Images are lazy-loaded unless ``priority`` is set.
+
+    Example:
+        {% load images %}
+        {% responsive_image 'images/splash/multi_orgs.png' sizes='58px' %}
+    """
+
+    return render_picture(
+        path,
+        load_manifest().get(path),
+        alt=alt,
+        sizes=sizes,
+        loading=loading,
+        width=width,
+        height=height,
+        css_class=css_class,
+        priority=priority,
+    )
+
+
+@register.simple_tag
+def preload_image(path, sizes="100vw"):
+    """
+    Renders a ``<link rel="preload">`` for an above-the-fold image.
+
+    Use the same ``sizes`` as the matching ``{% responsive_image %}``. Renders
+    nothing until ``manage.py build_images`` has written the variants.
+    """
+
+    return render_preload(path, load_manifest().get(path), sizes)
+
+
+@register.simple_tag
+def badge_icon(name, size=32, alt=""):
+    """
+    Renders a merit badge at ``size`` pixels from its sprite sheet or thumbnail.
+
+    ``name`` is the badge file name, stem or static path.
+
+    Example:
+        {% badge_sprite_stylesheet 32 %}
+        {% for course in courses %}{% badge_icon course.badge_image size=32 alt=course.name %}{% endfor %}
+    """
+
+    return render_badge(name, size, alt)
+
+
+@register.simple_tag
+def badge_sprite_stylesheet(size=32):
+    """Links the sprite sheet CSS for ``size``; include it once per page."""
+
+    return render_sprite_stylesheet(size)
@@ -0,0 +1,101 @@
+""" Template Tags for List Pages. """
+
+from django import template
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django_tables2 import RequestConfig
+
+from ..pagination import EstimatedCountPaginator, underlying_queryset
+
+register = template.Library()
+
+LIST_PER_PAGE = 50
+LIST_FILTER_PARAM = "q"
+
+
+@register.filter
+def has_rows(table):
+    """
+    Returns True if a django-tables2 table has any rows, without loading them.
+
+    Paginated tables answer from the paginator's count, which the pagination
+    controls need anyway; others run ``exists()`` (``LIMIT 1``) unless the rows
+    are already loaded.
+
+    Example:
+        {% if table|has_rows %}{% render_table table %}{% endif %}
+    """
+
+    if not table:
+        return False
+    page = getattr(table, "page", None)
+    if page is not None:
+        return page.paginator.count > 0
+    queryset = underlying_queryset(table.data)
+    if queryset is None:
+        return len(table.data) > 0
+    if queryset._result_cache is not None:
+        return bool(queryset._result_cache)
+    return queryset.exists()
+
+
+def filter_lookups(table, model):
+    """Returns an ``icontains`` lookup for each of the table's text columns."""
+
+    lookups = []
+    for column in table.columns:
+        field = column.accessor.get_field(model)
+        if isinstance(field, (models.CharField, models.TextField)):
+            lookups.append(f"{'__'.join(column.accessor.bits)}__icontains")
+    return lookups
+
+
+def filter_list_table(table, query):
+    """
+    Narrows a table's queryset to rows whose text columns contain ``query``.
+
+    Returns:
+        bool: Whether the rows were filtered.
+    """
+
+    queryset = underlying_queryset(table.data)
+    if not query or queryset is None:
+        return False
+    condition = Q()
+    for lookup in filter_lookups(table, queryset.model):
+        condition |= Q(**{lookup: query})
+    table.data.data = queryset.filter(condition) if condition else queryset.none()
+    return True
+
+
+@register.simple_tag(takes_context=True)
+def paginate_list_table(context, table, per_page=None):
+    """
+    Paginates a table for a view that opted in, so only one page of rows is loaded.
+
+    A view opts in by putting ``paginate_list`` in the context: True for
+    ``settings.PAGES_LIST_PER_PAGE`` rows (50) per page, or a page size. The row
+    filter then runs in the database from the ``q`` query parameter, since the
+    browser only has the current page to search. Tables the view already
+    paginated (for example through ``RequestConfig``) are left alone.
+
+    Example:
+        {% paginate_list_table table %}
+    """
+
+    request = context.get("request")
+    paginate = context.get("paginate_list")
+    if not table or not paginate or request is None or getattr(table, "page", None) is not None:
+        return ""
+    if per_page is None and paginate is not True:
+        per_page = paginate
+    filter_list_table(table, request.GET.get(LIST_FILTER_PARAM, "").strip())
+    RequestConfig(
+        request,
+        paginate={
+            "paginator_class": EstimatedCountPaginator,
+            "per_page": per_page or getattr(settings, "PAGES_LIST_PER_PAGE", LIST_PER_PAGE),
+        },
+    ).configure(table)
+    return ""
@@ -0,0 +1,25 @@
+""" Template Tags for the Navigation Rail. """
+
+from django import template
+
+from ..navigation import render_navigation_links
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def navigation_links(context):
+    """
+    Renders ``menu_items`` as rail links, cached per user by ``pages.navigation``.
+
+    The link for the current path is marked active after the cached fragment is
+    read, so one fragment serves every page the user visits.
+
+    Example:
+        {% load navigation %}
+        <div class="nav-links" id="navLinks">{% navigation_links %}</div>
+    """
+
+    return render_navigation_links(
+        context.get("request"), context["user"], context.get("menu_items", ())
+    )
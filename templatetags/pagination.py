@@ -0,0 +1,22 @@
+""" Template Tags for Pagination. """
+
+from django import template
+
+from .. import pagination
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page, on_each_side=pagination.WINDOW_ON_EACH_SIDE,
+                on_ends=pagination.WINDOW_ON_ENDS):
+    """
+    Returns the windowed page numbers for ``page``, with None for each gap.
+
+    Example:
+        {% load pagination %}
+        {% page_window table.page as page_numbers %}
+        {% for number in page_numbers %}{% if number %}...{% else %}&hellip;{% endif %}{% endfor %}
+    """
+
+    return pagination.page_window(page, on_each_side, on_ends)
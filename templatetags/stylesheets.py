@@ -0,0 +1,103 @@
+""" Template Tags for Compiled Stylesheets. """
+
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..assets import bundle_stylesheet, critical_css
+from ..css import FINGERPRINT_PARAM, STYLESHEETS
+from ..fonts import CRITICAL_FACE, render_font_preload
+from ..routing import url_registry
+from ..themes import theme_stylesheet
+
+register = template.Library()
+
+
+@register.simple_tag
+def stylesheet_url(name):
+    """
+    Returns the fingerprinted URL of a compiled stylesheet.
+
+    The fingerprint changes with the stylesheet's content, so the response can be
+    cached for a year.
+
+    Example:
+        {% load stylesheets %}
+        <link rel="stylesheet" href="{% stylesheet_url 'style_css' %}">
+    """
+
+    url = url_registry.reverse(name)
+    return f"{url}?{FINGERPRINT_PARAM}={STYLESHEETS[name]().fingerprint}"
+
+
+@register.simple_tag(takes_context=True)
+def theme_stylesheet_url(context):
+    """
+    Returns the fingerprinted theme URL for the current organization, or ``""``.
+
+    The organization is the signed-in user's, from the request-scoped profile
+    context.
+
+    Example:
+        {% theme_stylesheet_url as theme_url %}
+        {% if theme_url %}<link rel="stylesheet" href="{{ theme_url }}">{% endif %}
+    """
+
+    from ..views import profile_context
+
+    user = getattr(context.get("request"), "user", None)
+    if user is None:
+        return ""
+    organization = profile_context(user)["organization"]
+    stylesheet = theme_stylesheet(organization)
+    if stylesheet is None:
+        return ""
+    url = url_registry.reverse("theme_css", {"organization_id": organization.pk})
+    return f"{url}?{FINGERPRINT_PARAM}={stylesheet.fingerprint}"
+
+
+@register.simple_tag
+def preload_font(family=CRITICAL_FACE[0], subset=CRITICAL_FACE[1]):
+    """
+    Preloads one WOFF2 font subset; defaults to the landing page's critical face.
+
+    Renders nothing until ``manage.py build_fonts`` has produced the subsets.
+    """
+
+    return render_font_preload(family, subset)
+
+
+@register.simple_tag
+def css_bundle_url(name):
+    """Returns the content-hashed URL of a stylesheet bundle."""
+
+    fingerprint = bundle_stylesheet(name).fingerprint
+    return url_registry.reverse("css_bundle", {"name": name, "fingerprint": fingerprint})
+
+
+@register.simple_tag
+def css_bundle(name="app", defer=True):
+    """
+    Links a stylesheet bundle from ``pages.assets.CSS_BUNDLES``.
+
+    With ``defer`` the bundle's critical CSS (the app shell and the page rules
+    listed in ``pages.assets.ABOVE_THE_FOLD``) is inlined and the whole bundle,
+    page sheets included, is preloaded and swapped in without blocking rendering;
+    ``defer=False`` renders a plain stylesheet link.
+
+    Example:
+        {% block css_bundle %}{% css_bundle 'list' %}{% endblock css_bundle %}
+    """
+
+    url = css_bundle_url(name)
+    if not defer:
+        return format_html('<link rel="stylesheet" type="text/css" href="{}">', url)
+    critical = critical_css(name).replace("</", "<\\/")
+    return format_html(
+        "<style>{}</style>"
+        '<link rel="preload" as="style" href="{}" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" type="text/css" href="{}"></noscript>',
+        mark_safe(critical),
+        url,
+        url,
+    )
@@ -0,0 +1,22 @@
+""" Template Tags for the Reverse URL Registry. """
+
+from django import template
+
+from ..routing import url_registry
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_url(name, **kwargs):
+    """
+    Resolves a URL name through ``pages.routing.url_registry``.
+
+    Unlike ``{% url %}`` this never raises; unresolvable names render as ``"#"``.
+
+    Example:
+        {% load url_registry %}
+        <a href="{% cached_url 'facilities:faculty:index' facility_slug=facility.slug %}">
+    """
+
+    return url_registry.reverse(name, kwargs)
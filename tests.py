@@ -1,8 +1,27 @@
+import gzip
 import json
+from pathlib import Path
+from unittest import mock, skipUnless
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import EmptyPage, Paginator
+from django.db import IntegrityError, connection
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+import django_tables2 as tables
 from django.contrib.auth import get_user_model
 from core.models.dashboard import DashboardLayout
 from core.models.navigation import NavigationPreference
@@ -10,6 +29,51 @@ from core.tests import BaseDomainTestCase, mute_profile_signals
 from facility.models.faculty import FacultyProfile
 from organization.models import Organization
 
+from . import assets, fonts, layouts, mixins
+from .assets import bundle_stylesheet, critical_css, extract_critical, rewrite_urls
+from .badges import badge_key, render_badge, sprite_css
+from .css import IMMUTABLE_CACHE_CONTROL, minify_css
+from .datatables import DataTableSource, column, datatable_registry, table_context
+from .dropdowns import LABEL_ALIAS, DropdownRegistry, dropdown_cache, dropdown_registry
+from .generations import bump_generation, get_generation
+from .fonts import FONT_FACES, UNICODE_RANGES, font_face_css, font_face_rule, unicodes
+from .helpdocs import InvertedIndex, SearchDocument, help_sections
+from .identity import identity_map
+from .images import iter_sources, render_picture, render_preload, variant_widths
+from .managers import AbstractBaseManager
+from .middleware import MaterializedRowsMiddleware
+from .mixins import assign_unique_slugs, next_slug
+from .navigation import mark_active, navigation_cache
+from .pagination import EstimatedCountPaginator, keyset_page, page_window
+from .preferences import load_preferences, update_preferences
+from .search import (
+    PostgresSearchBackend,
+    SQLiteFTSSearchBackend,
+    get_search_backend,
+    is_searchable,
+    search_tokens,
+)
+from .templatetags.list_tables import has_rows, paginate_list_table
+from .templatetags.stylesheets import css_bundle, css_bundle_url, stylesheet_url
+from .themes import (
+    generation_key,
+    invalidate_theme,
+    normalize_theme,
+    render_theme,
+    theme_stylesheet,
+    theme_stylesheet_for_id,
+)
+from .routing import url_registry
+from .views import (
+    clear_profile_context,
+    encode_cursor,
+    invalidate_user_resources,
+    profile_context,
+    resource_context,
+    resource_context_cache,
+    resource_sections_cache,
+)
+
 User = get_user_model()
 
 
@@ -21,6 +85,11 @@ class PagesViewTests(TestCase):
 
 
 class ResourceAndHelpViewTests(BaseDomainTestCase):
+    def setUp(self):
+        super().setUp()
+        resource_context_cache.clear()
+        resource_sections_cache.clear()
+
     def test_resources_show_public_entries_for_anonymous_users(self):
         response = self.client.get(reverse("resources"))
 
@@ -70,6 +139,54 @@ class ResourceAndHelpViewTests(BaseDomainTestCase):
             f"/facilities/{self.facility.slug}/faculty/{user.get_profile().slug}/enrollments/",
         )
 
+    def test_resources_are_cached_per_role_and_refreshed_on_profile_change(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="resource.cached",
+                password="pass1234",
+                user_type=User.UserType.FACULTY,
+            )
+        self.client.force_login(user)
+
+        self.client.get(reverse("resources"))
+        self.client.get(reverse("resources"))
+        self.assertEqual(resource_sections_cache.hits, 1)
+
+        FacultyProfile.objects.create(
+            user=user,
+            organization=self.organization,
+            facility=self.facility,
+            role=FacultyProfile.FacultyRole.STAFF,
+        )
+        response = self.client.get(reverse("resources"))
+
+        self.assertContains(response, "My Faculty Enrollments")
+
+    def test_profile_context_is_loaded_once_per_user_object(self):
+        with mute_profile_signals():
+            user = User.objects.create_user(
+                username="resource.memo",
+                password="pass1234",
+                user_type=User.UserType.FACULTY,
+            )
+        FacultyProfile.objects.create(
+            user=user,
+            organization=self.organization,
+            facility=self.facility,
+            role=FacultyProfile.FacultyRole.STAFF,
+        )
+        user = User.objects.get(pk=user.pk)
+
+        with self.assertNumQueries(1):
+            ctx = profile_context(user)
+        with self.assertNumQueries(0):
+            self.assertIs(profile_context(user), ctx)
+            self.assertEqual(ctx["facility"], self.facility)
+            self.assertEqual(ctx["organization"], self.organization)
+
+        clear_profile_context(user)
+        self.assertIsNot(profile_context(user), ctx)
+
     def test_help_shows_role_workflow_reference(self):
         response = self.client.get(reverse("help"))
 
@@ -79,6 +196,393 @@ class ResourceAndHelpViewTests(BaseDomainTestCase):
         self.assertContains(response, "faction chain")
 
 
+    def test_help_section_filters_and_unknown_section_404s(self):
+        response = self.client.get(reverse("help-section", args=["enrollment"]))
+
+        self.assertContains(response, "faction chain")
+        self.assertNotContains(response, "Pinned navigation items")
+        self.assertEqual(
+            self.client.get(reverse("help-section", args=["facility"])).status_code,
+            404,
+        )
+
+    def test_help_search_covers_help_and_resources(self):
+        response = self.client.get(reverse("help-search"), {"q": "where do I sign in"})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["kind"], "resource")
+        self.assertEqual(results[0]["title"], "Sign In")
+
+        results = self.client.get(reverse("help-search"), {"q": "enrol slug"}).json()[
+            "results"
+        ]
+        self.assertTrue(results)
+        self.assertTrue(all(result["kind"] == "help" for result in results))
+        self.assertEqual(results[0]["url"], reverse("help-section", args=["enrollment"]))
+
+
+class InvertedIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = InvertedIndex(
+            [
+                SearchDocument("help", "Enrollment", "Attendee pages by slug.", None, None, None),
+                SearchDocument("help", "Navigation", "Pinned enrollment links.", None, None, None),
+            ]
+        )
+
+    def test_prefix_tokens_rank_title_matches_first(self):
+        titles = [document.title for document, _ in self.index.search("enrol")]
+        self.assertEqual(titles, ["Enrollment", "Navigation"])
+
+    def test_every_token_must_match(self):
+        titles = [document.title for document, _ in self.index.search("enrollment pinned")]
+        self.assertEqual(titles, ["Navigation"])
+        self.assertEqual(self.index.search("where do I"), [])
+
+    def test_compiled_help_interpolates_scope_only(self):
+        sections = help_sections(facility="Camp Pine")
+        self.assertEqual(
+            [section["key"] for section in sections],
+            ["navigation", "enrollment", "facility"],
+        )
+        self.assertIn("Your facility context is Camp Pine.", sections[2]["items"])
+
+
+class StylesheetTests(SimpleTestCase):
+    def test_minify_css_strips_comments_whitespace_and_empty_rules(self):
+        self.assertEqual(
+            minify_css("/* c */ a:hover , b > i { color : red ; }\n.empty { }"),
+            "a:hover,b>i{color:red}",
+        )
+        self.assertEqual(minify_css("a :hover{x:y}"), "a :hover{x:y}")
+
+    def test_style_css_is_served_compressed_with_validators(self):
+        response = self.client.get(
+            reverse("style_css"), HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("Last-Modified", response)
+        self.assertIn(b".greenButton", gzip.decompress(response.content))
+
+        revalidated = self.client.get(
+            reverse("style_css"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_fingerprinted_url_is_immutable(self):
+        response = self.client.get(stylesheet_url("style_css"))
+
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertNotIn("Content-Encoding", response)
+
+
+class BadgeDerivativeTests(SimpleTestCase):
+    index = {
+        "badges": {
+            "archery": {
+                "source": "images/user_files/badges/archery.png",
+                "thumbnails": {"32": "b/archery-32.webp", "64": "b/archery-64.webp"},
+            }
+        },
+        "sprites": {"64": {"css": "b/sprite-64.css", "members": frozenset({"archery"})}},
+    }
+
+    def test_sprite_members_render_as_positioned_spans(self):
+        html = render_badge("archery.gif", 64, "Archery", self.index)
+
+        self.assertIn('class="badge-sprite badge-sprite-64 badge-64-archery"', html)
+        self.assertIn('aria-label="Archery"', html)
+
+    def test_thumbnails_use_retina_srcset(self):
+        html = render_badge("archery", 32, index=self.index)
+
+        self.assertIn("archery-32.webp 1x", html)
+        self.assertIn("archery-64.webp 2x", html)
+        self.assertIn('width="32" height="32"', html)
+
+    def test_unknown_badges_fall_back_to_the_original(self):
+        html = render_badge("bird study.gif", 32, index=self.index)
+
+        self.assertIn("images/user_files/badges/bird%20study.gif", html)
+        self.assertEqual(badge_key("bird study.gif"), "bird-study")
+
+    def test_fallback_urls_accept_stems_and_static_paths(self):
+        with mock.patch("pages.badges.finders.find", return_value=None):
+            html = render_badge("kayaking", 32, index=self.index)
+        self.assertIn("images/user_files/badges/kayaking.png", html)
+
+        html = render_badge("images/user_files/badges/kayaking.gif", 32, index=self.index)
+        self.assertIn("images/user_files/badges/kayaking.gif", html)
+        self.assertNotIn("badges/images", html)
+
+    def test_sprite_css_scales_the_2x_sheet(self):
+        css = sprite_css(32, "sprite-32.webp", 2, 1, ["a", "b"])
+
+        self.assertIn("background-size:64px 32px", css)
+        self.assertIn(".badge-32-b{background-position:-32px 0px}", css)
+
+
+class CSSBundleTests(SimpleTestCase):
+    def test_critical_css_keeps_shell_rules_and_their_media_queries(self):
+        css = (
+            ".app-rail{width:1px}.report-card{color:red}"
+            "@media (max-width:9px){.nav-link{x:y}.report-card{x:y}}"
+            "@font-face{font-family:x}@keyframes spin{to{x:y}}"
+        )
+
+        self.assertEqual(
+            extract_critical(css),
+            ".app-rail{width:1px}@media (max-width:9px){.nav-link{x:y}}",
+        )
+
+    def test_relative_urls_are_rewritten_to_static(self):
+        css = rewrite_urls('a{background:url("../images/x.png")} b{background:url(/abs.png)}', "css/show.css")
+
+        self.assertIn(f"url('{static('images/x.png')}')", css)
+        self.assertIn("url(/abs.png)", css)
+
+    def test_bundle_is_served_immutable_under_its_hash(self):
+        response = self.client.get(css_bundle_url("list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn(b".app-shell", response.content)
+        stale = self.client.get(reverse("css_bundle", args=["list", "0" * 12]))
+        self.assertNotEqual(stale["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+
+    def test_critical_css_inlines_only_above_the_fold_page_rules(self):
+        self.assertIn(".list-toolbar", critical_css("list"))
+        self.assertIn(".splash-hero", critical_css("splash"))
+        self.assertNotIn(".splash-hero", critical_css("list"))
+        self.assertIn(".app-rail", critical_css("splash"))
+        # The rest of the page sheets loads with the deferred bundle.
+        self.assertNotIn("table.datatable", critical_css("list"))
+        self.assertIn(b"table.datatable", bundle_stylesheet("list").body)
+
+    @override_settings(DEBUG=True)
+    def test_debug_builds_are_reused_until_a_source_changes(self):
+        first = bundle_stylesheet("app")
+        self.assertIs(bundle_stylesheet("app"), first)
+
+        with mock.patch.object(assets, "source_mtimes", return_value=(0,)):
+            self.assertIsNot(bundle_stylesheet("app"), first)
+
+    def test_css_bundle_tag_inlines_critical_css(self):
+        html = css_bundle("show")
+
+        self.assertTrue(html.startswith("<style>"))
+        self.assertIn('rel="preload" as="style"', html)
+        self.assertIn(css_bundle_url("show"), html)
+
+
+class FontFaceTests(SimpleTestCase):
+    def test_each_font_file_is_declared_once_with_swap(self):
+        with mock.patch.object(fonts, "load_manifest", return_value={}):
+            css = font_face_css()
+
+        self.assertEqual(css.count("@font-face"), len(FONT_FACES))
+        self.assertEqual(css.count("ProximaNova-Regular.otf"), 1)
+        self.assertEqual(css.count("font-display:swap"), len(FONT_FACES))
+
+    def test_built_subsets_replace_the_original_files(self):
+        manifest = {
+            face.source: {
+                subset: f"css/fonts/{face.source}-{subset}.woff2" for subset, _ in UNICODE_RANGES
+            }
+            for face in FONT_FACES
+        }
+        with mock.patch.object(fonts, "load_manifest", return_value=manifest):
+            css = font_face_css()
+
+        self.assertEqual(css.count("@font-face"), len(FONT_FACES) * len(UNICODE_RANGES))
+        self.assertEqual(css.count("format('woff2')"), len(FONT_FACES) * len(UNICODE_RANGES))
+        self.assertNotIn("format('opentype')", css)
+
+    def test_subset_rule_carries_unicode_range(self):
+        rule = font_face_rule(FONT_FACES[0], "url('a.woff2') format('woff2')", "U+0000-00FF")
+
+        self.assertTrue(rule.endswith("unicode-range:U+0000-00FF}"))
+        self.assertEqual(unicodes("U+0041-0043, U+2122"), [0x41, 0x42, 0x43, 0x2122])
+
+
+class ThemeStylesheetTests(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="Theme Council", abbreviation="TH", max_depth=3
+        )
+
+    def test_theme_tokens_are_validated(self):
+        theme = normalize_theme(
+            {"accent": "#123456", "text": "red;}body{x:y", "bogus": "#fff", "dark": {"accent": "rgb(1, 2, 3)"}}
+        )
+
+        self.assertEqual(
+            render_theme(theme),
+            "html:root{--accent:#123456;}body.theme-dark{--accent:rgb(1, 2, 3);}",
+        )
+
+    def test_theme_css_serves_organization_overrides(self):
+        with self.settings(
+            PAGES_ORGANIZATION_THEMES={self.organization.pk: {"accent": "#123456"}}
+        ):
+            stylesheet = theme_stylesheet(self.organization)
+            response = self.client.get(
+                reverse("theme_css", args=[self.organization.pk]),
+                {"v": stylesheet.fingerprint},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"html:root{--accent:#123456}")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+
+    def test_invalidation_is_shared_between_processes(self):
+        self.organization.theme_tokens = {"accent": "#123456"}
+        first = theme_stylesheet(self.organization)
+        self.organization.theme_tokens = {"accent": "#654321"}
+        self.assertIs(theme_stylesheet(self.organization), first)
+
+        # Only the shared generation moves, as when another worker saved the row.
+        invalidate_theme(self.organization.pk)
+
+        self.assertEqual(theme_stylesheet(self.organization).body, b"html:root{--accent:#654321}")
+
+    def test_unknown_organizations_are_cached_as_missing(self):
+        missing = self.organization.pk + 1000
+        self.assertIsNone(theme_stylesheet_for_id(missing))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(theme_stylesheet_for_id(missing))
+        # Unknown pks never seed a non-expiring generation in the shared cache.
+        self.assertIsNone(cache.get(generation_key(missing)))
+
+    def test_creating_a_missing_organization_serves_its_theme(self):
+        missing = self.organization.pk + 1000
+        self.assertIsNone(theme_stylesheet_for_id(missing))
+
+        with self.settings(PAGES_ORGANIZATION_THEMES={missing: {"accent": "#123456"}}):
+            Organization.objects.create(pk=missing, name="Late Council", abbreviation="LC", max_depth=3)
+
+            self.assertEqual(theme_stylesheet_for_id(missing).body, b"html:root{--accent:#123456}")
+
+    def test_organizations_without_a_theme_404(self):
+        response = self.client.get(reverse("theme_css", args=[self.organization.pk]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ResponsiveImageTests(SimpleTestCase):
+    entry = {
+        "width": 1024,
+        "height": 400,
+        "variants": {
+            "avif": [[320, "images/splash/responsive/hero2-320w.avif"]],
+            "webp": [[320, "images/splash/responsive/hero2-320w.webp"]],
+        },
+    }
+
+    def test_picture_lists_best_format_first_and_lazy_loads(self):
+        html = render_picture("images/splash/hero2.png", self.entry, sizes="520px")
+
+        self.assertLess(html.index("image/avif"), html.index("image/webp"))
+        self.assertIn('hero2-320w.webp 320w" sizes="520px"', html)
+        self.assertIn('width="1024" height="400"', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_priority_images_load_eagerly_and_preload(self):
+        html = render_picture("images/splash/hero2.png", self.entry, priority=True)
+        preload = render_preload("images/splash/hero2.png", self.entry, "520px")
+
+        self.assertIn('loading="eager"', html)
+        self.assertIn('fetchpriority="high"', html)
+        self.assertIn('type="image/avif"', preload)
+        self.assertIn('imagesizes="520px"', preload)
+
+    def test_originals_are_not_preloaded_before_the_build(self):
+        self.assertEqual(render_preload("images/splash/hero2.png", None, "520px"), "")
+
+    def test_build_covers_the_large_splash_and_landing_assets(self):
+        paths = {path for path, _ in iter_sources(Path(__file__).resolve().parent / "static")}
+
+        for name in ("splash/hero.png", "splash/bg.png", "splash/bg_splash.png", "landing/hero.png"):
+            self.assertIn(f"images/{name}", paths)
+        self.assertTrue(any(path.startswith("images/landing/feature_") for path in paths))
+
+    def test_missing_variants_fall_back_to_plain_img(self):
+        html = render_picture("images/splash/bird.png", None, width=58, height=58)
+
+        self.assertTrue(html.startswith("<img"))
+        self.assertIn('width="58" height="58"', html)
+
+    def test_variant_widths_never_upscale(self):
+        self.assertEqual(variant_widths(300), [64, 128, 300])
+        self.assertEqual(variant_widths(4000)[-1], 1600)
+
+
+class URLRegistryTests(TestCase):
+    def test_matches_reverse_for_argument_free_names(self):
+        self.assertEqual(url_registry.reverse("help"), reverse("help"))
+        self.assertEqual(url_registry.reverse("resources"), reverse("resources"))
+
+    def test_unknown_names_resolve_to_placeholder(self):
+        self.assertEqual(url_registry.reverse("pages:does_not_exist"), "#")
+        self.assertEqual(
+            url_registry.reverse("pages:does_not_exist", {"slug": "x"}), "#"
+        )
+
+    def test_kwarg_templates_match_reverse(self):
+        args = ("organization", "organization", "parent", "slug-1")
+        kwargs = dict(
+            zip(("app_label", "model_name", "field_name", "filter_value"), args)
+        )
+        self.assertEqual(
+            url_registry.reverse("dynamic-dropdown-options", kwargs),
+            reverse("dynamic-dropdown-options", args=args),
+        )
+
+    def test_unsafe_values_fall_back_to_reverse(self):
+        kwargs = {
+            "app_label": "organization",
+            "model_name": "organization",
+            "field_name": "parent",
+            "filter_value": "a b",
+        }
+        self.assertEqual(
+            url_registry.reverse("dynamic-dropdown-options", kwargs),
+            reverse("dynamic-dropdown-options", kwargs=kwargs),
+        )
+
+
+class ResourceContextCacheTests(TestCase):
+    def setUp(self):
+        with mute_profile_signals():
+            self.user = User.objects.create_user(
+                username="resources.user",
+                password="pass1234",
+                user_type=User.UserType.LEADER,
+            )
+        resource_context_cache.clear()
+
+    def test_entries_go_stale_when_the_shared_generation_moves(self):
+        first = resource_context(self.user)
+        self.assertEqual(resource_context(self.user), first)
+        self.assertEqual(resource_context_cache.hits, 1)
+
+        # Stands in for a profile save handled by another worker.
+        invalidate_user_resources(self.user.pk)
+        resource_context(self.user)
+
+        self.assertEqual(resource_context_cache.misses, 2)
+
+    def test_receivers_are_connected_to_their_models_only(self):
+        with mock.patch("pages.signals.invalidate_user_resources") as invalidate:
+            Organization.objects.create(name="Quiet Council", abbreviation="QC", max_depth=3)
+        invalidate.assert_not_called()
+
+
 class SaveLayoutViewTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -117,6 +621,23 @@ class SaveLayoutViewTests(TestCase):
         self.assertNotIn("test-card", layout.hidden_widgets)
         self.assertIn("other", layout.hidden_widgets)
 
+    def test_hiding_a_hidden_widget_skips_the_write(self):
+        DashboardLayout.objects.create(
+            user=self.user, portal_key="facility", hidden_widgets=["test-card"]
+        )
+        self.client.force_login(self.user)
+        payload = {"action": "hide_widget", "widget_key": "test-card", "portal_key": "facility"}
+        with mock.patch.object(layouts, "hide_widget") as hide_widget:
+            response = self.client.post(
+                reverse("save_layout"),
+                json.dumps(payload),
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["hidden_widgets"], ["test-card"])
+        hide_widget.assert_not_called()
+
     def test_reset_hidden_clears_list(self):
         DashboardLayout.objects.create(
             user=self.user,
@@ -167,6 +688,53 @@ class SaveLayoutViewTests(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json()["message"], "Invalid widget key")
 
+    def test_operations_are_applied_in_order(self):
+        DashboardLayout.objects.create(
+            user=self.user,
+            portal_key="facility",
+            hidden_widgets=["old"],
+        )
+        self.client.force_login(self.user)
+        payload = {
+            "portal_key": "facility",
+            "operations": [
+                {"action": "reset_hidden"},
+                {"action": "hide_widget", "widget_key": "one"},
+                {"action": "hide_widget", "widget_key": "two"},
+                {"action": "show_widget", "widget_key": "one"},
+                {"action": "save_layout", "layout": ["a", "b"]},
+                {"action": "save_layout", "layout": ["b", "a"]},
+            ],
+        }
+        response = self.client.post(
+            reverse("save_layout"),
+            json.dumps(payload),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["hidden_widgets"], ["two"])
+        layout = DashboardLayout.objects.get(user=self.user, portal_key="facility")
+        self.assertEqual(layout.hidden_widgets, ["two"])
+        self.assertEqual(json.loads(layout.layout), ["b", "a"])
+
+    def test_operations_reject_invalid_entry_without_writing(self):
+        self.client.force_login(self.user)
+        payload = {
+            "portal_key": "facility",
+            "operations": [
+                {"action": "hide_widget", "widget_key": "one"},
+                {"action": "hide_widget", "widget_key": 5},
+            ],
+        }
+        response = self.client.post(
+            reverse("save_layout"),
+            json.dumps(payload),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Invalid widget key")
+        self.assertFalse(DashboardLayout.objects.filter(user=self.user).exists())
+
     def test_invalid_action_returns_error(self):
         self.client.force_login(self.user)
         response = self.client.post(
@@ -187,6 +755,162 @@ class SaveLayoutViewTests(TestCase):
         self.assertEqual(response.json()["message"], "Invalid JSON payload")
 
 
+class LayoutWriteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="layout.writer",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+
+    def test_hide_widget_is_idempotent_and_keeps_order(self):
+        layouts.hide_widget(self.user, "facility", "one")
+        layouts.hide_widget(self.user, "facility", "two")
+        hidden = layouts.hide_widget(self.user, "facility", "one")
+
+        self.assertEqual(hidden, ["one", "two"])
+        layout = DashboardLayout.objects.get(user=self.user, portal_key="facility")
+        self.assertEqual(layout.hidden_widgets, ["one", "two"])
+
+    def test_show_widget_on_missing_row_creates_empty_layout(self):
+        hidden = layouts.show_widget(self.user, None, "one")
+
+        self.assertEqual(hidden, [])
+        self.assertTrue(
+            DashboardLayout.objects.filter(user=self.user, portal_key="default").exists()
+        )
+
+    def test_reset_hidden_on_existing_row_is_single_update(self):
+        DashboardLayout.objects.create(
+            user=self.user,
+            portal_key="facility",
+            hidden_widgets=["one"],
+            layout=json.dumps(["a", "b"]),
+        )
+
+        with self.assertNumQueries(1):
+            layouts.reset_hidden(self.user, "facility")
+
+        layout = DashboardLayout.objects.get(user=self.user, portal_key="facility")
+        self.assertEqual(layout.hidden_widgets, [])
+        self.assertEqual(json.loads(layout.layout), ["a", "b"])
+
+    def test_save_order_truncates_and_leaves_hidden_widgets(self):
+        DashboardLayout.objects.create(
+            user=self.user,
+            portal_key="facility",
+            hidden_widgets=["one"],
+        )
+
+        layouts.save_order(self.user, "facility", [str(i) for i in range(150)])
+
+        layout = DashboardLayout.objects.get(user=self.user, portal_key="facility")
+        self.assertEqual(len(json.loads(layout.layout)), layouts.MAX_LAYOUT_ITEMS)
+        self.assertEqual(layout.hidden_widgets, ["one"])
+
+    def test_insert_failures_other_than_a_lost_race_are_raised(self):
+        failing = mock.patch.object(
+            DashboardLayout.objects, "create", side_effect=IntegrityError("not null")
+        )
+        with failing as create, self.assertRaises(IntegrityError):
+            layouts.save_order(self.user, "facility", ["a"])
+        with failing, self.assertRaises(IntegrityError):
+            layouts.show_widget(self.user, "facility", "one")
+
+        self.assertEqual(create.call_count, 1)
+
+    def test_apply_operations_raises_insert_failures_instead_of_looping(self):
+        with mock.patch.object(
+            DashboardLayout.objects, "create", side_effect=IntegrityError("not null")
+        ) as create, self.assertRaises(IntegrityError):
+            layouts.apply_operations(self.user, "facility", [("hide_widget", "one")])
+
+        self.assertEqual(create.call_count, 1)
+
+    def test_lost_insert_race_retries_once_against_the_new_row(self):
+        real_create = DashboardLayout.objects.create
+
+        def racing_create(**values):
+            real_create(user=self.user, portal_key="facility", hidden_widgets=["other"])
+            raise IntegrityError("duplicate key")
+
+        with mock.patch.object(DashboardLayout.objects, "create", side_effect=racing_create):
+            layouts.save_order(self.user, "facility", ["a"])
+
+        layout = DashboardLayout.objects.get(user=self.user, portal_key="facility")
+        self.assertEqual(json.loads(layout.layout), ["a"])
+        self.assertEqual(layout.hidden_widgets, ["other"])
+
+
+class PreferenceBundleTests(TestCase):
+    def setUp(self):
+        with mute_profile_signals():
+            self.user = User.objects.create_user(
+                username="prefs.user",
+                password="pass1234",
+                user_type=User.UserType.LEADER,
+            )
+
+    def _fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_missing_preferences_load_without_writing(self):
+        user = self._fresh_user()
+        with self.assertNumQueries(1):
+            bundle = load_preferences(user)
+
+        self.assertEqual(bundle.favorite_keys, [])
+        self.assertEqual(bundle.layout("facility"), {"layout": None, "hidden_widgets": []})
+        self.assertFalse(NavigationPreference.objects.filter(user=self.user).exists())
+        self.assertFalse(DashboardLayout.objects.filter(user=self.user).exists())
+
+    def test_all_layouts_and_favorites_load_in_one_query_then_from_cache(self):
+        NavigationPreference.objects.create(user=self.user, favorite_keys=["reports.index"])
+        DashboardLayout.objects.create(
+            user=self.user, portal_key="facility", layout='["a", "b"]', hidden_widgets=["c"]
+        )
+        DashboardLayout.objects.create(user=self.user, portal_key="faction", hidden_widgets=[])
+
+        first, second = self._fresh_user(), self._fresh_user()
+        with self.assertNumQueries(1):
+            bundle = load_preferences(first)
+        with self.assertNumQueries(0):
+            self.assertEqual(load_preferences(second), bundle)
+
+        self.assertEqual(bundle.favorite_keys, ["reports.index"])
+        self.assertEqual(bundle.layout("facility"), {"layout": ["a", "b"], "hidden_widgets": ["c"]})
+        self.assertIn("faction", bundle.layouts)
+
+    def test_save_layout_refreshes_the_cached_bundle(self):
+        load_preferences(self._fresh_user())
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("save_layout"),
+            json.dumps({"action": "hide_widget", "widget_key": "card", "portal_key": "facility"}),
+            content_type="application/json",
+        )
+
+        user = self._fresh_user()
+        with self.assertNumQueries(0):
+            bundle = load_preferences(user)
+        self.assertEqual(bundle.layout("facility")["hidden_widgets"], ["card"])
+
+    def test_writes_patch_the_cached_bundle_without_refetching(self):
+        DashboardLayout.objects.create(user=self.user, portal_key="facility", hidden_widgets=["card"])
+        NavigationPreference.objects.create(user=self.user, favorite_keys=["reports.index"])
+        user = self._fresh_user()
+        load_preferences(user)
+
+        with mock.patch("pages.preferences.fetch_preferences") as fetch:
+            bundle = update_preferences(user, "facility", layout=["b", "a"])
+        fetch.assert_not_called()
+
+        self.assertEqual(bundle.layout("facility"), {"layout": ["b", "a"], "hidden_widgets": ["card"]})
+        self.assertEqual(bundle.favorite_keys, ["reports.index"])
+        with self.assertNumQueries(0):
+            self.assertEqual(load_preferences(self._fresh_user()), bundle)
+
+
 class ToggleNavFavoriteViewTests(TestCase):
     def setUp(self):
         with mute_profile_signals():
@@ -226,15 +950,237 @@ class ToggleNavFavoriteViewTests(TestCase):
         self.assertEqual(response.json()["state"], "removed")
         self.assertFalse(response.json()["pinned"])
 
+    def test_removing_an_unpinned_key_creates_no_preference(self):
+        response = self._post({"key": "factions.dashboard", "action": "remove"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["favorite_keys"], [])
+        self.assertFalse(NavigationPreference.objects.filter(user=self.user).exists())
+
     def test_missing_key_returns_error(self):
         response = self._post({"action": "add"})
         self.assertEqual(response.status_code, 400)
 
 
-class DynamicDropdownTests(TestCase):
-    def test_options_are_filtered_by_parent(self):
-        user = User.objects.create_user(
-            username="dropdown.user",
+class NavigationCacheTests(TestCase):
+    def setUp(self):
+        with mute_profile_signals():
+            self.user = User.objects.create_user(
+                username="rail.user",
+                password="pass1234",
+                user_type=User.UserType.LEADER,
+            )
+        navigation_cache.reset_stats()
+        self.renders = 0
+
+    def _render(self):
+        self.renders += 1
+        return '<a class="nav-link" href="/reports/" data-menu-key="reports">Reports</a>'
+
+    def test_fragment_is_rendered_once_per_generation(self):
+        navigation_cache.get_or_render(self.user.pk, self._render)
+        navigation_cache.get_or_render(self.user.pk, self._render)
+        self.assertEqual(self.renders, 1)
+
+        NavigationPreference.objects.create(user=self.user, favorite_keys=["reports"])
+        navigation_cache.get_or_render(self.user.pk, self._render)
+        self.assertEqual(self.renders, 2)
+
+        navigation_cache.invalidate_menu()
+        navigation_cache.get_or_render(self.user.pk, self._render)
+        self.assertEqual((navigation_cache.hits, navigation_cache.misses), (1, 3))
+
+    def test_active_link_is_marked_after_the_cache(self):
+        fragment = self._render() + '<a class="nav-link is-child" href="/reports/new/">New</a>'
+
+        html = mark_active(fragment, "/reports/")
+
+        self.assertIn(
+            '<a class="nav-link is-active" href="/reports/" aria-current="page"', html
+        )
+        self.assertIn('<a class="nav-link is-child" href="/reports/new/">', html)
+
+
+@datatable_registry.register("test-users")
+class UserTable(DataTableSource):
+    columns = (column("Username", "username"), column("First name", "first_name"))
+
+    def get_queryset(self, request):
+        return User.objects.filter(username__startswith="dt.")
+
+
+class DataTableEndpointTests(TestCase):
+    def setUp(self):
+        for index, name in enumerate(["Ann", "<b>Bob</b>", "Cal", "Dee", "Eve"]):
+            self.user = User.objects.create_user(
+                username=f"dt.{index}",
+                password="pass1234",
+                first_name=name,
+                user_type=User.UserType.ADMIN,
+            )
+        self.client.force_login(self.user)
+        self.url = table_context("test-users")["source_url"]
+
+    def test_only_the_requested_page_is_returned(self):
+        response = self.client.get(
+            self.url,
+            {"draw": "3", "start": "1", "length": "2", "order[0][column]": "1", "order[0][dir]": "desc"},
+        )
+
+        payload = response.json()
+        self.assertEqual(payload["draw"], 3)
+        self.assertEqual((payload["recordsTotal"], payload["recordsFiltered"]), (5, 5))
+        self.assertEqual(payload["data"], [["dt.3", "Dee"], ["dt.2", "Cal"]])
+
+    def test_search_filters_and_cells_are_escaped(self):
+        payload = self.client.get(self.url, {"search[value]": "bob"}).json()
+
+        self.assertEqual(payload["recordsFiltered"], 1)
+        self.assertEqual(payload["data"], [["dt.1", "&lt;b&gt;Bob&lt;/b&gt;"]])
+
+    def test_unknown_source_returns_404(self):
+        response = self.client.get(reverse("datatable-rows", args=["missing"]))
+        self.assertEqual(response.status_code, 404)
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        for index in range(5):
+            User.objects.create_user(
+                username=f"page.{index}",
+                password="pass1234",
+                user_type=User.UserType.ADMIN,
+            )
+        self.users = User.objects.filter(username__startswith="page.")
+
+    def test_page_window_elides_distant_pages(self):
+        page = Paginator(range(1000), 10).page(50)
+
+        self.assertEqual(page_window(page), [1, None, 48, 49, 50, 51, 52, None, 100])
+
+    def test_page_window_does_not_link_estimated_last_pages(self):
+        paginator = Paginator(range(1000), 10)
+        paginator.count_is_estimate = True
+
+        self.assertEqual(page_window(paginator.page(50)), [1, None, 48, 49, 50, 51, 52, None])
+        self.assertEqual(page_window(paginator.page(99)), [1, None, 97, 98, 99, 100])
+
+    def test_counts_past_the_exact_limit_are_estimates(self):
+        self.assertEqual(EstimatedCountPaginator(self.users, 2, exact_limit=10).count, 5)
+
+        paginator = EstimatedCountPaginator(self.users, 2, exact_limit=3)
+        self.assertGreaterEqual(paginator.count, 4)
+        self.assertTrue(paginator.count_is_estimate)
+
+    def test_estimated_pages_find_the_end_by_running_out_of_rows(self):
+        paginator = EstimatedCountPaginator(self.users.order_by("username"), 2, exact_limit=3)
+        paginator.count = 4  # An estimate one page short of the five rows.
+        paginator.count_is_estimate = True
+
+        second = paginator.page(2)
+        self.assertTrue(second.has_next())
+        self.assertEqual(page_window(second), [1, 2, 3])
+
+        last = paginator.page(3)
+        self.assertEqual([user.username for user in last], ["page.4"])
+        self.assertFalse(last.has_next())
+        self.assertEqual(last.end_index(), 5)
+        self.assertEqual(page_window(last), [1, 2, 3])
+        with self.assertRaises(EmptyPage):
+            paginator.page(4)
+
+    def test_keyset_pages_walk_both_ways_without_counting(self):
+        ordering = ("-username", "pk")
+        with self.assertNumQueries(1):
+            first = keyset_page(self.users, per_page=2, ordering=ordering)
+        second = keyset_page(self.users, first.next_cursor, per_page=2, ordering=ordering)
+        last = keyset_page(self.users, second.next_cursor, per_page=2, ordering=ordering)
+        back = keyset_page(self.users, second.previous_cursor, per_page=2, ordering=ordering)
+
+        names = lambda page: [user.username for user in page]
+        self.assertEqual(names(first), ["page.4", "page.3"])
+        self.assertEqual(names(second), ["page.2", "page.1"])
+        self.assertEqual(names(last), ["page.0"])
+        self.assertFalse(last.has_next)
+        self.assertEqual(names(back), names(first))
+        self.assertFalse(back.has_previous)
+
+    def test_nullable_keyset_ordering_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            keyset_page(self.users, ordering=("last_login", "pk"))
+
+    def test_malformed_keyset_cursor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            keyset_page(self.users, cursor="not-a-cursor")
+
+
+class UserListTable(tables.Table):
+    class Meta:
+        model = User
+        fields = ("username",)
+
+
+class ListRenderingTests(TestCase):
+    def setUp(self):
+        for index in range(5):
+            User.objects.create_user(
+                username=f"list.{index}",
+                password="pass1234",
+                user_type=User.UserType.ADMIN,
+            )
+        self.users = User.objects.filter(username__startswith="list.")
+
+    def test_has_rows_checks_existence_without_loading_rows(self):
+        table = UserListTable(self.users)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(has_rows(table))
+        self.assertIsNone(self.users._result_cache)
+        self.assertFalse(has_rows(UserListTable(self.users.none())))
+
+    def test_unpaginated_tables_load_one_page(self):
+        table = UserListTable(self.users)
+        request = RequestFactory().get("/", {"page": "2"})
+
+        paginate_list_table({"request": request, "paginate_list": True}, table, per_page=2)
+
+        self.assertEqual(table.page.number, 2)
+        self.assertEqual(len(table.page.object_list), 2)
+        self.assertEqual(table.paginator.count, 5)
+        self.assertTrue(has_rows(table))
+
+    def test_tables_are_paginated_only_when_the_view_opts_in(self):
+        table = UserListTable(self.users)
+
+        paginate_list_table({"request": RequestFactory().get("/")}, table)
+
+        self.assertFalse(hasattr(table, "page"))
+
+    def test_paginated_tables_filter_rows_in_the_database(self):
+        table = UserListTable(self.users)
+        request = RequestFactory().get("/", {"q": "LIST.3"})
+
+        paginate_list_table({"request": request, "paginate_list": 2}, table)
+
+        self.assertEqual(table.paginator.count, 1)
+        self.assertEqual([row.record.username for row in table.page.object_list], ["list.3"])
+
+    @override_settings(DEBUG=True)
+    def test_materialized_rows_are_reported_in_debug(self):
+        def view(request):
+            list(self.users)
+            return HttpResponse()
+
+        response = MaterializedRowsMiddleware(view)(RequestFactory().get("/"))
+
+        label = User._meta.label_lower
+        self.assertEqual(response["X-Rows-Materialized"], f"total=5; {label}=5")
+
+
+class DynamicDropdownTests(TestCase):
+    def test_options_are_filtered_by_parent(self):
+        user = User.objects.create_user(
+            username="dropdown.user",
             password="pass1234",
             user_type=User.UserType.ADMIN,
         )
@@ -266,3 +1212,578 @@ class DynamicDropdownTests(TestCase):
         data = response.json()["options"]
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["value"], child.id)
+
+    def test_options_page_with_cursor_and_prefix_search(self):
+        user = User.objects.create_user(
+            username="dropdown.pager",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        parent = Organization.objects.create(
+            name="Paging Council",
+            abbreviation="PC",
+            max_depth=3,
+        )
+        for name in ("Alpha District", "Bravo District", "Charlie District", "Able District"):
+            Organization.objects.create(
+                name=name,
+                abbreviation=name[:2].upper(),
+                parent=parent,
+                max_depth=3,
+            )
+        url = reverse(
+            "dynamic-dropdown-options",
+            args=("organization", "organization", "parent", parent.id),
+        )
+
+        first = self.client.get(url, {"limit": 2}).json()
+        self.assertEqual(
+            [option["text"] for option in first["options"]],
+            ["Able District", "Alpha District"],
+        )
+        second = self.client.get(url, {"limit": 2, "cursor": first["next"]}).json()
+        self.assertEqual(
+            [option["text"] for option in second["options"]],
+            ["Bravo District", "Charlie District"],
+        )
+        self.assertIsNone(second["next"])
+
+        searched = self.client.get(url, {"q": "al"}).json()
+        self.assertEqual(
+            [option["text"] for option in searched["options"]], ["Alpha District"]
+        )
+
+    def test_invalid_cursor_returns_error(self):
+        user = User.objects.create_user(
+            username="dropdown.cursor",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse(
+                "dynamic-dropdown-options",
+                args=("organization", "organization", "parent", 1),
+            ),
+            {"cursor": "not-a-cursor"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_non_integer_pk_returns_error(self):
+        user = User.objects.create_user(
+            username="dropdown.cursor.pk",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse(
+                "dynamic-dropdown-options",
+                args=("organization", "organization", "parent", 1),
+            ),
+            {"cursor": encode_cursor("a", "b")},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_numeric_filter_value_returns_error(self):
+        user = User.objects.create_user(
+            username="dropdown.filter.text",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse(
+                "dynamic-dropdown-options",
+                args=("organization", "organization", "parent", "abc"),
+            )
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_relation_field_is_rejected(self):
+        user = User.objects.create_user(
+            username="dropdown.field",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse(
+                "dynamic-dropdown-options",
+                args=("organization", "organization", "name", 1),
+            )
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Field not allowed")
+
+    def test_etag_revalidation_and_invalidation(self):
+        user = User.objects.create_user(
+            username="dropdown.etag",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        parent = Organization.objects.create(
+            name="Etag Council",
+            abbreviation="EC",
+            max_depth=3,
+        )
+        url = reverse(
+            "dynamic-dropdown-options",
+            args=("organization", "organization", "parent", parent.id),
+        )
+        dropdown_cache.reset_stats()
+
+        first = self.client.get(url)
+        etag = first["ETag"]
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+
+        Organization.objects.create(
+            name="Etag District",
+            abbreviation="ED",
+            parent=parent,
+            max_depth=3,
+        )
+        refreshed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed["ETag"], etag)
+        self.assertEqual(len(refreshed.json()["options"]), 1)
+        stats = dropdown_cache.stats()
+        self.assertEqual(stats["not_modified"], 1)
+        self.assertGreaterEqual(stats["invalidations"], 1)
+
+    def test_batch_groups_options_by_parent(self):
+        user = User.objects.create_user(
+            username="dropdown.batch",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        first = Organization.objects.create(name="First Council", abbreviation="FC", max_depth=3)
+        second = Organization.objects.create(name="Second Council", abbreviation="SC", max_depth=3)
+        child = Organization.objects.create(
+            name="First District", abbreviation="FD", parent=first, max_depth=3
+        )
+        lookups = [
+            {
+                "app_label": "organization",
+                "model_name": "organization",
+                "field_name": "parent",
+                "filter_value": parent.id,
+            }
+            for parent in (first, second)
+        ]
+
+        response = self.client.post(
+            reverse("dynamic-dropdown-options-batch"),
+            json.dumps({"lookups": lookups}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        grouped = response.json()["results"]["organization.organization.parent"]
+        self.assertEqual(grouped[str(first.id)], [{"value": child.id, "text": "First District"}])
+        self.assertEqual(grouped[str(second.id)], [])
+
+    def test_batch_rejects_unregistered_source(self):
+        user = User.objects.create_user(
+            username="dropdown.batch.bad",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        lookups = [
+            {
+                "app_label": "auth",
+                "model_name": "user",
+                "field_name": "groups",
+                "filter_value": 1,
+            }
+        ]
+        response = self.client.post(
+            reverse("dynamic-dropdown-options-batch"),
+            json.dumps({"lookups": lookups}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_rejects_non_numeric_filter_value(self):
+        user = User.objects.create_user(
+            username="dropdown.batch.text",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        lookups = [
+            {
+                "app_label": "organization",
+                "model_name": "organization",
+                "field_name": "parent",
+                "filter_value": "abc",
+            }
+        ]
+        response = self.client.post(
+            reverse("dynamic-dropdown-options-batch"),
+            json.dumps({"lookups": lookups}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_keys_results_by_normalized_value(self):
+        user = User.objects.create_user(
+            username="dropdown.batch.padded",
+            password="pass1234",
+            user_type=User.UserType.ADMIN,
+        )
+        self.client.force_login(user)
+        parent = Organization.objects.create(name="Padded Council", abbreviation="PC", max_depth=3)
+        child = Organization.objects.create(
+            name="Padded District", abbreviation="PD", parent=parent, max_depth=3
+        )
+        lookups = [
+            {
+                "app_label": "organization",
+                "model_name": "organization",
+                "field_name": "parent",
+                "filter_value": f"0{parent.id}",
+            }
+        ]
+
+        response = self.client.post(
+            reverse("dynamic-dropdown-options-batch"),
+            json.dumps({"lookups": lookups}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        grouped = response.json()["results"]["organization.organization.parent"]
+        self.assertEqual(grouped, {str(parent.id): [{"value": child.id, "text": "Padded District"}]})
+
+
+class GenerationTests(SimpleTestCase):
+    key = "pages:test:gen"
+
+    def setUp(self):
+        cache.delete(self.key)
+
+    def test_evicted_counter_does_not_restart_at_an_old_value(self):
+        seen = {get_generation(self.key), bump_generation(self.key)}
+        cache.delete(self.key)
+
+        self.assertNotIn(get_generation(self.key), seen)
+
+    def test_bumping_a_missing_counter_seeds_it(self):
+        value = bump_generation(self.key)
+
+        self.assertEqual(get_generation(self.key), value)
+        self.assertEqual(bump_generation(self.key), value + 1)
+
+
+class DropdownRegistryTests(SimpleTestCase):
+    def test_build_precomputes_forward_relation_lookups(self):
+        registry = DropdownRegistry()
+        registry.register("organization", "organization", fields=["parent"])
+        registry.build()
+
+        source = registry.get("Organization", "Organization", "parent")
+        self.assertEqual(source.filter_lookup, "parent_id")
+        self.assertEqual(source.ordering, ("name", "pk"))
+        self.assertIsNone(registry.get("organization", "organization", "name"))
+
+    def test_expression_labels_are_annotated(self):
+        registry = DropdownRegistry()
+        registry.register(
+            "organization",
+            "organization",
+            label=Concat("abbreviation", Value(" "), "name"),
+            fields=["parent"],
+        )
+        registry.build()
+
+        source = registry.get("organization", "organization", "parent")
+        self.assertEqual(source.ordering, (LABEL_ALIAS, "pk"))
+        self.assertIn(LABEL_ALIAS, source.queryset().query.annotations)
+
+    def test_label_relations_invalidate_the_etag(self):
+        source = dropdown_registry.get("facility", "quarters", "facility")
+        facility = source.model._meta.get_field("facility").related_model
+        self.assertIn(facility, source.label_models)
+        self.assertTrue(dropdown_registry.is_source_model(facility))
+
+        etag = dropdown_cache.etag(source, "1", "", None, None)
+        dropdown_cache.invalidate(facility)
+
+        self.assertNotEqual(dropdown_cache.etag(source, "1", "", None, None), etag)
+
+    def test_bad_entries_fail_at_build_time(self):
+        for entry in (
+            {"app_label": "organization", "model_name": "missing"},
+            {"app_label": "organization", "model_name": "organization", "label": "nope"},
+            {"app_label": "organization", "model_name": "organization", "fields": ["name"]},
+        ):
+            registry = DropdownRegistry()
+            registry.register(**entry)
+            with self.subTest(entry=entry), self.assertRaises(ImproperlyConfigured):
+                registry.build()
+
+
+class DropdownLabelTests(BaseDomainTestCase):
+    def test_labels_match_model_str(self):
+        for source in {source.model: source for source in dropdown_registry._sources.values()}.values():
+            labels = dict(source.queryset().values_list("pk", source.label_field))
+            expected = {obj.pk: str(obj) for obj in source.model._default_manager.all()}
+            with self.subTest(source=source):
+                self.assertEqual(labels, expected)
+
+
+class NextSlugTests(SimpleTestCase):
+    def test_returns_base_when_free(self):
+        self.assertEqual(next_slug("troop-101", {"troop-100"}), "troop-101")
+
+    def test_picks_first_free_suffix(self):
+        taken = {"troop-101", "troop-101-1", "troop-101-3"}
+        self.assertEqual(next_slug("troop-101", taken), "troop-101-2")
+
+    def test_suffix_fits_within_max_length(self):
+        base = "a" * 20
+        slug = next_slug(base, {base[:10]}, max_length=10)
+        self.assertEqual(slug, "a" * 8 + "-1")
+
+
+class UniqueSlugTests(TestCase):
+    defaults = {"abbreviation": "SC", "max_depth": 3}
+
+    def test_save_retries_when_a_concurrent_save_takes_the_slug(self):
+        Organization.objects.create(name="Pine Council", **self.defaults)
+        real_taken_slugs = mixins.taken_slugs
+        calls = []
+
+        def stale_taken_slugs(*args, **kwargs):
+            calls.append(args)
+            # The first check runs before the other row is visible.
+            return set() if len(calls) == 1 else real_taken_slugs(*args, **kwargs)
+
+        with mock.patch.object(mixins, "taken_slugs", stale_taken_slugs):
+            org = Organization.objects.create(name="Pine Council", **self.defaults)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(org.slug, "pine-council-1")
+
+    def test_save_reraises_integrity_errors_that_are_not_slug_collisions(self):
+        org = Organization(name="Broken Council", **self.defaults)
+
+        def failing_save(*args, **kwargs):
+            raise IntegrityError("not null")
+
+        with self.assertRaises(IntegrityError):
+            mixins.save_with_unique_slug(org, failing_save, (), {})
+        self.assertEqual(org.slug, "")
+
+    def test_assign_unique_slugs_avoids_existing_and_sibling_slugs(self):
+        Organization.objects.create(name="Oak Council", **self.defaults)
+        instances = [
+            Organization(name="Oak Council", **self.defaults),
+            Organization(name="Oak Council", **self.defaults),
+            Organization(name="Elm Council", slug="oak-council-2", **self.defaults),
+        ]
+
+        with self.assertNumQueries(1):
+            assign_unique_slugs(Organization, instances)
+        Organization.objects.bulk_create(instances)
+
+        self.assertEqual(
+            [org.slug for org in instances], ["oak-council-1", "oak-council-3", "oak-council-2"]
+        )
+
+
+    def test_empty_slugs_fall_back_to_the_model_name(self):
+        Organization.objects.create(name="Cedar Council", **self.defaults)
+
+        with CaptureQueriesContext(connection) as queries:
+            org = Organization.objects.create(name="!!!", **self.defaults)
+
+        self.assertEqual(org.slug, "organization")
+        self.assertTrue(any("'organization%'" in query["sql"] for query in queries.captured_queries))
+
+
+class SearchTokenTests(SimpleTestCase):
+    def test_strips_search_syntax(self):
+        self.assertEqual(search_tokens('camp* "lake" OR -troop'), ["camp", "lake", "OR", "troop"])
+
+    def test_blank_query_has_no_tokens(self):
+        self.assertEqual(search_tokens("  ' \" "), [])
+
+
+@skipUnless(is_searchable(Organization), "Organization has no search fields.")
+class SearchIndexTests(TransactionTestCase):
+    defaults = {"abbreviation": "SC", "max_depth": 3}
+
+    def setUp(self):
+        self.backend = get_search_backend(connection.alias)
+        if not isinstance(self.backend, (PostgresSearchBackend, SQLiteFTSSearchBackend)):
+            self.skipTest("The test database has no full-text search backend.")
+        with connection.schema_editor() as editor:
+            self.backend.install(Organization, editor)
+
+    def tearDown(self):
+        with connection.schema_editor() as editor:
+            self.backend.uninstall(Organization, editor)
+
+    def names(self, query):
+        return [org.name for org in self.backend.search(Organization.objects.all(), query)]
+
+    def test_every_token_matches_as_word_or_prefix(self):
+        Organization.objects.create(name="Lake Council", description="Summer camp", **self.defaults)
+        Organization.objects.create(name="Lakeside District", description="Canoe base", **self.defaults)
+        Organization.objects.create(name="Hill Council", description="Ridge trails", **self.defaults)
+
+        self.assertEqual(set(self.names("lake")), {"Lake Council", "Lakeside District"})
+        self.assertEqual(self.names("lake canoe"), ["Lakeside District"])
+        self.assertEqual(self.names("valley"), [])
+
+    def test_name_matches_rank_above_description_matches(self):
+        Organization.objects.create(name="River Council", description="Pine lodge", **self.defaults)
+        Organization.objects.create(name="Pine Council", description="River lodge", **self.defaults)
+
+        self.assertEqual(self.names("pine"), ["Pine Council", "River Council"])
+
+    def test_index_follows_saves_and_deletes(self):
+        org = Organization.objects.create(name="Cedar Council", description="", **self.defaults)
+        org.name = "Spruce Council"
+        org.save()
+
+        self.assertEqual(self.names("cedar"), [])
+        self.assertEqual(self.names("spruce"), ["Spruce Council"])
+
+        org.delete()
+        self.assertEqual(self.names("spruce"), [])
+
+    def test_bulk_writes_are_indexed(self):
+        Organization.objects.bulk_create(
+            [Organization(name="Birch Council", slug="birch-council", description="", **self.defaults)]
+        )
+        self.assertEqual(self.names("birch"), ["Birch Council"])
+
+        Organization.objects.filter(name="Birch Council").update(name="Maple Council")
+        self.assertEqual(self.names("birch"), [])
+        self.assertEqual(self.names("maple"), ["Maple Council"])
+
+
+class AbstractBaseManagerTests(TestCase):
+    def setUp(self):
+        self.manager = AbstractBaseManager()
+        self.manager.model = Organization
+
+    def test_get_or_create_uses_defaults_only_when_creating(self):
+        defaults = {"abbreviation": "MC", "max_depth": 3}
+        created_org, created = self.manager.get_or_create(name="Manager Council", defaults=defaults)
+        found_org, found = self.manager.get_or_create(name="Manager Council", defaults=defaults)
+
+        self.assertTrue(created)
+        self.assertFalse(found)
+        self.assertEqual(created_org.pk, found_org.pk)
+
+    def test_bulk_get_or_create_returns_pairs_in_key_order(self):
+        existing = Organization.objects.create(name="Existing Council", abbreviation="XC", max_depth=3)
+        keys = [{"name": "New Council"}, {"name": "Existing Council"}, {"name": "New Council"}]
+
+        results = self.manager.bulk_get_or_create(keys, defaults={"abbreviation": "NC", "max_depth": 3})
+
+        self.assertEqual([created for _, created in results], [True, False, True])
+        self.assertEqual(results[1][0].pk, existing.pk)
+        self.assertEqual(results[0][0].pk, results[2][0].pk)
+        self.assertEqual(Organization.objects.filter(name="New Council").count(), 1)
+
+    def test_bulk_get_or_create_lookups_win_over_repeated_defaults(self):
+        defaults = {"name": "Ignored Council", "abbreviation": "DC", "max_depth": 3}
+
+        [(org, created)] = self.manager.bulk_get_or_create([{"name": "Default Council"}], defaults=defaults)
+
+        self.assertTrue(created)
+        self.assertEqual(org.name, "Default Council")
+        self.assertEqual(org.abbreviation, "DC")
+
+    def test_bulk_get_or_create_query_count_does_not_grow_with_keys(self):
+        defaults = {"abbreviation": "BC", "max_depth": 3}
+        counts = []
+        for size in (2, 20):
+            keys = [{"name": f"Batch {size} Council {index}"} for index in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                self.manager.bulk_get_or_create(keys, defaults=defaults)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_get_or_create_assigns_unique_slugs_to_missing_rows(self):
+        Organization.objects.create(name="Lake Council", abbreviation="LC", max_depth=3)
+        keys = [{"name": "Lake Council"}, {"name": "Lake Council "}, {"name": "Lake  Council"}]
+
+        results = self.manager.bulk_get_or_create(keys, defaults={"abbreviation": "LC", "max_depth": 3})
+
+        self.assertEqual([created for _, created in results], [False, True, True])
+        slugs = [org.slug for org, _ in results]
+        self.assertNotIn("", slugs)
+        self.assertEqual(len(set(slugs)), 3)
+        self.assertEqual(Organization.objects.filter(slug__in=slugs).count(), 3)
+
+    def test_bulk_get_or_create_falls_back_when_a_row_appears_concurrently(self):
+        keys = [{"name": "Race Council"}, {"name": "Calm Council"}]
+        defaults = {"abbreviation": "RC", "max_depth": 3}
+        real_bulk_create = self.manager.bulk_create
+
+        def racing_bulk_create(instances, **kwargs):
+            # Another request saves the same row (and so the same slug) first.
+            Organization.objects.create(name="Race Council", **defaults)
+            return real_bulk_create(instances, **kwargs)
+
+        with mock.patch.object(self.manager, "bulk_create", racing_bulk_create):
+            results = self.manager.bulk_get_or_create(keys, defaults=defaults)
+
+        self.assertEqual([created for _, created in results], [False, True])
+        self.assertEqual(Organization.objects.filter(name="Race Council").count(), 1)
+
+    def test_bulk_get_or_create_rejects_mixed_keys(self):
+        with self.assertRaises(ValueError):
+            self.manager.bulk_get_or_create([{"name": "a"}, {"abbreviation": "b"}])
+
+    def test_get_or_none_reuses_instances_inside_identity_map(self):
+        org = Organization.objects.create(name="Identity Council", abbreviation="IC", max_depth=3)
+
+        with identity_map() as identity:
+            first = self.manager.get_or_none(pk=org.pk)
+            with self.assertNumQueries(0):
+                second = self.manager.get_or_none(pk=str(org.pk))
+            org.save()
+            third = self.manager.get_or_none(pk=org.pk)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual((identity.hits, identity.misses), (1, 2))
+
+    def test_queryset_updates_evict_the_identity_map(self):
+        org = Organization.objects.create(name="Stale Council", abbreviation="SC", max_depth=3)
+
+        with identity_map():
+            first = self.manager.get_or_none(pk=org.pk)
+            self.manager.filter(pk=org.pk).update(name="Fresh Council")
+            second = self.manager.get_or_none(pk=org.pk)
+            second.name = "Bulk Council"
+            self.manager.bulk_update([second], ["name"])
+            third = self.manager.get_or_none(pk=org.pk)
+
+        self.assertEqual(first.name, "Stale Council")
+        self.assertEqual(second.name, "Bulk Council")
+        self.assertIsNot(third, second)
+        self.assertEqual(third.name, "Bulk Council")
+
+    def test_get_or_none_ignores_non_unique_lookups(self):
+        Organization.objects.create(name="Plain Council", abbreviation="PC", max_depth=3)
+
+        with identity_map() as identity:
+            self.manager.get_or_none(name="Plain Council")
+            self.manager.get_or_none(name="Plain Council")
+
+        self.assertEqual(len(identity), 0)
@@ -0,0 +1,170 @@
+""" Per-Organization Theme Stylesheets. """
+
+import re
+
+from django.apps import apps
+from django.conf import settings
+
+from .caches import LRUCache
+from .css import Stylesheet
+from .generations import bump_generation, get_generation, peek_generation
+
+CACHE_PREFIX = "pages:theme"
+THEME_CACHE_SIZE = 1024
+THEME_TOKENS = (
+    "bg",
+    "panel",
+    "card",
+    "text",
+    "muted",
+    "border",
+    "accent",
+    "accent-strong",
+    "success",
+    "warning",
+    "danger",
+    "info",
+)
+# One notch more specific than layout.css so overrides win in any load order.
+THEME_SELECTORS = (("light", "html:root"), ("dark", "body.theme-dark"))
+COLOR_PATTERN = re.compile(
+    r"^(#[0-9a-fA-F]{3,8}|(rgb|rgba|hsl|hsla)\([0-9.,%\s]+\))$"
+)
+
+MISSING = object()
+
+theme_cache = LRUCache(maxsize=THEME_CACHE_SIZE)
+# Organization pk -> theme generation for pks that had no row when requested.
+missing_organizations = LRUCache(maxsize=THEME_CACHE_SIZE)
+
+
+def clean_tokens(raw):
+    """
+    Returns the valid token values from ``raw`` as a sorted tuple of pairs.
+
+    Unknown token names and values that are not plain colors are dropped, so
+    tenant-supplied tokens can never inject arbitrary CSS.
+    """
+
+    if not isinstance(raw, dict):
+        return ()
+    return tuple(
+        sorted(
+            (name, value.strip())
+            for name, value in raw.items()
+            if name in THEME_TOKENS
+            and isinstance(value, str)
+            and COLOR_PATTERN.match(value.strip())
+        )
+    )
+
+
+def normalize_theme(raw):
+    """
+    Normalizes an organization's theme definition.
+
+    ``raw`` maps token names to colors for the light theme; an optional ``"dark"``
+    key holds overrides for ``.theme-dark``.
+
+    Returns:
+        tuple: ``((mode, tokens), ...)`` with empty modes omitted.
+    """
+
+    if not isinstance(raw, dict):
+        return ()
+    modes = {"light": clean_tokens(raw), "dark": clean_tokens(raw.get("dark"))}
+    return tuple((mode, modes[mode]) for mode, _ in THEME_SELECTORS if modes[mode])
+
+
+def render_theme(theme):
+    """Renders a normalized theme as CSS custom-property overrides."""
+
+    selectors = dict(THEME_SELECTORS)
+    return "".join(
+        f"{selectors[mode]}{{{''.join(f'--{name}:{value};' for name, value in tokens)}}}"
+        for mode, tokens in theme
+    )
+
+
+def organization_theme(organization):
+    """
+    Returns the raw theme definition for an organization.
+
+    Reads ``organization.theme_tokens`` when the model provides it, otherwise
+    ``settings.PAGES_ORGANIZATION_THEMES[<slug>]``.
+    """
+
+    tokens = getattr(organization, "theme_tokens", None)
+    if tokens:
+        return tokens
+    themes = getattr(settings, "PAGES_ORGANIZATION_THEMES", {})
+    return themes.get(getattr(organization, "slug", None)) or themes.get(organization.pk)
+
+
+def generation_key(organization_id):
+    """Returns the shared-cache key of an organization's theme generation."""
+
+    return f"{CACHE_PREFIX}:gen:{organization_id}"
+
+
+def theme_key(organization_id):
+    """
+    Returns the ``theme_cache`` key for an organization pk.
+
+    Compiled sheets are held per process, keyed by a generation kept in the shared
+    cache, so ``invalidate_theme()`` in one worker makes them stale in all of them.
+    """
+
+    return organization_id, get_generation(generation_key(organization_id))
+
+
+def invalidate_theme(organization_id):
+    """Makes the cached theme for an organization stale in every process."""
+
+    bump_generation(generation_key(organization_id))
+
+
+def theme_stylesheet(organization):
+    """
+    Returns the compiled ``Stylesheet`` for an organization, or None without a theme.
+
+    Results are cached by organization pk until ``pages.signals`` sees the
+    organization change, so rendering a page costs one generation read and one
+    dictionary lookup. Sheets are not interned, so ``theme_cache`` bounds them.
+    """
+
+    if organization is None or organization.pk is None:
+        return None
+
+    def build():
+        theme = normalize_theme(organization_theme(organization))
+        return Stylesheet(render_theme(theme)) if theme else None
+
+    return theme_cache.get_or_set(theme_key(organization.pk), build)
+
+
+def theme_stylesheet_for_id(organization_id):
+    """
+    Returns the compiled theme for an organization pk, loading it on a cache miss.
+
+    The pk comes from an unauthenticated URL, so the shared generation is only
+    read, never seeded, until the organization is found. Unknown pks are kept in
+    the bounded ``missing_organizations`` cache with the generation they were
+    looked up at, so repeated requests for them do not query; creating the
+    organization bumps its generation, which takes it out of that path in every
+    process.
+    """
+
+    generation = peek_generation(generation_key(organization_id))
+    if missing_organizations.get(organization_id, MISSING) == generation:
+        return None
+    if generation is not None:
+        stylesheet = theme_cache.get((organization_id, generation), MISSING)
+        if stylesheet is not MISSING:
+            return stylesheet
+    model = apps.get_model("organization", "Organization")
+    organization = model._default_manager.filter(pk=organization_id).first()
+    if organization is None:
+        missing_organizations.set(organization_id, generation)
+        return None
+    return theme_stylesheet(organization)
@@ -3,7 +3,7 @@
 from django.views.generic import TemplateView
 from django.urls import path
 
-from . import views
+from . import css, views
 
 urlpatterns = [
     # Messaging & Notification
@@ -36,7 +36,36 @@ urlpatterns = [
     path("about", TemplateView.as_view(template_name="about.html"), name="about"),
     # Help Page
     path("help", views.help, name="help"),
+    path("help/search/", views.help_search, name="help-search"),
+    path("help/<slug:section>", views.help, name="help-section"),
+    # Stylesheets
+    path("css/style.css", css.style_css, name="style_css"),
+    path("css/fonts.css", css.fonts_css, name="fonts_css"),
+    path(
+        "css/bundles/<slug:name>.<slug:fingerprint>.css",
+        views.css_bundle,
+        name="css_bundle",
+    ),
+    path("css/dynamic.css", views.dynamic_css, name="dynamic_css"),
+    path(
+        "css/theme/<int:organization_id>.css", views.theme_css, name="theme_css"
+    ),
     # Dynamic pages
+    path(
+        "datatables/<slug:name>/",
+        views.datatable_rows,
+        name="datatable-rows",
+    ),
+    path(
+        "dynamic-dropdown-options/batch/",
+        views.dynamic_dropdown_batch,
+        name="dynamic-dropdown-options-batch",
+    ),
+    path(
+        "dynamic-dropdown-options/stats/",
+        views.dropdown_cache_stats,
+        name="dynamic-dropdown-options-stats",
+    ),
     path(
         "dynamic-dropdown-options/<app_label>/<model_name>/<field_name>/<filter_value>/",
         views.dynamic_dropdown_options,
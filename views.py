@@ -1,18 +1,35 @@
 # core/views.py
 
+import base64
 import json
+from functools import lru_cache
 
 from django.apps import apps
-from django.http import HttpResponse, JsonResponse
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    JsonResponse,
+)
 from django.shortcuts import redirect, render, get_object_or_404
-from django.urls import NoReverseMatch, reverse
 from django.contrib.auth.decorators import login_required
+from django.utils.http import parse_etags
 from django.views.decorators.http import require_POST
 from django.views.generic import TemplateView
 from core.models.messaging import Message, Notification
-from core.models.dashboard import DashboardLayout
 from core.models.navigation import NavigationPreference
+from . import assets, css, datatables, helpdocs, layouts, themes
+from .caches import LRUCache
+from .generations import bump_generation, get_generations
+from .dropdowns import dropdown_cache, dropdown_registry
 from .forms import MessageForm
+from .navigation import navigation_cache
+from .preferences import load_preferences, update_preferences
+from .routing import url_registry
 
 
 class ReportView(TemplateView):
@@ -29,26 +46,89 @@ class ResourceView(TemplateView):
 
 
 def safe_reverse(name, kwargs=None):
-    try:
-        return reverse(name, kwargs=kwargs or {})
-    except NoReverseMatch:
-        return "#"
+    return url_registry.reverse(name, kwargs)
+
+
+PROFILE_SCOPE_FIELDS = ("organization", "facility", "faction")
+PROFILE_CONTEXT_ATTR = "_pages_profile_context"
+
+
+@lru_cache(maxsize=None)
+def profile_models():
+    """
+    Returns ``{model name: model}`` for the models that attach a profile to a user.
+
+    A profile model is named ``<user type>Profile`` (``FacultyProfile`` for
+    ``User.UserType.FACULTY``) and has a ``user`` relation to the user model.
+    """
+
+    user_model = get_user_model()
+    models = {}
+    for model in apps.get_models():
+        name = model._meta.model_name
+        if not name.endswith("profile"):
+            continue
+        try:
+            field = model._meta.get_field("user")
+        except FieldDoesNotExist:
+            continue
+        if field.is_relation and field.related_model is user_model:
+            models[name] = model
+    return models
 
 
 def user_profile(user):
+    """
+    Returns the user's profile with its organization/facility/faction in one query.
+
+    The profile model is picked from ``user.user_type`` and queried directly with
+    ``select_related``, rather than loading it through ``user.get_profile()`` and
+    fetching it again for the relations.
+    """
+
     if not getattr(user, "is_authenticated", False):
         return None
-    return getattr(user, "get_profile", lambda: None)()
+    model = profile_models().get(f"{str(getattr(user, 'user_type', '')).lower()}profile")
+    if model is None:
+        return None
+    related = []
+    for name in PROFILE_SCOPE_FIELDS:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.many_to_one:
+            related.append(name)
+    return model._default_manager.select_related(*related).filter(user=user).first()
 
 
 def profile_context(user):
+    """
+    Returns the user's profile and its organization, facility and faction.
+
+    The result is memoized on the user object, which lives for one request, so
+    every helper in a request shares a single profile load.
+    """
+
+    cached = getattr(user, PROFILE_CONTEXT_ATTR, None)
+    if cached is not None:
+        return cached
     profile = user_profile(user)
-    return {
-        "profile": profile,
-        "organization": getattr(profile, "organization", None),
-        "facility": getattr(profile, "facility", None),
-        "faction": getattr(profile, "faction", None),
-    }
+    context = {"profile": profile}
+    for name in PROFILE_SCOPE_FIELDS:
+        context[name] = getattr(profile, name, None)
+    if getattr(user, "is_authenticated", False):
+        setattr(user, PROFILE_CONTEXT_ATTR, context)
+    return context
+
+
+def clear_profile_context(user):
+    """Forgets the memoized profile context after the profile changes mid-request."""
+
+    try:
+        delattr(user, PROFILE_CONTEXT_ATTR)
+    except AttributeError:
+        pass
 
 
 def link(label, description, icon, url_name=None, kwargs=None, url=None):
@@ -60,8 +140,80 @@ def link(label, description, icon, url_name=None, kwargs=None, url=None):
     }
 
 
-def build_resource_sections(user):
+RESOURCE_CACHE_SIZE = 512
+RESOURCE_CACHE_PREFIX = "pages:resources"
+
+resource_sections_cache = LRUCache(maxsize=RESOURCE_CACHE_SIZE)
+resource_context_cache = LRUCache(maxsize=RESOURCE_CACHE_SIZE * 4)
+
+
+def resource_generation_keys(user_id):
+    return f"{RESOURCE_CACHE_PREFIX}:gen:scopes", f"{RESOURCE_CACHE_PREFIX}:gen:user:{user_id}"
+
+
+def invalidate_resource_scopes():
+    """Makes every cached resource context stale after a facility or faction change."""
+
+    bump_generation(resource_generation_keys(None)[0])
+
+
+def invalidate_user_resources(user_id):
+    """Makes one user's cached resource context stale after a user or profile change."""
+
+    if user_id is not None:
+        bump_generation(resource_generation_keys(user_id)[1])
+
+
+def resource_context(user):
+    """
+    Returns the profile slug and facility/faction scope for a user, cached by user.
+
+    Facility and faction are ``(pk, slug, label)`` tuples, or None. Entries are
+    held per process but keyed by generations kept in the shared cache, which
+    ``pages.signals`` bumps when the profile, facility or faction changes, so a
+    change made in one worker makes the entry stale in every worker.
+    """
+
+    def load():
+        ctx = profile_context(user)
+        scope = []
+        for obj in (ctx["facility"], ctx["faction"]):
+            scope.append((obj.pk, obj.slug, str(obj)) if obj else None)
+        return (getattr(ctx["profile"], "slug", None) or None, *scope)
+
+    key = (user.pk, *get_generations(resource_generation_keys(user.pk)))
+    return resource_context_cache.get_or_set(key, load)
+
+
+def resource_cache_key(user):
+    """Returns the tuple that fully determines a user's resource sections."""
+
     if not getattr(user, "is_authenticated", False):
+        return None
+    user_type = getattr(user, "user_type", "")
+    is_admin = bool(
+        user_type == "ADMIN"
+        or getattr(user, "is_staff", False)
+        or getattr(user, "is_admin", False)
+    )
+    return (user_type, is_admin, *resource_context(user))
+
+
+def build_resource_sections(user):
+    """
+    Returns the resource sections for a user from the per-role cache.
+
+    The result is shared between requests and must be treated as read-only.
+    """
+
+    key = resource_cache_key(user)
+    return resource_sections_cache.get_or_set(
+        key, lambda: _build_resource_sections(key)
+    )
+
+
+def _build_resource_sections(key):
+    if key is None:
         return [
             {
                 "title": "Get Started",
@@ -74,11 +226,7 @@ def build_resource_sections(user):
             }
         ]
 
-    ctx = profile_context(user)
-    profile = ctx["profile"]
-    facility = ctx["facility"]
-    faction = ctx["faction"]
-    user_type = getattr(user, "user_type", "")
+    user_type, is_admin, profile_slug, facility, faction = key
     sections = [
         {
             "title": "Workspace",
@@ -92,7 +240,7 @@ def build_resource_sections(user):
         }
     ]
 
-    if user_type == "ADMIN" or getattr(user, "is_staff", False) or getattr(user, "is_admin", False):
+    if is_admin:
         sections.append(
             {
                 "title": "Administration",
@@ -109,32 +257,34 @@ def build_resource_sections(user):
         )
 
     if facility:
-        facility_kwargs = {"facility_slug": facility.slug}
+        _, facility_slug, facility_label = facility
+        facility_kwargs = {"facility_slug": facility_slug}
         items = [
             link("Facility Dashboard", "Open the facility workspace for staffing and operations.", "fa-building", "facilities:faculty:dashboard", facility_kwargs),
             link("Faculty Directory", "Review facility faculty profiles.", "fa-chalkboard-user", "facilities:faculty:index", facility_kwargs),
             link("Facility Enrollments", "Track facility-level enrollment periods and assignments.", "fa-clipboard-list", "facilities:enrollments:index", facility_kwargs),
         ]
-        if profile and getattr(profile, "slug", None):
+        if profile_slug:
             items.append(
                 link(
                     "My Faculty Enrollments",
                     "Review your assigned classes and enrollment details.",
                     "fa-list-check",
                     "facilities:faculty:enrollments:index",
-                    {"facility_slug": facility.slug, "faculty_slug": profile.slug},
+                    {"facility_slug": facility_slug, "faculty_slug": profile_slug},
                 )
             )
         sections.append(
             {
                 "title": "Facility",
-                "description": f"Facility-scoped tools for {facility}.",
+                "description": f"Facility-scoped tools for {facility_label}.",
                 "items": items,
             }
         )
 
     if faction:
-        faction_kwargs = {"faction_slug": faction.slug}
+        _, faction_slug, faction_label = faction
+        faction_kwargs = {"faction_slug": faction_slug}
         items = [
             link("Faction Dashboard", "Open the faction workspace for rosters and schedule context.", "fa-people-group", "factions:leaders:dashboard", faction_kwargs),
             link("Faction Detail", "Review faction profile, hierarchy, and related people.", "fa-address-card", "factions:show", faction_kwargs),
@@ -142,20 +292,20 @@ def build_resource_sections(user):
             link("Attendee Directory", "Review attendees and sub-faction assignments.", "fa-child-reaching", "factions:attendees:index", faction_kwargs),
             link("Faction Enrollments", "Track faction enrollment status.", "fa-clipboard-check", "factions:enrollments:index", faction_kwargs),
         ]
-        if profile and getattr(profile, "slug", None) and user_type == "ATTENDEE":
+        if profile_slug and user_type == "ATTENDEE":
             items.append(
                 link(
                     "My Enrollments",
                     "Review your selected classes and enrollment status.",
                     "fa-list-check",
                     "attendees:enrollments:index",
-                    {"attendee_slug": profile.slug},
+                    {"attendee_slug": profile_slug},
                 )
             )
         sections.append(
             {
                 "title": "Faction",
-                "description": f"Faction-scoped tools for {faction}.",
+                "description": f"Faction-scoped tools for {faction_label}.",
                 "items": items,
             }
         )
@@ -163,54 +313,99 @@ def build_resource_sections(user):
     return sections
 
 
-def build_help_sections(user):
+def build_help_sections(user, section=None):
     ctx = profile_context(user)
-    facility = ctx["facility"]
-    faction = ctx["faction"]
-    sections = [
-        {
-            "title": "Navigation",
-            "items": [
-                "Use Dashboard for role-specific work and Resources for cross-role links.",
-                "Pinned navigation items are stored per user and can be changed from the sidebar.",
-                "Detail pages use tabs for profile, enrollment, and related operational views.",
-            ],
-        },
-        {
-            "title": "Enrollment",
-            "items": [
-                "Attendee enrollment pages are scoped by attendee slug.",
-                "Faculty enrollment pages are scoped by facility and faculty slug.",
-                "Leader access follows the faction chain so root-faction leaders can review sub-faction attendees.",
-            ],
-        },
-    ]
+    return helpdocs.help_sections(ctx["facility"], ctx["faction"], section)
 
-    if facility:
-        sections.append(
-            {
-                "title": "Facility Workflows",
-                "items": [
-                    f"Your facility context is {facility}.",
-                    "Department admins can manage faculty for their facility.",
-                    "Staff without management permissions see the branded access-denied page.",
-                ],
-            }
-        )
 
-    if faction:
-        sections.append(
+HELP_SEARCH_MAX_LIMIT = 50
+
+resource_index_cache = LRUCache(maxsize=RESOURCE_CACHE_SIZE)
+
+
+def resource_search_index(user):
+    """Returns the search index over a user's resource items, cached like the sections."""
+
+    key = resource_cache_key(user)
+    return resource_index_cache.get_or_set(
+        key, lambda: helpdocs.resource_index(build_resource_sections(user))
+    )
+
+
+def search_help(user, query, limit=10):
+    """
+    Searches the help bullets and resource links visible to ``user``.
+
+    Both indexes are prebuilt in memory; only the matched help bullets are
+    interpolated with the user's facility/faction.
+
+    Returns:
+        list: Result dicts ordered by score, best first.
+    """
+
+    ctx = profile_context(user)
+    values = {"facility": ctx["facility"], "faction": ctx["faction"]}
+    matches = helpdocs.help_index(ctx["facility"], ctx["faction"]).search(query, limit)
+    matches += resource_search_index(user).search(query, limit)
+    matches.sort(key=lambda match: -match[1])
+
+    results = []
+    for document, score in matches[:limit]:
+        if document.kind == "help":
+            url = safe_reverse("help-section", {"section": document.section})
+            text = helpdocs.interpolate(document.text, document.scope, values)
+        else:
+            url = document.url
+            text = document.text
+        results.append(
             {
-                "title": "Faction Workflows",
-                "items": [
-                    f"Your faction context is {faction}.",
-                    "Faction dashboards summarize roster and enrollment activity.",
-                    "Attendee and leader detail pages expose enrollment tabs when the viewer is in the same faction chain.",
-                ],
+                "kind": document.kind,
+                "title": document.title,
+                "text": text,
+                "url": url,
+                "score": score,
             }
         )
+    return results
 
-    return sections
+
+LAYOUT_ACTIONS = ("hide_widget", "show_widget", "reset_hidden", "save_layout")
+MAX_LAYOUT_OPERATIONS = 200
+
+
+def clean_layout_operations(raw_operations):
+    """
+    Validates a batched ``save_layout`` payload.
+
+    Returns:
+        tuple: ``(operations, error)`` where operations is a list of
+        ``(action, value)`` pairs for ``layouts.apply_operations``.
+    """
+
+    if not isinstance(raw_operations, list) or not raw_operations:
+        return None, "Invalid operations payload"
+    if len(raw_operations) > MAX_LAYOUT_OPERATIONS:
+        return None, "Too many operations"
+
+    operations = []
+    for raw in raw_operations:
+        if not isinstance(raw, dict) or raw.get("action") not in LAYOUT_ACTIONS:
+            return None, "Invalid action"
+        action = raw["action"]
+        if action in ("hide_widget", "show_widget"):
+            value = raw.get("widget_key")
+            if not value or not isinstance(value, str):
+                return None, "Invalid widget key"
+        elif action == "save_layout":
+            value = raw.get("layout")
+            if not isinstance(value, list) or not all(
+                isinstance(item, str) for item in value
+            ):
+                return None, "Invalid layout payload"
+        else:
+            value = None
+        operations.append((action, value))
+    return operations, None
 
 
 @login_required
@@ -244,23 +439,29 @@ def save_layout(request):
             status=400,
         )
 
-    layout, _ = DashboardLayout.objects.get_or_create(
-        user=user, portal_key=portal_key or "default"
-    )
+    if "operations" in data:
+        operations, error = clean_layout_operations(data["operations"])
+        if error:
+            return JsonResponse({"status": "error", "message": error}, status=400)
+        state = layouts.apply_operations(user, portal_key, operations)
+        update_preferences(user, portal_key, **state)
+        return JsonResponse({"status": "success", **state})
 
+    # Requests that would leave the saved state unchanged are answered from the
+    # cached preference bundle without touching the layout row.
     if action == "hide_widget" and widget_key:
-        hidden = set(layout.hidden_widgets or [])
-        hidden.add(widget_key)
-        layout.hidden_widgets = list(hidden)
-        layout.save()
-        return JsonResponse({"status": "success", "hidden_widgets": layout.hidden_widgets})
+        hidden = load_preferences(user).layout(portal_key)["hidden_widgets"]
+        if widget_key not in hidden:
+            hidden = layouts.hide_widget(user, portal_key, widget_key)
+            update_preferences(user, portal_key, hidden_widgets=hidden)
+        return JsonResponse({"status": "success", "hidden_widgets": hidden})
 
     if action == "show_widget" and widget_key:
-        hidden = set(layout.hidden_widgets or [])
-        hidden.discard(widget_key)
-        layout.hidden_widgets = list(hidden)
-        layout.save()
-        return JsonResponse({"status": "success", "hidden_widgets": layout.hidden_widgets})
+        hidden = load_preferences(user).layout(portal_key)["hidden_widgets"]
+        if widget_key in hidden:
+            hidden = layouts.show_widget(user, portal_key, widget_key)
+            update_preferences(user, portal_key, hidden_widgets=hidden)
+        return JsonResponse({"status": "success", "hidden_widgets": hidden})
 
     layout_data = data.get("layout")
     if layout_data is not None:
@@ -271,13 +472,16 @@ def save_layout(request):
                 {"status": "error", "message": "Invalid layout payload"},
                 status=400,
             )
-        layout.layout = json.dumps(layout_data[:100])
-        layout.save()
+        saved = load_preferences(user).layout(portal_key)["layout"]
+        if saved != layout_data[: layouts.MAX_LAYOUT_ITEMS]:
+            saved = layouts.save_order(user, portal_key, layout_data)
+            update_preferences(user, portal_key, layout=saved)
         return JsonResponse({"status": "success"})
 
     if action == "reset_hidden":
-        layout.hidden_widgets = []
-        layout.save()
+        if load_preferences(user).layout(portal_key)["hidden_widgets"]:
+            hidden = layouts.reset_hidden(user, portal_key)
+            update_preferences(user, portal_key, hidden_widgets=hidden)
         return JsonResponse({"status": "success", "hidden_widgets": []})
 
     return JsonResponse({"status": "error", "message": "Invalid action"}, status=400)
@@ -298,18 +502,25 @@ def toggle_nav_favorite(request):
         )
 
     action = (payload.get("action") or "add").lower()
-    preferences, _ = NavigationPreference.objects.get_or_create(user=request.user)
-
-    if action == "remove":
-        preferences.remove_favorite(key)
-        state = "removed"
-        pinned = False
-    else:
-        preferences.add_favorite(key)
-        state = "added"
-        pinned = True
-
-    favorite_keys = preferences.favorite_keys
+    pinned = action != "remove"
+    state = "added" if pinned else "removed"
+
+    # Toggles that change nothing are answered from the cached preference bundle,
+    # so they neither look up nor create the preference row.
+    favorite_keys = load_preferences(request.user).favorite_keys
+    if (key in favorite_keys) != pinned:
+        preferences, _ = NavigationPreference.objects.get_or_create(user=request.user)
+        if pinned:
+            preferences.add_favorite(key)
+        else:
+            preferences.remove_favorite(key)
+        # The model helpers may write with ``update()``, which sends no signal.
+        navigation_cache.invalidate_user(request.user.pk)
+        if pinned:
+            favorite_keys = [*favorite_keys, key]
+        else:
+            favorite_keys = [item for item in favorite_keys if item != key]
+        update_preferences(request.user, favorite_keys=favorite_keys)
     return JsonResponse(
         {
             "status": "success",
@@ -381,33 +592,213 @@ def notifications(request):
     )
 
 
+DROPDOWN_MAX_LIMIT = 500
+DROPDOWN_MAX_BATCH = 200
+
+
+def encode_cursor(label, pk):
+    payload = json.dumps([label, pk], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Returns the ``(label, pk)`` pair encoded in a dropdown cursor."""
+
+    label, pk = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    if not isinstance(label, str) or not isinstance(pk, int) or isinstance(pk, bool):
+        raise ValueError("Invalid cursor")
+    return label, pk
+
+
 @login_required
 def dynamic_dropdown_options(request, app_label, model_name, field_name, filter_value):
-    allowed_models = {
-        ("organization", "organization"),
-        ("facility", "facility"),
-        ("facility", "quarters"),
-        ("faction", "faction"),
-        ("course", "course"),
-        ("enrollment", "facilityenrollment"),
-    }
-    model_key = (app_label.lower(), model_name.lower())
-    if model_key not in allowed_models:
-        return JsonResponse({"error": "Model not allowed"}, status=400)
+    source = dropdown_registry.get(app_label, model_name, field_name)
+    if source is None:
+        if not dropdown_registry.allows_model(app_label, model_name):
+            return JsonResponse({"error": "Model not allowed"}, status=400)
+        return JsonResponse({"error": "Field not allowed"}, status=400)
+
+    limit = request.GET.get("limit")
+    if limit is not None:
+        try:
+            limit = min(max(int(limit), 1), DROPDOWN_MAX_LIMIT)
+        except ValueError:
+            return JsonResponse({"error": "Invalid limit"}, status=400)
 
-    Model = apps.get_model(app_label, model_name)
     try:
-        model_field = Model._meta.get_field(field_name)
-    except Exception:
-        return JsonResponse({"error": "Field not allowed"}, status=400)
+        filter_value = source.clean_value(filter_value)
+    except ValidationError:
+        return JsonResponse({"error": "Invalid filter value"}, status=400)
+
+    query = request.GET.get("q", "").strip()
+    cursor = request.GET.get("cursor")
+    etag = dropdown_cache.etag(source, filter_value, query, limit, cursor)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        dropdown_cache.record_not_modified()
+        return dropdown_response(HttpResponseNotModified(), etag)
+
+    body = dropdown_cache.get(etag)
+    if body is None:
+        body = build_dropdown_options(source, filter_value, query, limit, cursor)
+        if body is None:
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+        dropdown_cache.set(etag, body)
+    return dropdown_response(
+        HttpResponse(body, content_type="application/json"), etag
+    )
+
+
+def dropdown_response(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def build_dropdown_options(source, filter_value, query, limit, cursor):
+    """
+    Builds the serialized option list for a dropdown source.
+
+    Returns:
+        str or None: The JSON body, or None if the cursor is invalid.
+    """
+
+    label_field = source.label_field
+    options = source.queryset().filter(**{source.filter_lookup: filter_value})
 
-    if not model_field.is_relation:
-        return JsonResponse({"error": "Field is not a relation"}, status=400)
+    if query:
+        options = options.filter(**{f"{label_field}__istartswith": query})
+
+    if cursor:
+        try:
+            label, pk = decode_cursor(cursor)
+        except (ValueError, TypeError, UnicodeError):
+            return None
+        options = options.filter(
+            Q(**{f"{label_field}__gt": label})
+            | Q(**{label_field: label, "pk__gt": pk})
+        )
+
+    rows = options.order_by(*source.ordering).values_list("pk", label_field)
+    if limit is not None:
+        rows = rows[: limit + 1]
+    rows = list(rows)
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+
+    response_data = [{"value": pk, "text": label or ""} for pk, label in rows]
+    return json.dumps(
+        {"options": response_data, "next": next_cursor}, cls=DjangoJSONEncoder
+    )
 
-    filter_field_name = f"{field_name}__id"
-    options = Model.objects.filter(**{filter_field_name: filter_value})
-    response_data = [{"value": obj.pk, "text": str(obj)} for obj in options]
-    return JsonResponse({"options": response_data})
+
+def dropdown_source_key(source):
+    return f"{source.model._meta.label_lower}.{source.field_name}"
+
+
+@login_required
+@require_POST
+def dynamic_dropdown_batch(request):
+    """
+    Returns option lists for many (model, field, parent) lookups in one round trip.
+
+    Lookups already in the dropdown cache are served from it; the rest are fetched
+    with one ``IN`` query per source and written back to the cache per parent.
+    """
+
+    try:
+        payload = json.loads(request.body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse(
+            {"status": "error", "message": "Invalid JSON payload"}, status=400
+        )
+
+    lookups = payload.get("lookups") if isinstance(payload, dict) else None
+    if not isinstance(lookups, list) or not lookups or len(lookups) > DROPDOWN_MAX_BATCH:
+        return JsonResponse(
+            {"status": "error", "message": "Invalid lookups"}, status=400
+        )
+
+    results = {}
+    pending = {}
+    for lookup in lookups:
+        if not isinstance(lookup, dict):
+            return JsonResponse(
+                {"status": "error", "message": "Invalid lookups"}, status=400
+            )
+        names = [lookup.get(key) for key in ("app_label", "model_name", "field_name")]
+        filter_value = lookup.get("filter_value")
+        if not all(isinstance(name, str) for name in names) or not isinstance(
+            filter_value, (str, int)
+        ):
+            return JsonResponse(
+                {"status": "error", "message": "Invalid lookups"}, status=400
+            )
+        source = dropdown_registry.get(*names)
+        if source is None:
+            return JsonResponse(
+                {"status": "error", "message": "Source not allowed"}, status=400
+            )
+
+        try:
+            parent = source.clean_value(filter_value)
+        except ValidationError:
+            return JsonResponse(
+                {"status": "error", "message": "Invalid filter value"}, status=400
+            )
+        # Results are keyed by the normalized id, so "01" and 1 share an entry.
+        filter_value = str(parent)
+        grouped = results.setdefault(dropdown_source_key(source), {})
+        # The ETag (and so the generation) is read before any query runs, so an
+        # invalidation in between cannot file stale rows under the new generation.
+        etag = dropdown_cache.etag(source, filter_value, "", None, None)
+        body = dropdown_cache.get(etag)
+        if body is not None:
+            grouped[filter_value] = json.loads(body)["options"]
+        else:
+            pending.setdefault(source, {})[filter_value] = (parent, etag)
+
+    for source, values in pending.items():
+        fetched = {value: [] for value in values}
+        rows = (
+            source.queryset()
+            .filter(
+                **{f"{source.filter_lookup}__in": [parent for parent, _ in values.values()]}
+            )
+            .order_by(*source.ordering)
+            .values_list(source.filter_lookup, "pk", source.label_field)
+        )
+        for parent, pk, label in rows:
+            fetched.setdefault(str(parent), []).append({"value": pk, "text": label or ""})
+
+        grouped = results[dropdown_source_key(source)]
+        for value, (_, etag) in values.items():
+            body = json.dumps(
+                {"options": fetched[value], "next": None}, cls=DjangoJSONEncoder
+            )
+            dropdown_cache.set(etag, body)
+            grouped[value] = fetched[value]
+
+    return JsonResponse({"status": "success", "results": results})
+
+
+@login_required
+def dropdown_cache_stats(request):
+    if not (request.user.is_staff or getattr(request.user, "is_admin", False)):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    return JsonResponse(dropdown_cache.stats())
+
+
+@login_required
+def datatable_rows(request, name):
+    """Serves one page of a registered ``DataTableSource`` to DataTables' ``serverSide`` mode."""
+
+    source = datatables.datatable_registry.get(name)
+    if source is None:
+        raise Http404("Unknown table.")
+    return JsonResponse(datatables.process(source, request))
 
 
 def index(request):
@@ -417,22 +808,41 @@ def index(request):
 
 
 def help(request, section=None):
+    help_sections = build_help_sections(request.user, section)
+    if section and not help_sections:
+        raise Http404("Unknown help section")
     return render(
         request,
         "help.html",
-        {"section": section, "help_sections": build_help_sections(request.user)},
+        {"section": section, "help_sections": help_sections},
     )
 
 
+def help_search(request):
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), HELP_SEARCH_MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "Invalid limit"}, status=400)
+    results = search_help(request.user, query, limit) if query else []
+    return JsonResponse({"query": query, "results": results})
+
+
 def dynamic_css(request):
-    css_content = """
-    body {
-        background-color: #f0f0f0;
-        color: #333333;
-    }
-    /* More dynamic CSS content */
-    """
-    return HttpResponse(css_content, content_type="text/css")
+    return css.dynamic_css(request)
+
+
+def css_bundle(request, name, fingerprint):
+    if name not in assets.CSS_BUNDLES:
+        raise Http404("Unknown stylesheet bundle")
+    return css.stylesheet_response(request, assets.bundle_stylesheet(name), fingerprint)
+
+
+def theme_css(request, organization_id):
+    stylesheet = themes.theme_stylesheet_for_id(organization_id)
+    if stylesheet is None:
+        raise Http404("No theme for this organization")
+    return css.stylesheet_response(request, stylesheet)
 
 
 def error_404(request, exception):